@@ -12,12 +12,17 @@ from __future__ import annotations
 import json
 import logging
 import os
+import random
 import re
-from time import sleep
-from typing import TYPE_CHECKING, Any, List, Literal, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Literal, Optional, Union
 
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
 from crhelper import CfnResource
 
 if TYPE_CHECKING:
@@ -39,18 +44,30 @@ LOGGER.setLevel(log_level)
 # Global Variables
 UNEXPECTED = "Unexpected!"
 ORGANIZATIONS_PAGE_SIZE = 20
-ORGANIZATIONS_THROTTLE_PERIOD = 0.2
 SNS_PUBLISH_BATCH_MAX = 10
-# https://docs.aws.amazon.com/accounts/latest/reference/quotas.html
-ACCOUNT_THROTTLE_PERIOD = 0.2
+SNS_PUBLISH_MAX_WORKERS = int(os.environ.get("SNS_PUBLISH_MAX_WORKERS", "5"))
+SNS_PUBLISH_MAX_RETRY = 5
+SNS_PUBLISH_MAX_DELAY_SECONDS = 20
+SNS_MESSAGE_SHARD_GRANULARITY = os.environ.get("SNS_MESSAGE_SHARD_GRANULARITY", "account")
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 
+# Adaptive rate limiter settings. Limiters are shared per (service, account, region) for the life of a warm container.
+# https://docs.aws.amazon.com/accounts/latest/reference/quotas.html
+RATE_LIMITER_DEFAULT_RATE = float(os.environ.get("RATE_LIMITER_DEFAULT_RATE", "5"))
+RATE_LIMITER_MAX_RATE = float(os.environ.get("RATE_LIMITER_MAX_RATE", "20"))
+RATE_LIMITER_INCREASE = 0.5
+RATE_LIMITERS: dict = {}
+RATE_LIMITERS_LOCK = threading.Lock()
+# Clients whose calls go through a rate limiter use botocore's adaptive retry mode. Standard mode retries throttled calls
+# at full speed inside botocore, so adaptive mode is what slows the client itself down when a service throttles.
+RATE_LIMITED_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
+
 # Initialize the helper. `sleep_on_delete` allows time for the CloudWatch Logs to get captured.
 helper = CfnResource(json_logging=True, log_level=log_level, boto_level="CRITICAL", sleep_on_delete=120)
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
-    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=BOTO3_CONFIG)
+    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=RATE_LIMITED_BOTO3_CONFIG)
     SNS_CLIENT: SNSClient = MANAGEMENT_ACCOUNT_SESSION.client("sns", config=BOTO3_CONFIG)
 except Exception as error:
     LOGGER.error({"Unexpected_Error": error})
@@ -88,6 +105,146 @@ def assume_role(role: str, role_session_name: str, account: str = None, session:
     )
 
 
+class AdaptiveRateLimiter:
+    """Token bucket rate limiter that backs off when an API throttles and speeds back up on success.
+
+    The limiter can be used as a context manager around a single API call or as a decorator. It paces the calls of every thread
+    sharing a service, account and region. Individual throttles are retried by the RATE_LIMITED_BOTO3_CONFIG clients, so the
+    limiter only halves its rate for throttles that are still failing once those retries are exhausted.
+    """
+
+    THROTTLING_ERROR_CODES = ["Throttling", "ThrottlingException", "ThrottledException", "TooManyRequestsException", "RequestLimitExceeded"]
+
+    def __init__(self, rate: float = RATE_LIMITER_DEFAULT_RATE, min_rate: float = 0.5, max_rate: float = RATE_LIMITER_MAX_RATE) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            rate: Initial calls per second. Defaults to RATE_LIMITER_DEFAULT_RATE.
+            min_rate: Lowest calls per second after backing off. Defaults to 0.5.
+            max_rate: Highest calls per second after speeding up. Defaults to RATE_LIMITER_MAX_RATE.
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = monotonic()
+        self.lock = threading.Lock()
+        self.stats = {"Calls": 0, "Throttles": 0, "WaitSeconds": 0.0, "Rate": rate}
+
+    def acquire(self) -> None:
+        """Wait until a token is available for the next call."""
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait_seconds = max(0.0, (1.0 - self.tokens) / self.rate)
+            self.tokens -= 1.0
+            self.stats["Calls"] += 1
+            self.stats["WaitSeconds"] += wait_seconds
+        if wait_seconds:
+            sleep(wait_seconds)
+
+    def record_success(self) -> None:
+        """Additively increase the rate after a successful call."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + RATE_LIMITER_INCREASE)
+            self.stats["Rate"] = self.rate
+
+    def record_throttle(self) -> None:
+        """Halve the rate and drain the bucket after a throttled call."""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self.stats["Throttles"] += 1
+            self.stats["Rate"] = self.rate
+
+    def __enter__(self) -> AdaptiveRateLimiter:
+        """Acquire a token before the call.
+
+        Returns:
+            The rate limiter
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> Literal[False]:
+        """Adjust the rate based on the outcome of the call.
+
+        Args:
+            exc_type: Exception type raised by the call
+            exc_value: Exception raised by the call
+            traceback: Exception traceback
+
+        Returns:
+            False so exceptions are not suppressed
+        """
+        if exc_value is None:
+            self.record_success()
+        elif isinstance(exc_value, ClientError) and exc_value.response["Error"]["Code"] in self.THROTTLING_ERROR_CODES:
+            self.record_throttle()
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        """Rate limit every call to the decorated function.
+
+        Args:
+            func: Function to rate limit
+
+        Returns:
+            Wrapped function
+        """
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self:
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def get_rate_limiter(service: str, account: str = "", region: str = "") -> AdaptiveRateLimiter:
+    """Get the shared rate limiter for the service, account and region.
+
+    Args:
+        service: AWS service name
+        account: AWS account ID. Defaults to "".
+        region: AWS region. Defaults to "".
+
+    Returns:
+        Rate limiter
+    """
+    with RATE_LIMITERS_LOCK:
+        return RATE_LIMITERS.setdefault((service, account, region), AdaptiveRateLimiter())
+
+
+def get_rate_limiter_stats() -> dict:
+    """Get the call, throttle and wait statistics of every rate limiter.
+
+    Returns:
+        Statistics by 'service/account/region'
+    """
+    return {"/".join(key): dict(limiter.stats) for key, limiter in RATE_LIMITERS.items()}
+
+
+def rate_limited_pages(page_iterator: Iterable, limiter: AdaptiveRateLimiter) -> Iterator:
+    """Yield paginator pages, fetching each page through the rate limiter.
+
+    Args:
+        page_iterator: Paginator page iterator
+        limiter: Rate limiter
+
+    Yields:
+        Paginator page
+    """
+    pages = iter(page_iterator)
+    while True:
+        with limiter:
+            page = next(pages, None)
+        if page is None:
+            return
+        yield page
+
+
 def get_active_organization_accounts() -> list[AccountTypeDef]:
     """Get all the active AWS Organization accounts.
 
@@ -96,11 +253,10 @@ def get_active_organization_accounts() -> list[AccountTypeDef]:
     """
     paginator = ORG_CLIENT.get_paginator("list_accounts")
     accounts: list[AccountTypeDef] = []
-    for page in paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}):
+    for page in rate_limited_pages(paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}), get_rate_limiter("organizations")):
         for account in page["Accounts"]:
             if account["Status"] == "ACTIVE":
                 accounts.append(account)
-            sleep(ORGANIZATIONS_THROTTLE_PERIOD)
     return accounts
 
 
@@ -130,9 +286,8 @@ def get_organization_resource_tags(resource_id: str) -> List[TagTypeDef]:
     """
     paginator = ORG_CLIENT.get_paginator("list_tags_for_resource")
     tags = []
-    for page in paginator.paginate(ResourceId=resource_id):
+    for page in rate_limited_pages(paginator.paginate(ResourceId=resource_id), get_rate_limiter("organizations")):
         tags += page["Tags"]
-        sleep(ORGANIZATIONS_THROTTLE_PERIOD)
     return tags
 
 
@@ -163,9 +318,9 @@ def add_alternate_contact(
         "PhoneNumber": phone,
         "Title": title,
     }
-    account_client.put_alternate_contact(**contact_parameters)
+    with get_rate_limiter("account"):
+        account_client.put_alternate_contact(**contact_parameters)
     LOGGER.info(f"Added {contact_type} Alternate Contact for account: {aws_account['Id']} ({aws_account['Name']})")
-    sleep(ACCOUNT_THROTTLE_PERIOD)
 
 
 def delete_alternate_contact(
@@ -180,11 +335,11 @@ def delete_alternate_contact(
     """
     contact_parameters: DeleteAlternateContactRequestTypeDef = {"AlternateContactType": contact_type}
     try:
-        account_client.delete_alternate_contact(**contact_parameters)
+        with get_rate_limiter("account"):
+            account_client.delete_alternate_contact(**contact_parameters)
         LOGGER.info(f"Deleted {contact_type} Alternate Contact for account: {aws_account['Id']} ({aws_account['Name']})")
     except account_client.exceptions.ResourceNotFoundException:
         LOGGER.info(f"No {contact_type} Alternate Contact to delete in account: {aws_account['Id']} ({aws_account['Name']})")
-    sleep(ACCOUNT_THROTTLE_PERIOD)
 
 
 def process_alternate_contacts(account_client: AccountClient, aws_account: AccountTypeDef, params: dict) -> None:
@@ -257,32 +412,71 @@ def publish_sns_message(message: dict, subject: str, sns_topic_arn: str) -> None
 
 
 def publish_sns_message_batch(message_batch: list, sns_topic_arn: str) -> None:
-    """Publish SNS Message Batches.
+    """Publish SNS Message Batches, retrying only the entries that failed.
 
     Args:
         message_batch: Batch of SNS messages
         sns_topic_arn: SNS Topic ARN
+
+    Raises:
+        ValueError: SNS messages could not be published
     """
-    LOGGER.info("Publishing SNS Message Batch")
-    LOGGER.info({"SNSMessageBatch": message_batch})
-    response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=message_batch)
-    api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
-    LOGGER.info(api_call_details)
+    entries = message_batch
+    for attempt in range(1, SNS_PUBLISH_MAX_RETRY + 1):
+        LOGGER.info("Publishing SNS Message Batch")
+        LOGGER.info({"SNSMessageBatch": entries})
+        response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=entries)
+        api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
+        LOGGER.info(api_call_details)
+
+        failed_entries = response.get("Failed", [])
+        sender_faults = [failed for failed in failed_entries if failed.get("SenderFault")]
+        if sender_faults:
+            raise ValueError(f"SNS rejected {len(sender_faults)} message(s): {sender_faults}")
+        failed_ids = {failed["Id"] for failed in failed_entries}
+        entries = [entry for entry in entries if entry["Id"] in failed_ids]
+        if not entries:
+            return
+        delay = random.uniform(0, min(SNS_PUBLISH_MAX_DELAY_SECONDS, 2**attempt))  # noqa: S311
+        LOGGER.info(f"Retrying {len(entries)} failed SNS message(s) in {delay:.1f} seconds")
+        sleep(delay)
+    unpublished_ids = [entry["Id"] for entry in entries]
+    raise ValueError(f"Failed to publish {len(unpublished_ids)} SNS message(s) after {SNS_PUBLISH_MAX_RETRY} attempts: {unpublished_ids}")
 
 
 def process_sns_message_batches(sns_messages: list, sns_topic_arn: str) -> None:
-    """Process SNS Message Batches for Publishing.
+    """Process SNS Message Batches for Publishing, publishing the batches concurrently.
 
     Args:
         sns_messages: SNS messages to be batched.
         sns_topic_arn: SNS Topic ARN
     """
-    message_batches = []
-    for i in range(SNS_PUBLISH_BATCH_MAX, len(sns_messages) + SNS_PUBLISH_BATCH_MAX, SNS_PUBLISH_BATCH_MAX):
-        message_batches.append(sns_messages[i - SNS_PUBLISH_BATCH_MAX : i])
+    message_batches = [sns_messages[i : i + SNS_PUBLISH_BATCH_MAX] for i in range(0, len(sns_messages), SNS_PUBLISH_BATCH_MAX)]
+    if not message_batches:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(SNS_PUBLISH_MAX_WORKERS, len(message_batches))) as executor:
+        list(executor.map(lambda batch: publish_sns_message_batch(batch, sns_topic_arn), message_batches))
+
 
-    for batch in message_batches:
-        publish_sns_message_batch(batch, sns_topic_arn)
+def get_account_shards(account_ids: list, shard_granularity: str = SNS_MESSAGE_SHARD_GRANULARITY) -> list:
+    """Split the accounts into the shard covered by each SNS message.
+
+    Args:
+        account_ids: AWS Account IDs
+        shard_granularity: 'account' for one account per message, or the number of accounts per message.
+            Defaults to SNS_MESSAGE_SHARD_GRANULARITY.
+
+    Returns:
+        Account IDs for each message
+
+    Raises:
+        ValueError: Unsupported shard granularity
+    """
+    if shard_granularity != "account" and not shard_granularity.isdigit():
+        raise ValueError(f"Unsupported SNS_MESSAGE_SHARD_GRANULARITY '{shard_granularity}', expected 'account' or a number of accounts")
+    accounts_per_message = max(1, int(shard_granularity)) if shard_granularity.isdigit() else 1
+    return [account_ids[i : i + accounts_per_message] for i in range(0, len(account_ids), accounts_per_message)]
 
 
 def is_account_with_exclude_tags(aws_account: AccountTypeDef, params: dict) -> bool:
@@ -312,7 +506,7 @@ def local_testing(aws_account: AccountTypeDef, params: dict) -> None:
         params: solution parameters
     """
     account_session = assume_role(params["CONFIGURATION_ROLE_NAME"], params["ROLE_SESSION_NAME"], aws_account["Id"])
-    account_client: AccountClient = account_session.client("account", config=BOTO3_CONFIG)
+    account_client: AccountClient = account_session.client("account", config=RATE_LIMITED_BOTO3_CONFIG)
     process_alternate_contacts(account_client, aws_account, params)
 
 
@@ -323,7 +517,7 @@ def process_accounts(event: Union[CloudFormationCustomResourceEvent, dict], para
         event: event data
         params: solution parameters
     """
-    sns_messages = []
+    account_ids = []
     accounts = get_active_organization_accounts()
     for account in accounts:
 
@@ -333,8 +527,12 @@ def process_accounts(event: Union[CloudFormationCustomResourceEvent, dict], para
         if event.get("local_testing") == "true" or event.get("ResourceProperties", {}).get("local_testing") == "true":  # type: ignore
             local_testing(account, params)
         else:
-            sns_message = {"Action": params["action"], "AccountId": account["Id"]}
-            sns_messages.append({"Id": account["Id"], "Message": json.dumps(sns_message), "Subject": "Account Alternate Contacts"})
+            account_ids.append(account["Id"])
+
+    sns_messages = []
+    for index, shard_account_ids in enumerate(get_account_shards(account_ids)):
+        sns_message = {"Action": params["action"], "AccountIds": shard_account_ids}
+        sns_messages.append({"Id": f"{shard_account_ids[0]}-{index}", "Message": json.dumps(sns_message), "Subject": "Account Alternate Contacts"})
 
     process_sns_message_batches(sns_messages, params["SNS_TOPIC_ARN"])
 
@@ -386,10 +584,11 @@ def process_event_sns(event: dict) -> None:
         message = record["Sns"]["Message"]
         params["action"] = message["Action"]
 
-        aws_account = get_account_info(account_id=message["AccountId"])
-        account_session = assume_role(params["CONFIGURATION_ROLE_NAME"], params["ROLE_SESSION_NAME"], aws_account["Id"])
-        account_client: AccountClient = account_session.client("account", config=BOTO3_CONFIG)
-        process_alternate_contacts(account_client, aws_account, params)
+        for account_id in message.get("AccountIds", [message.get("AccountId")]):
+            aws_account = get_account_info(account_id=account_id)
+            account_session = assume_role(params["CONFIGURATION_ROLE_NAME"], params["ROLE_SESSION_NAME"], aws_account["Id"])
+            account_client: AccountClient = account_session.client("account", config=RATE_LIMITED_BOTO3_CONFIG)
+            process_alternate_contacts(account_client, aws_account, params)
 
 
 def process_event_organizations(event: dict) -> None:
@@ -622,6 +821,7 @@ def lambda_handler(event: dict, context: Any) -> None:
         event_info = {"Event": event}
         LOGGER.info(event_info)
         orchestrator(event, context)
+        LOGGER.info({"Rate_Limiter_Stats": get_rate_limiter_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs '{context.log_group_name}' for details.") from None
@@ -306,4 +306,6 @@ def lambda_handler(event: Dict[str, Any], context: Context) -> None:
         event: event data
         context: runtime information
     """
+    common.refresh_account_inventory(event)
     helper(event, context)
+    LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
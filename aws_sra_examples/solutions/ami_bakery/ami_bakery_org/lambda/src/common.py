@@ -9,15 +9,20 @@ SPDX-License-Identifier: MIT-0
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 import re
-from time import sleep
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import time
 from typing import TYPE_CHECKING, Optional
 
 import boto3
 from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError, EndpointConnectionError
+from botocore.session import get_session
 
 if TYPE_CHECKING:
     from mypy_boto3_cloudformation import CloudFormationClient
@@ -35,13 +40,43 @@ LOGGER.setLevel(log_level)
 CLOUDFORMATION_PAGE_SIZE = 20
 CLOUDFORMATION_THROTTLE_PERIOD = 0.2
 ORGANIZATIONS_PAGE_SIZE = 20
-ORGANIZATIONS_THROTTLE_PERIOD = 0.2
+
+# Region probe settings. Probe results are memoized per region for the life of a warm container.
+REGION_PROBE_MAX_WORKERS = int(os.environ.get("REGION_PROBE_MAX_WORKERS", "10"))
+REGION_PROBE_TIMEOUT_SECONDS = int(os.environ.get("REGION_PROBE_TIMEOUT_SECONDS", "5"))
+REGION_PROBE_CACHE_TTL_SECONDS = int(os.environ.get("REGION_PROBE_CACHE_TTL_SECONDS", "3600"))
+REGION_PROBE_CONFIG = Config(
+    connect_timeout=REGION_PROBE_TIMEOUT_SECONDS, read_timeout=REGION_PROBE_TIMEOUT_SECONDS, retries={"max_attempts": 2, "mode": "standard"}
+)
+REGION_PROBE_CACHE: dict = {}
+REGION_PROBE_CACHED_STATUSES = ["enabled", "disabled"]
+
+# Assumed role session cache. Sessions are keyed by (account, role, partition, role session name) and their credentials are
+# refreshed automatically by botocore before they expire.
+CALLER_ARN_CACHE: dict = {}
+ROLE_SESSION_CACHE: dict = {}
+ROLE_SESSION_CACHE_STATS = {"Hits": 0, "Misses": 0}
+ROLE_SESSION_LOCKS: dict = {}
+ROLE_SESSION_LOCK = threading.Lock()
+
+# Organization account inventory cache. The snapshot is kept in memory for the life of a warm container and
+# optionally persisted to a local file and/or S3 object so concurrent workers can share it.
+ACCOUNT_CACHE_TTL_SECONDS = int(os.environ.get("ACCOUNT_CACHE_TTL_SECONDS", "900"))
+ACCOUNT_CACHE_FILE = os.environ.get("ACCOUNT_CACHE_FILE", "")
+ACCOUNT_CACHE_S3_BUCKET = os.environ.get("ACCOUNT_CACHE_S3_BUCKET", "")
+ACCOUNT_CACHE_S3_KEY = os.environ.get("ACCOUNT_CACHE_S3_KEY", "sra/organization-accounts.json")
+ACCOUNT_INVENTORY_FIELDS = ["Id", "Arn", "Email", "Name", "Status", "JoinedMethod"]
+ACCOUNT_INVENTORY: dict = {"Timestamp": 0.0, "Accounts": []}
+
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
+# Clients paced by botocore's adaptive retry mode. Its client-side token bucket slows the client down when the service
+# throttles and speeds it back up on success, in place of a fixed sleep between calls.
+ADAPTIVE_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
     CLOUDFORMATION_CLIENT: CloudFormationClient = MANAGEMENT_ACCOUNT_SESSION.client("cloudformation")
-    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=BOTO3_CONFIG)
+    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=ADAPTIVE_BOTO3_CONFIG)
     SSM_CLIENT: SSMClient = MANAGEMENT_ACCOUNT_SESSION.client("ssm")
 except Exception as error:
     LOGGER.error({"Unexpected_Error": error})
@@ -74,6 +109,73 @@ def parameter_pattern_validator(parameter_name: str, parameter_value: Optional[s
     return {parameter_name: parameter_value}
 
 
+def get_caller_arn(session: boto3.Session, sts_client: STSClient) -> str:
+    """Get the caller identity ARN for the session, calling STS only once per set of credentials.
+
+    Args:
+        session: Boto3 session
+        sts_client: STS client created from the session
+
+    Returns:
+        Caller identity ARN
+    """
+    access_key = session.get_credentials().access_key
+    if access_key not in CALLER_ARN_CACHE:
+        CALLER_ARN_CACHE[access_key] = sts_client.get_caller_identity()["Arn"]
+        LOGGER.info(f"USER: {CALLER_ARN_CACHE[access_key]}")
+    return CALLER_ARN_CACHE[access_key]
+
+
+def get_role_session(sts_client: STSClient, role_arn: str, role_session_name: str, cache_key: tuple) -> boto3.Session:
+    """Get a cached session for the role, assuming it only when no session exists for the cache key.
+
+    Args:
+        sts_client: STS client used to assume the role and refresh the credentials
+        role_arn: Role ARN to assume
+        role_session_name: Identifier for the assumed role session
+        cache_key: (account, role, partition, role session name)
+
+    Returns:
+        Session object with auto-refreshing credentials for the role
+    """
+    with ROLE_SESSION_LOCK:
+        key_lock = ROLE_SESSION_LOCKS.setdefault(cache_key, threading.Lock())
+
+    with key_lock:
+        if cache_key in ROLE_SESSION_CACHE:
+            ROLE_SESSION_CACHE_STATS["Hits"] += 1
+            return ROLE_SESSION_CACHE[cache_key]
+        ROLE_SESSION_CACHE_STATS["Misses"] += 1
+
+        def refresh_credentials() -> dict:
+            response = sts_client.assume_role(RoleArn=role_arn, RoleSessionName=role_session_name)
+            LOGGER.info(f"ASSUMED ROLE: {response['AssumedRoleUser']['Arn']}")
+            return {
+                "access_key": response["Credentials"]["AccessKeyId"],
+                "secret_key": response["Credentials"]["SecretAccessKey"],
+                "token": response["Credentials"]["SessionToken"],
+                "expiry_time": response["Credentials"]["Expiration"].isoformat(),
+            }
+
+        credentials = RefreshableCredentials.create_from_metadata(
+            metadata=refresh_credentials(), refresh_using=refresh_credentials, method="sts-assume-role"
+        )
+        botocore_session = get_session()
+        # botocore has no public setter for refreshable credentials; set_credentials only accepts static keys.
+        botocore_session._credentials = credentials
+        ROLE_SESSION_CACHE[cache_key] = boto3.Session(botocore_session=botocore_session)
+        return ROLE_SESSION_CACHE[cache_key]
+
+
+def get_role_session_cache_stats() -> dict:
+    """Get the assumed role session cache statistics.
+
+    Returns:
+        Cache hits, misses and number of cached sessions
+    """
+    return {**ROLE_SESSION_CACHE_STATS, "Sessions": len(ROLE_SESSION_CACHE)}
+
+
 def assume_role(role: str, role_session_name: str, account: str, session: Optional[boto3.Session] = None) -> boto3.Session:
     """Assumes the provided role in the given account and returns a session.
 
@@ -89,20 +191,111 @@ def assume_role(role: str, role_session_name: str, account: str, session: Option
     if not session:
         session = boto3.Session()
     sts_client: STSClient = session.client("sts", config=BOTO3_CONFIG)
-    sts_arn = sts_client.get_caller_identity()["Arn"]
-    LOGGER.info(f"USER: {sts_arn}")
+    sts_arn = get_caller_arn(session, sts_client)
     if not account:
         account = sts_arn.split(":")[4]
     partition = sts_arn.split(":")[1]
     role_arn = f"arn:{partition}:iam::{account}:role/{role}"
 
-    response = sts_client.assume_role(RoleArn=role_arn, RoleSessionName=role_session_name)
-    LOGGER.info(f"ASSUMED ROLE: {response['AssumedRoleUser']['Arn']}")
-    return boto3.Session(
-        aws_access_key_id=response["Credentials"]["AccessKeyId"],
-        aws_secret_access_key=response["Credentials"]["SecretAccessKey"],
-        aws_session_token=response["Credentials"]["SessionToken"],
-    )
+    return get_role_session(sts_client, role_arn, role_session_name, (account, role, partition, role_session_name))
+
+
+def list_organization_accounts() -> list:
+    """List every account in the AWS Organization.
+
+    Returns:
+        List of account records. {'Id': '', 'Arn': '', 'Email': '', 'Name': '', 'Status': '', 'JoinedMethod': ''}
+    """
+    accounts: list[dict] = []
+    paginator = ORG_CLIENT.get_paginator("list_accounts")
+
+    for page in paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}):
+        for account in page["Accounts"]:
+            accounts.append({field: account[field] for field in ACCOUNT_INVENTORY_FIELDS if field in account})
+
+    return accounts
+
+
+def load_account_inventory() -> dict:
+    """Load the persisted account inventory snapshot from the local cache file, then the S3 cache object.
+
+    Returns:
+        Account inventory snapshot. {'Timestamp': 0.0, 'Accounts': []}, empty when nothing fresh is persisted
+    """
+    if ACCOUNT_CACHE_FILE and os.path.isfile(ACCOUNT_CACHE_FILE):
+        try:
+            with open(ACCOUNT_CACHE_FILE, "r") as cache_file:
+                snapshot = json.load(cache_file)
+            if time() - snapshot.get("Timestamp", 0.0) < ACCOUNT_CACHE_TTL_SECONDS:
+                return snapshot
+        except (OSError, ValueError) as error:
+            LOGGER.info(f"Unable to load account inventory from {ACCOUNT_CACHE_FILE}: {error}")
+
+    if ACCOUNT_CACHE_S3_BUCKET:
+        try:
+            response = MANAGEMENT_ACCOUNT_SESSION.client("s3").get_object(Bucket=ACCOUNT_CACHE_S3_BUCKET, Key=ACCOUNT_CACHE_S3_KEY)
+            snapshot = json.loads(response["Body"].read())
+            if time() - snapshot.get("Timestamp", 0.0) < ACCOUNT_CACHE_TTL_SECONDS:
+                return snapshot
+        except (ClientError, ValueError) as error:
+            LOGGER.info(f"Unable to load account inventory from s3://{ACCOUNT_CACHE_S3_BUCKET}/{ACCOUNT_CACHE_S3_KEY}: {error}")
+    return {}
+
+
+def save_account_inventory(snapshot: dict) -> None:
+    """Persist the account inventory snapshot to the configured local cache file and S3 cache object.
+
+    Args:
+        snapshot: Account inventory snapshot. {'Timestamp': 0.0, 'Accounts': []}
+    """
+    body = json.dumps(snapshot, default=str)
+    if ACCOUNT_CACHE_FILE:
+        try:
+            with open(ACCOUNT_CACHE_FILE, "w") as cache_file:
+                cache_file.write(body)
+        except OSError as error:
+            LOGGER.info(f"Unable to save account inventory to {ACCOUNT_CACHE_FILE}: {error}")
+    if ACCOUNT_CACHE_S3_BUCKET:
+        try:
+            MANAGEMENT_ACCOUNT_SESSION.client("s3").put_object(Bucket=ACCOUNT_CACHE_S3_BUCKET, Key=ACCOUNT_CACHE_S3_KEY, Body=body.encode())
+        except ClientError as error:
+            LOGGER.info(f"Unable to save account inventory to s3://{ACCOUNT_CACHE_S3_BUCKET}/{ACCOUNT_CACHE_S3_KEY}: {error}")
+
+
+def get_account_inventory(force_refresh: bool = False) -> list:
+    """Get the AWS Organization account inventory, listing the accounts only when the cached snapshot is stale.
+
+    Args:
+        force_refresh: Ignore the cached snapshot and list the accounts again. Defaults to False.
+
+    Returns:
+        List of account records. {'Id': '', 'Arn': '', 'Email': '', 'Name': '', 'Status': '', 'JoinedMethod': ''}
+    """
+    if not force_refresh:
+        if time() - ACCOUNT_INVENTORY["Timestamp"] < ACCOUNT_CACHE_TTL_SECONDS:
+            return ACCOUNT_INVENTORY["Accounts"]
+        snapshot = load_account_inventory()
+        if snapshot:
+            LOGGER.info("Using persisted account inventory snapshot")
+            ACCOUNT_INVENTORY.update(snapshot)
+            return ACCOUNT_INVENTORY["Accounts"]
+
+    snapshot = {"Timestamp": time(), "Accounts": list_organization_accounts()}
+    LOGGER.info(f"Refreshed account inventory with {len(snapshot['Accounts'])} accounts")
+    ACCOUNT_INVENTORY.update(snapshot)
+    save_account_inventory(snapshot)
+    return ACCOUNT_INVENTORY["Accounts"]
+
+
+def refresh_account_inventory(event: dict) -> None:
+    """Refresh the account inventory when an AWS Organizations or Control Tower account lifecycle event is received.
+
+    Args:
+        event: event data
+    """
+    if event.get("source") in ["aws.organizations", "aws.controltower"]:
+        LOGGER.info(f"Account lifecycle event received from {event['source']}, refreshing account inventory")
+        get_account_inventory(force_refresh=True)
 
 
 def get_active_organization_accounts(exclude_accounts: list) -> list:
@@ -117,13 +310,10 @@ def get_active_organization_accounts(exclude_accounts: list) -> list:
     if exclude_accounts is None:
         exclude_accounts = ["00000000000"]
     accounts: list[dict] = []
-    paginator = ORG_CLIENT.get_paginator("list_accounts")
 
-    for page in paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}):
-        for account in page["Accounts"]:
-            if account["Status"] == "ACTIVE" and account["Id"] not in exclude_accounts:
-                accounts.append({"AccountId": account["Id"], "Email": account["Email"]})
-        sleep(ORGANIZATIONS_THROTTLE_PERIOD)
+    for account in get_account_inventory():
+        if account["Status"] == "ACTIVE" and account["Id"] not in exclude_accounts:
+            accounts.append({"AccountId": account["Id"], "Email": account["Email"]})
 
     return accounts
 
@@ -159,6 +349,67 @@ def get_control_tower_regions() -> list:  # noqa: CCR001
     return list(customer_regions)
 
 
+def probe_region(sts_client: STSClient, region: str) -> str:
+    """Call STS in the region to classify it as enabled, disabled or invalid.
+
+    Args:
+        sts_client: Regional STS client
+        region: AWS region
+
+    Returns:
+        Region status. 'enabled', 'disabled', 'invalid' or 'error'
+    """
+    try:
+        sts_client.get_caller_identity()
+        return "enabled"
+    except EndpointConnectionError:
+        LOGGER.error(f"Region: ({region}) is not valid or could not be reached")
+        return "invalid"
+    except ClientError as error:
+        LOGGER.error(f"Error {error.response['Error']} occurred testing region {region}")
+        if error.response["Error"]["Code"] == "InvalidClientTokenId":
+            return "disabled"
+    except Exception:
+        LOGGER.exception("Unexpected!")
+    return "error"
+
+
+def get_region_statuses(region_list: list) -> dict:
+    """Probe the regions concurrently, reusing memoized results that are still within REGION_PROBE_CACHE_TTL_SECONDS.
+
+    Only definitive results are memoized. Connection failures can be transient, so 'invalid' and 'error' regions are probed again on the next call.
+
+    Args:
+        region_list: AWS regions
+
+    Returns:
+        Region status by region name
+    """
+    region_statuses = {}
+    regions_to_probe = []
+    for region in region_list:
+        cached = REGION_PROBE_CACHE.get(region)
+        if cached and time() - cached["Timestamp"] < REGION_PROBE_CACHE_TTL_SECONDS:
+            region_statuses[region] = cached["Status"]
+        elif region not in regions_to_probe:
+            regions_to_probe.append(region)
+
+    if regions_to_probe:
+        region_session = boto3.Session()
+        # Clients are created up front since boto3 sessions are not thread safe, but the clients are.
+        sts_clients = [
+            region_session.client("sts", endpoint_url=f"https://sts.{region}.amazonaws.com", region_name=region, config=REGION_PROBE_CONFIG)
+            for region in regions_to_probe
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(REGION_PROBE_MAX_WORKERS, len(regions_to_probe)))) as executor:
+            for region, status in zip(regions_to_probe, executor.map(probe_region, sts_clients, regions_to_probe)):
+                region_statuses[region] = status
+                if status in REGION_PROBE_CACHED_STATUSES:
+                    REGION_PROBE_CACHE[region] = {"Status": status, "Timestamp": time()}
+
+    return region_statuses
+
+
 def get_enabled_regions(customer_regions: str, control_tower_regions_only: bool = False) -> list:  # noqa: CCR001, C901 # NOSONAR
     """Query STS to identify enabled regions.
 
@@ -184,28 +435,10 @@ def get_enabled_regions(customer_regions: str, control_tower_regions_only: bool
         LOGGER.info({"Default_Available_Regions": default_available_regions})
         region_list = default_available_regions
 
-    region_session = boto3.Session()
-    enabled_regions = []
-    disabled_regions = []
-    invalid_regions = []
-    for region in region_list:
-        try:
-            sts_client = region_session.client(
-                "sts",
-                endpoint_url=f"https://sts.{region}.amazonaws.com",
-                region_name=region,
-            )
-            sts_client.get_caller_identity()
-            enabled_regions.append(region)
-        except EndpointConnectionError:
-            invalid_regions.append(region)
-            LOGGER.error(f"Region: ({region}) is not valid")
-        except ClientError as error:
-            if error.response["Error"]["Code"] == "InvalidClientTokenId":
-                disabled_regions.append(region)
-            LOGGER.error(f"Error {error.response['Error']} occurred testing region {region}")
-        except Exception:
-            LOGGER.exception("Unexpected!")
+    region_statuses = get_region_statuses(region_list)
+    enabled_regions = [region for region in region_list if region_statuses.get(region) == "enabled"]
+    disabled_regions = [region for region in region_list if region_statuses.get(region) == "disabled"]
+    invalid_regions = [region for region in region_list if region_statuses.get(region) == "invalid"]
 
     LOGGER.info(
         {
@@ -12,7 +12,6 @@ from __future__ import annotations
 import logging
 import os
 import re
-from time import sleep
 from typing import TYPE_CHECKING, Literal, Optional, Sequence, Union
 
 import boto3
@@ -40,7 +39,6 @@ OTHER_LOG_ARCHIVE_ACCT: str = os.environ.get("OTHER_LOG_ARCHIVE_ACCT", "")
 
 
 # Global Variables
-CLOUDFORMATION_THROTTLE_PERIOD = 0.2
 CLOUDFORMATION_PAGE_SIZE = 100
 SSM_DELETE_PARAMETERS_MAX = 10
 SRA_CONTROL_TOWER_SSM_PATH = "/sra/control-tower"
@@ -60,6 +58,9 @@ SRA_SSM_PARAMETERS = [
 UNEXPECTED = "Unexpected!"
 EMPTY_VALUE = "NONE"
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
+# Clients paced by botocore's adaptive retry mode. Its client-side token bucket slows the client down when the service
+# throttles and speeds it back up on success, in place of a fixed sleep between calls.
+ADAPTIVE_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
 
 # Initialize the helper
 helper = CfnResource(json_logging=True, log_level=log_level, boto_level="CRITICAL", sleep_on_delete=120)
@@ -67,7 +68,7 @@ helper = CfnResource(json_logging=True, log_level=log_level, boto_level="CRITICA
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
     ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=BOTO3_CONFIG)
-    CFN_CLIENT: CloudFormationClient = MANAGEMENT_ACCOUNT_SESSION.client("cloudformation", config=BOTO3_CONFIG)
+    CFN_CLIENT: CloudFormationClient = MANAGEMENT_ACCOUNT_SESSION.client("cloudformation", config=ADAPTIVE_BOTO3_CONFIG)
     STS_CLIENT = boto3.client("sts")
     HOME_REGION = MANAGEMENT_ACCOUNT_SESSION.region_name
     LOGGER.info(f"Detected home region: {HOME_REGION}")
@@ -139,7 +140,6 @@ def get_customer_control_tower_regions() -> list:  # noqa: CCR001
             break
         if all_regions_identified:
             break
-        sleep(CLOUDFORMATION_THROTTLE_PERIOD)
 
     return customer_regions
 
@@ -254,7 +254,6 @@ def get_cloudformation_ssm_parameter_info(path: str) -> dict:  # noqa: CCR001
         for instance in page["Summaries"]:
             ssm_data["info"].append({"name": f"{path}/log-archive-account-id", "value": instance["Account"], "parameter_type": "String"})
             ssm_data["helper"]["LogArchiveAccountId"] = instance["Account"]
-        sleep(CLOUDFORMATION_THROTTLE_PERIOD)
 
     LOGGER.info(ssm_data["helper"])
     return ssm_data
@@ -18,7 +18,6 @@ from __future__ import annotations
 
 import logging
 from concurrent.futures import Future, ProcessPoolExecutor, as_completed
-from time import sleep
 from typing import TYPE_CHECKING, Any
 
 import boto3
@@ -39,13 +38,15 @@ logging.getLogger("botocore").setLevel(logging.CRITICAL)
 # Global Variables
 MAX_THREADS = 20
 ORG_PAGE_SIZE = 20  # Max page size for list_accounts
-ORG_THROTTLE_PERIOD = 0.2
 ASSUME_ROLE_NAME = "sra-execution"
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
+# Clients paced by botocore's adaptive retry mode. Its client-side token bucket slows the client down when the service
+# throttles and speeds it back up on success, in place of a fixed sleep between calls.
+ADAPTIVE_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
-    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=BOTO3_CONFIG)
+    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=ADAPTIVE_BOTO3_CONFIG)
     CFN_CLIENT: CloudFormationClient = MANAGEMENT_ACCOUNT_SESSION.client("cloudformation", config=BOTO3_CONFIG)
     SSM_CLIENT: SSMClient = MANAGEMENT_ACCOUNT_SESSION.client("ssm")
 except Exception as error:
@@ -97,7 +98,6 @@ def get_all_organization_accounts() -> list:
         for acct in page["Accounts"]:
             if acct["Status"] == "ACTIVE":  # Store active accounts in a dict
                 account_ids.append(acct["Id"])
-        sleep(ORG_THROTTLE_PERIOD)
 
     return account_ids
 
@@ -12,7 +12,9 @@ from __future__ import annotations
 import json
 import logging
 import os
+import random
 import re
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
@@ -38,6 +40,10 @@ UNEXPECTED = "Unexpected!"
 SERVICE_NAME = "config.amazonaws.com"
 SLEEP_SECONDS = 60
 SNS_PUBLISH_BATCH_MAX = 10
+SNS_PUBLISH_MAX_WORKERS = int(os.environ.get("SNS_PUBLISH_MAX_WORKERS", "5"))
+SNS_PUBLISH_MAX_RETRY = 5
+SNS_PUBLISH_MAX_DELAY_SECONDS = 20
+SNS_MESSAGE_SHARD_GRANULARITY = os.environ.get("SNS_MESSAGE_SHARD_GRANULARITY", "region")
 
 helper = CfnResource(json_logging=True, log_level=log_level, boto_level="CRITICAL", sleep_on_delete=120)
 
@@ -76,6 +82,7 @@ def process_event(event: dict) -> None:
     """
     event_info = {"Event": event}
     LOGGER.info(event_info)
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({"RequestType": "Update"})
 
     accounts = common.get_active_organization_accounts()
@@ -119,6 +126,7 @@ def process_event_organizations(event: dict) -> None:
     """
     event_info = {"Event": event}
     LOGGER.info(event_info)
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({})
 
     if event["detail"]["eventName"] == "AcceptHandshake" and event["detail"]["responseElements"]["handshake"]["state"] == "ACCEPTED":
@@ -376,7 +384,9 @@ def setup_config_global(params: dict, regions: list, accounts: list) -> None:
     create_sns_messages(accounts, regions, params["SNS_TOPIC_ARN_FANOUT"], "configure")
 
 
-def create_sns_messages(accounts: list, regions: list, sns_topic_arn_fanout: str, action: str) -> None:
+def create_sns_messages(
+    accounts: list, regions: list, sns_topic_arn_fanout: str, action: str, shard_granularity: str = SNS_MESSAGE_SHARD_GRANULARITY
+) -> None:
     """Create SNS Message.
 
     Args:
@@ -384,52 +394,83 @@ def create_sns_messages(accounts: list, regions: list, sns_topic_arn_fanout: str
         regions: list of AWS regions
         sns_topic_arn_fanout: SNS Topic ARN
         action: Action
+        shard_granularity: 'region' for all accounts in one region per message, 'account_region' for one account and one region
+            per message, or the number of accounts per message for each region. Defaults to SNS_MESSAGE_SHARD_GRANULARITY.
+
+    Raises:
+        ValueError: Unsupported shard granularity
     """
+    if shard_granularity not in ["region", "account_region"] and not shard_granularity.isdigit():
+        raise ValueError(
+            f"Unsupported SNS_MESSAGE_SHARD_GRANULARITY '{shard_granularity}', expected 'region', 'account_region' or a number of accounts"
+        )
+    accounts_per_message = max(1, len(accounts))
+    if shard_granularity.isdigit():
+        accounts_per_message = max(1, int(shard_granularity))
+    elif shard_granularity == "account_region":
+        accounts_per_message = 1
+
     sns_messages = []
     for region in regions:
-        sns_message = {"Accounts": accounts, "Region": region, "Action": action}
-        sns_messages.append(
-            {
-                "Id": region,
-                "Message": json.dumps(sns_message),
-                "Subject": "Config Configuration",
-            }
-        )
+        for index in range(0, len(accounts), accounts_per_message):
+            sns_message = {"Accounts": accounts[index : index + accounts_per_message], "Region": region, "Action": action}
+            sns_messages.append(
+                {
+                    "Id": f"{region}-{index}",
+                    "Message": json.dumps(sns_message),
+                    "Subject": "Config Configuration",
+                }
+            )
 
     process_sns_message_batches(sns_messages, sns_topic_arn_fanout)
 
 
 def publish_sns_message_batch(message_batch: list, sns_topic_arn_fanout: str) -> None:
-    """Publish SNS Message Batches.
+    """Publish SNS Message Batches, retrying only the entries that failed.
 
     Args:
         message_batch: Batch of SNS messages
         sns_topic_arn_fanout: SNS Topic ARN
+
+    Raises:
+        ValueError: SNS messages could not be published
     """
-    LOGGER.info("Publishing SNS Message Batch")
-    LOGGER.info({"SNSMessageBatch": message_batch})
-    response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn_fanout, PublishBatchRequestEntries=message_batch)
-    api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
-    LOGGER.info(api_call_details)
+    entries = message_batch
+    for attempt in range(1, SNS_PUBLISH_MAX_RETRY + 1):
+        LOGGER.info("Publishing SNS Message Batch")
+        LOGGER.info({"SNSMessageBatch": entries})
+        response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn_fanout, PublishBatchRequestEntries=entries)
+        api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
+        LOGGER.info(api_call_details)
+
+        failed_entries = response.get("Failed", [])
+        sender_faults = [failed for failed in failed_entries if failed.get("SenderFault")]
+        if sender_faults:
+            raise ValueError(f"SNS rejected {len(sender_faults)} message(s): {sender_faults}")
+        failed_ids = {failed["Id"] for failed in failed_entries}
+        entries = [entry for entry in entries if entry["Id"] in failed_ids]
+        if not entries:
+            return
+        delay = random.uniform(0, min(SNS_PUBLISH_MAX_DELAY_SECONDS, 2**attempt))  # noqa: S311
+        LOGGER.info(f"Retrying {len(entries)} failed SNS message(s) in {delay:.1f} seconds")
+        sleep(delay)
+    unpublished_ids = [entry["Id"] for entry in entries]
+    raise ValueError(f"Failed to publish {len(unpublished_ids)} SNS message(s) after {SNS_PUBLISH_MAX_RETRY} attempts: {unpublished_ids}")
 
 
 def process_sns_message_batches(sns_messages: list, sns_topic_arn_fanout: str) -> None:
-    """Process SNS Message Batches for Publishing.
+    """Process SNS Message Batches for Publishing, publishing the batches concurrently.
 
     Args:
         sns_messages: SNS messages to be batched.
         sns_topic_arn_fanout: SNS Topic ARN
     """
-    message_batches = []
-    for i in range(
-        SNS_PUBLISH_BATCH_MAX,
-        len(sns_messages) + SNS_PUBLISH_BATCH_MAX,
-        SNS_PUBLISH_BATCH_MAX,
-    ):
-        message_batches.append(sns_messages[i - SNS_PUBLISH_BATCH_MAX : i])
+    message_batches = [sns_messages[i : i + SNS_PUBLISH_BATCH_MAX] for i in range(0, len(sns_messages), SNS_PUBLISH_BATCH_MAX)]
+    if not message_batches:
+        return
 
-    for batch in message_batches:
-        publish_sns_message_batch(batch, sns_topic_arn_fanout)
+    with ThreadPoolExecutor(max_workers=min(SNS_PUBLISH_MAX_WORKERS, len(message_batches))) as executor:
+        list(executor.map(lambda batch: publish_sns_message_batch(batch, sns_topic_arn_fanout), message_batches))
 
 
 def process_event_sns(event: dict) -> None:
@@ -537,6 +578,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> None:
     LOGGER.info(event_info)
     try:
         orchestrator(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs ({context.log_group_name}) for details.") from None
@@ -33,7 +33,6 @@ LOGGER.setLevel(log_level)
 # Global Variables
 MAX_THREADS = 20
 ORG_PAGE_SIZE = 20  # Max page size for list_accounts
-ORG_THROTTLE_PERIOD = 0.2
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 
 try:
@@ -12,7 +12,6 @@ from __future__ import annotations
 import logging
 import os
 import re
-from time import sleep
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import boto3
@@ -74,6 +73,7 @@ def process_event(event: dict) -> None:
     """
     event_info = {"Event": event}
     LOGGER.info(event_info)
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({"RequestType": "Update"})
 
     excluded_accounts: list = [params["DELEGATED_ADMIN_ACCOUNT_ID"]]
@@ -302,6 +302,11 @@ def setup_detective_global(params: dict, regions: list, accounts: list) -> None:
             params["CONFIGURATION_ROLE_NAME"],
         )
 
+    for region in regions:
+        detective.register_and_enable_delegated_admin(params["DELEGATED_ADMIN_ACCOUNT_ID"], region)
+    if not detective.wait_for_graphs(params["DELEGATED_ADMIN_ACCOUNT_ID"], params["CONFIGURATION_ROLE_NAME"], regions):
+        LOGGER.info("Detective behavior graph is not yet created in some regions; continuing with detective org auto-enable.")
+
     for region in regions:
         setup_detective_in_region(
             region,
@@ -324,14 +329,6 @@ def setup_detective_in_region(
         delegated_admin_account: delegated admin aws account number
         configuration_role_name: detective configuration role
     """
-    detective.register_and_enable_delegated_admin(
-        delegated_admin_account,
-        region,
-    )
-
-    LOGGER.info("Waiting 10 seconds before configuring detective org auto-enable.")
-    sleep(10)
-
     delegated_admin_session = common.assume_role(
         configuration_role_name,
         "sra-org-detective-setup",
@@ -415,7 +412,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> None:
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
+        common.set_lambda_context(context)
         orchestrator(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs ({context.log_group_name}) for details.") from None
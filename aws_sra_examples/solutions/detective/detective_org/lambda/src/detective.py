@@ -38,11 +38,11 @@ LOGGER.setLevel(log_level)
 
 UNEXPECTED = "Unexpected!"
 EMPTY_STRING = ""
-DETECTIVE_THROTTLE_PERIOD = 0.2
 ENABLE_RETRY_ATTEMPTS = 10
 ENABLE_RETRY_SLEEP_INTERVAL = 10
 MAX_RETRY = 5
 SLEEP_SECONDS = 10
+GRAPH_READY_TIMEOUT_SECONDS = int(os.environ.get("GRAPH_READY_TIMEOUT_SECONDS", "300"))
 
 
 try:
@@ -74,6 +74,39 @@ def get_graph_arn_from_list_graphs(detective_client: DetectiveClient) -> str:
         return response["GraphList"][0]["Arn"]
 
 
+def graph_exists(detective_client: DetectiveClient) -> bool:
+    """Check if the account has a detective behavior graph.
+
+    Args:
+        detective_client: boto3 detective client
+
+    Returns:
+        True or False
+    """
+    response: ListGraphsResponseTypeDef = detective_client.list_graphs()
+    return len(response.get("GraphList", [])) > 0
+
+
+def wait_for_graphs(admin_account_id: str, configuration_role_name: str, regions: list) -> bool:
+    """Wait until the delegated admin account has a behavior graph in all regions.
+
+    Args:
+        admin_account_id: Admin account ID
+        configuration_role_name: Configuration role name
+        regions: AWS Region List
+
+    Returns:
+        True if a graph exists in every region, False if some regions had no graph when the wait ended
+    """
+    delegated_admin_session = common.assume_role(configuration_role_name, "sra-org-detective-setup", admin_account_id)
+    # Clients are created up front because boto3 sessions are not thread safe
+    detective_clients = {region: delegated_admin_session.client("detective", region, config=common.RATE_LIMITED_BOTO3_CONFIG) for region in regions}
+    region_results = common.wait_until_in_regions(
+        lambda region: graph_exists(detective_clients[region]), regions, "Detective behavior graph", GRAPH_READY_TIMEOUT_SECONDS
+    )
+    return all(region_results.values())
+
+
 def is_admin_account_enabled(detective_client: DetectiveClient, admin_account_id: str) -> bool:
     """Is admin account enabled.
 
@@ -85,11 +118,11 @@ def is_admin_account_enabled(detective_client: DetectiveClient, admin_account_id
         True or False
     """
     paginator: botocore.paginate.Paginator = detective_client.get_paginator("list_organization_admin_accounts")
-    for page in paginator.paginate():
+    limiter = common.get_rate_limiter("detective", region=detective_client.meta.region_name)
+    for page in common.rate_limited_pages(paginator.paginate(), limiter):
         for admin_account in page["Administrators"]:
             if admin_account["AccountId"] == admin_account_id:
                 return True
-        sleep(DETECTIVE_THROTTLE_PERIOD)
     return False
 
 
@@ -100,12 +133,12 @@ def disable_organization_admin_account(regions: list) -> None:
         regions: AWS Region List
     """
     for region in regions:
-        detective_client: DetectiveClient = MANAGEMENT_ACCOUNT_SESSION.client("detective", region)
-        response = detective_client.disable_organization_admin_account()
+        detective_client: DetectiveClient = MANAGEMENT_ACCOUNT_SESSION.client("detective", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
+        with common.get_rate_limiter("detective", region=region):
+            response = detective_client.disable_organization_admin_account()
         api_call_details = {"API_Call": "detective:DisableOrganizationAdminAccount", "API_Response": response}
         LOGGER.info(api_call_details)
         LOGGER.info(f"Admin Account Disabled in {region}")
-        sleep(DETECTIVE_THROTTLE_PERIOD)
 
 
 def check_organization_admin_enabled(detective_client: DetectiveClient) -> bool:
@@ -136,7 +169,7 @@ def register_and_enable_delegated_admin(admin_account_id: str, region: str) -> N
     Raises:
         Exception: Generic Exception
     """
-    detective_client: DetectiveClient = MANAGEMENT_ACCOUNT_SESSION.client("detective", region)
+    detective_client: DetectiveClient = MANAGEMENT_ACCOUNT_SESSION.client("detective", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
     try:
         if not check_organization_admin_enabled(detective_client):
             LOGGER.info(f"Enabling detective admin account {admin_account_id} in region {region}")
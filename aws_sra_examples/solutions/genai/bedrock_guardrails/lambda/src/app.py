@@ -26,6 +26,7 @@ import sra_s3
 import sra_sqs
 import sra_ssm_params
 import sra_sts
+import sra_waiter
 
 LOGGER = logging.getLogger(__name__)
 log_level: str = os.environ.get("LOG_LEVEL", "INFO")
@@ -305,6 +306,8 @@ def deploy_state_table() -> None:
 
         if dynamodb.table_exists(STATE_TABLE) is False:
             dynamodb.create_table(STATE_TABLE)
+        else:
+            dynamodb.create_missing_indexes(STATE_TABLE)
 
         item_found, find_result = dynamodb.find_item(
             STATE_TABLE,
@@ -564,7 +567,10 @@ def create_kms_key(acct: str, region: str) -> None:
             LOGGER.info("Customizing key policy...")
             kms_key_policy = update_kms_key_policy(acct, region)
             LOGGER.info("Searching for existing keys with proper policy...")
-            kms_search_result, kms_found_id = kms.search_key_policies(kms.KMS_CLIENT, json.dumps(kms_key_policy))
+            tagging_client = sts.assume_role(acct, sts.CONFIGURATION_ROLE, "resourcegroupstaggingapi", region)
+            kms_search_result, kms_found_id = kms.search_key_policies(
+                kms.KMS_CLIENT, json.dumps(kms_key_policy), SOLUTION_NAME, tagging_client
+            )
             if kms_search_result is True:
                 LOGGER.info(f"Found existing key with proper policy: {kms_found_id}")
                 bedrock_guardrails_key_id = kms_found_id
@@ -997,6 +1003,7 @@ def lambda_handler(event: dict, context: Any) -> dict:  # noqa: CCR001
     global DRY_RUN
 
     LAMBDA_START = dynamodb.get_date_time()
+    sra_waiter.set_lambda_context(context)
     LOGGER.info(event)
     LOGGER.info({"boto3 version": boto3.__version__})
     try:
@@ -1040,6 +1047,7 @@ def lambda_handler(event: dict, context: Any) -> dict:  # noqa: CCR001
             "dry_run_data": DRY_RUN_DATA,
         }
     LAMBDA_FINISH = dynamodb.get_date_time()
+    LOGGER.info({"Role_Session_Cache_Stats": sts.get_role_session_cache_stats()})
 
     lambda_data = {
         "start_time": LAMBDA_START,
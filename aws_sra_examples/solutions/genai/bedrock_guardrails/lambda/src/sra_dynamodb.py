@@ -10,14 +10,19 @@ SPDX-License-Identifier: MIT-0
 
 import logging
 import os
+import queue
 import random
 import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from time import sleep
-from typing import TYPE_CHECKING, Any, Dict, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence
 
 import boto3
+import sra_waiter
+from boto3.dynamodb.types import TypeDeserializer
 from boto3.session import Session
+from botocore.exceptions import ClientError
 
 if TYPE_CHECKING:
     from mypy_boto3_dynamodb.client import DynamoDBClient
@@ -30,6 +35,7 @@ class SRADynamoDB:
 
     PROFILE = "default"
     UNEXPECTED = "Unexpected!"
+    TABLE_ACTIVE_TIMEOUT_SECONDS = 60
 
     LOGGER = logging.getLogger(__name__)
     log_level: str = os.environ.get("LOG_LEVEL", "INFO")
@@ -49,6 +55,12 @@ class SRADynamoDB:
         LOGGER.info(f"Error creating boto3 dymanodb resource and/or client: {error}")
         raise ValueError(f"Error creating boto3 dymanodb resource and/or client: {error}") from None
 
+    # global secondary indexes of the state table; each is keyed on the attribute and solution_name
+    STATE_TABLE_INDEXES: dict = {"arn-index": "arn", "account-index": "account"}
+    ACTIVE_INDEXES: dict = {}
+
+    STATE_TABLE_SCAN_SEGMENTS: int = int(os.environ.get("STATE_TABLE_SCAN_SEGMENTS", "4"))
+
     def __init__(self, profile: str = "default") -> None:
         """Initialize class object.
 
@@ -77,8 +89,6 @@ class SRADynamoDB:
         Args:
             table_name (str): DynamoDB table name
         """
-        max_retries = 10
-        retries = 0
         # Define table schema
         key_schema: Sequence[KeySchemaElementTypeDef] = [
             {"AttributeName": "solution_name", "KeyType": "HASH"},
@@ -87,6 +97,8 @@ class SRADynamoDB:
         attribute_definitions: Sequence[AttributeDefinitionTypeDef] = [
             {"AttributeName": "solution_name", "AttributeType": "S"},  # String type
             {"AttributeName": "record_id", "AttributeType": "S"},  # String type
+            {"AttributeName": "arn", "AttributeType": "S"},  # String type, arn-index key
+            {"AttributeName": "account", "AttributeType": "S"},  # String type, account-index key
         ]
         provisioned_throughput: ProvisionedThroughputTypeDef = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
 
@@ -94,22 +106,113 @@ class SRADynamoDB:
         self.LOGGER.info(f"Creating {table_name} dynamodb table...")
         try:
             self.DYNAMODB_CLIENT.create_table(
-                TableName=table_name, KeySchema=key_schema, AttributeDefinitions=attribute_definitions, ProvisionedThroughput=provisioned_throughput
+                TableName=table_name,
+                KeySchema=key_schema,
+                AttributeDefinitions=attribute_definitions,
+                ProvisionedThroughput=provisioned_throughput,
+                GlobalSecondaryIndexes=self.get_global_secondary_indexes(provisioned_throughput),  # type: ignore
             )
             self.LOGGER.info(f"{table_name} dynamodb table created successfully.")
         except Exception as e:
             self.LOGGER.info("Error creating table:", e)
+
         # wait for the table to become active
-        while retries < max_retries:
-            self.LOGGER.info(f"Checking to see if {table_name} dynamodb table is active attempt {retries+1} of {max_retries}...")
-            wait_response = self.DYNAMODB_CLIENT.describe_table(TableName=table_name)
-            if wait_response["Table"]["TableStatus"] == "ACTIVE":
-                self.LOGGER.info(f"{table_name} dynamodb table is active")
-                break
-            else:
-                self.LOGGER.info(f"{table_name} dynamodb table is not active yet. Status is '{wait_response['Table']['TableStatus']}'  Waiting...")
-                retries += 1
-                sleep(5)
+        def table_active() -> bool:
+            table_status = self.DYNAMODB_CLIENT.describe_table(TableName=table_name)["Table"]["TableStatus"]
+            self.LOGGER.info(f"{table_name} dynamodb table status is '{table_status}'")
+            return table_status == "ACTIVE"
+
+        sra_waiter.wait_until(table_active, f"{table_name} dynamodb table", self.TABLE_ACTIVE_TIMEOUT_SECONDS)
+        self.ACTIVE_INDEXES.pop(table_name, None)
+
+    def get_global_secondary_indexes(self, provisioned_throughput: Optional[Mapping[str, int]] = None) -> list:
+        """Get the global secondary index definitions of the state table.
+
+        Args:
+            provisioned_throughput (Optional[Mapping[str, int]]): provisioned throughput of each index, for provisioned capacity tables
+
+        Returns:
+            list: global secondary index definitions
+        """
+        indexes = []
+        for index_name, attribute in self.STATE_TABLE_INDEXES.items():
+            index: Dict[str, Any] = {
+                "IndexName": index_name,
+                "KeySchema": [{"AttributeName": attribute, "KeyType": "HASH"}, {"AttributeName": "solution_name", "KeyType": "RANGE"}],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            if provisioned_throughput:
+                index["ProvisionedThroughput"] = provisioned_throughput
+            indexes.append(index)
+        return indexes
+
+    def get_active_indexes(self, table_name: str) -> set:
+        """Get the active global secondary indexes of a DynamoDB table, cached for the life of the Lambda container.
+
+        Args:
+            table_name (str): DynamoDB table name
+
+        Returns:
+            set: names of the active indexes
+        """
+        if table_name not in self.ACTIVE_INDEXES:
+            try:
+                table = self.DYNAMODB_RESOURCE.meta.client.describe_table(TableName=table_name)["Table"]
+            except ClientError as e:
+                self.LOGGER.info(f"Unable to describe {table_name} dynamodb table indexes: {e}")
+                return set()
+            self.ACTIVE_INDEXES[table_name] = {
+                index["IndexName"] for index in table.get("GlobalSecondaryIndexes", []) if index["IndexStatus"] == "ACTIVE"
+            }
+        return self.ACTIVE_INDEXES[table_name]
+
+    def create_missing_indexes(self, table_name: str) -> None:
+        """Add the state table indexes to a DynamoDB table created without them.
+
+        DynamoDB builds one new index at a time, so each call starts at most one index. Lookups use the base table
+        until an index is active.
+
+        Args:
+            table_name (str): DynamoDB table name
+        """
+        self.ACTIVE_INDEXES.pop(table_name, None)
+        table = self.DYNAMODB_CLIENT.describe_table(TableName=table_name)["Table"]
+        index_statuses = {index["IndexName"]: index["IndexStatus"] for index in table.get("GlobalSecondaryIndexes", [])}
+        provisioned_throughput = None
+        if table.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+            provisioned_throughput = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+        missing_indexes = [index for index in self.get_global_secondary_indexes(provisioned_throughput) if index["IndexName"] not in index_statuses]
+        if not missing_indexes:
+            return
+        if any(status != "ACTIVE" for status in index_statuses.values()):
+            self.LOGGER.info(f"{table_name} dynamodb table indexes are being updated: {index_statuses}")
+            return
+        index = missing_indexes[0]
+        self.LOGGER.info(f"Creating {index['IndexName']} index on {table_name} dynamodb table...")
+        try:
+            self.DYNAMODB_CLIENT.update_table(
+                TableName=table_name,
+                AttributeDefinitions=[{"AttributeName": key["AttributeName"], "AttributeType": "S"} for key in index["KeySchema"]],
+                GlobalSecondaryIndexUpdates=[{"Create": index}],  # type: ignore
+            )
+        except ClientError as e:
+            self.LOGGER.info(f"Error creating {index['IndexName']} index on {table_name} dynamodb table: {e}")
+
+    def get_index_key(self, table_name: str, attributes: Iterable) -> tuple[str, str]:
+        """Get an active state table index keyed on one of the attributes.
+
+        Args:
+            table_name (str): DynamoDB table name
+            attributes (Iterable): attribute names to look up by
+
+        Returns:
+            tuple[str, str]: index name and its key attribute, or empty strings if no active index applies
+        """
+        active_indexes = self.get_active_indexes(table_name)
+        for index_name, attribute in self.STATE_TABLE_INDEXES.items():
+            if attribute in attributes and index_name in active_indexes:
+                return index_name, attribute
+        return "", ""
 
     def table_exists(self, table_name: str) -> bool:
         """Check if DynamoDB table exists.
@@ -222,18 +325,19 @@ class SRADynamoDB:
         self.LOGGER.info(f"Searching for {additional_attributes} in {table_name} dynamodb table")
         table = self.DYNAMODB_RESOURCE.Table(table_name)
         expression_attribute_values = {":solution_name": solution_name}
-
-        filter_expression = " AND ".join([f"{attr} = :{attr}" for attr in additional_attributes.keys()])
-
         expression_attribute_values.update({f":{attr}": value for attr, value in additional_attributes.items()})
 
-        query_params: Dict[str, Any] = {}
-
-        query_params = {
+        query_params: Dict[str, Any] = {
             "KeyConditionExpression": "solution_name = :solution_name",
             "ExpressionAttributeValues": expression_attribute_values,
-            "FilterExpression": filter_expression,
         }
+        index_name, index_attribute = self.get_index_key(table_name, additional_attributes)
+        if index_name:
+            query_params["IndexName"] = index_name
+            query_params["KeyConditionExpression"] = f"{index_attribute} = :{index_attribute} AND solution_name = :solution_name"
+        filter_attributes = [attr for attr in additional_attributes if attr != index_attribute]
+        if filter_attributes:
+            query_params["FilterExpression"] = " AND ".join([f"{attr} = :{attr}" for attr in filter_attributes])
 
         response = table.query(**query_params)
 
@@ -254,14 +358,75 @@ class SRADynamoDB:
             list_of_values: list of values
 
         Returns:
-            list of unique values
+            list of unique values, in the order first seen
         """
         self.LOGGER.info(f"Getting unique values from {list_of_values}")
-        unique_values = []
-        for value in list_of_values:
-            if value not in unique_values:
-                unique_values.append(value)
-        return unique_values
+        return list(dict.fromkeys(list_of_values))
+
+    def scan_solutions_and_accounts(self, table_name: str, total_segments: int = STATE_TABLE_SCAN_SEGMENTS) -> Iterator[tuple[str, str]]:
+        """Yield the distinct solution and account pairs of the dynamodb table.
+
+        The table is read with a parallel segmented scan that follows pagination and projects only solution_name and
+        account. Each segment is scanned with the thread-safe dynamodb client rather than a shared Table resource, and
+        pages are handed over through a bounded queue, so at most a few pages are held in memory while pairs are yielded.
+
+        Args:
+            table_name: dynamodb table name
+            total_segments: number of scan segments read in parallel
+
+        Yields:
+            solution name and account pairs
+        """
+        self.LOGGER.info(f"Scanning {table_name} dynamodb table for solutions and accounts with {total_segments} segments")
+        deserializer = TypeDeserializer()
+        pages: queue.Queue = queue.Queue(maxsize=total_segments * 2)
+        stop_scan = threading.Event()
+
+        def put_page(page: Optional[list]) -> bool:
+            while not stop_scan.is_set():
+                try:
+                    pages.put(page, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan_segment(segment: int) -> None:
+            try:
+                scan_params: Dict[str, Any] = {
+                    "TableName": table_name,
+                    "Segment": segment,
+                    "TotalSegments": total_segments,
+                    "ProjectionExpression": "solution_name, account",
+                }
+                while not stop_scan.is_set():
+                    response = self.DYNAMODB_CLIENT.scan(**scan_params)
+                    items = [{name: deserializer.deserialize(value) for name, value in item.items()} for item in response["Items"]]
+                    if not put_page(items) or "LastEvaluatedKey" not in response:
+                        break
+                    scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            finally:
+                put_page(None)
+
+        seen_pairs = set()
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            segment_scans = [executor.submit(scan_segment, segment) for segment in range(total_segments)]
+            try:
+                finished_segments = 0
+                while finished_segments < total_segments:
+                    items = pages.get()
+                    if items is None:
+                        finished_segments += 1
+                        continue
+                    for item in items:
+                        pair = (item.get("solution_name"), item.get("account"))
+                        if None not in pair and pair not in seen_pairs:
+                            seen_pairs.add(pair)
+                            yield pair
+            finally:
+                stop_scan.set()
+            for segment_scan in segment_scans:
+                segment_scan.result()
 
     def get_distinct_solutions_and_accounts(self, table_name: str) -> tuple[list, list]:
         """Get distinct solutions and accounts from the dynamodb table.
@@ -273,13 +438,12 @@ class SRADynamoDB:
             list of distinct solutions and accounts
         """
         self.LOGGER.info(f"Getting distinct solutions and accounts from {table_name} dynamodb table")
-        table = self.DYNAMODB_RESOURCE.Table(table_name)
-        response = table.scan()
-        solution_names = [item["solution_name"] for item in response["Items"]]
-        solution_names = self.get_unique_values_from_list(solution_names)
-        accounts = [item["account"] for item in response["Items"]]
-        accounts = self.get_unique_values_from_list(accounts)
-        return solution_names, accounts
+        solution_names: dict = {}
+        accounts: dict = {}
+        for solution_name, account in self.scan_solutions_and_accounts(table_name):
+            solution_names[solution_name] = None
+            accounts[account] = None
+        return list(solution_names), list(accounts)
 
     def get_resources_for_solutions_by_account(self, table_name: str, solutions: list, account: str) -> dict:
         """Get resources for solutions by account from the dynamodb table.
@@ -294,6 +458,7 @@ class SRADynamoDB:
         """
         self.LOGGER.info(f"Getting resources for solutions by account from {table_name} dynamodb table")
         table = self.DYNAMODB_RESOURCE.Table(table_name)
+        index_name, _ = self.get_index_key(table_name, ["account"])
         query_results = {}
         for solution in solutions:
             query_params: Dict[str, Any] = {
@@ -301,6 +466,10 @@ class SRADynamoDB:
                 "ExpressionAttributeValues": {":solution_name": solution, ":account": account},
                 "FilterExpression": "account = :account",
             }
+            if index_name:
+                query_params["IndexName"] = index_name
+                query_params["KeyConditionExpression"] = "account = :account AND solution_name = :solution_name"
+                del query_params["FilterExpression"]
             response = table.query(**query_params)
             self.LOGGER.info(f"response: {response}")
             query_results[solution] = response
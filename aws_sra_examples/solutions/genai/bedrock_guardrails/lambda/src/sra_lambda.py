@@ -11,10 +11,10 @@ from __future__ import annotations
 
 import logging
 import os
-from time import sleep
 from typing import TYPE_CHECKING
 
 import boto3
+import sra_waiter
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
@@ -32,6 +32,7 @@ class SRALambda:
 
     BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
     UNEXPECTED = "Unexpected!"
+    WAITER_TIMEOUT_SECONDS = 120
 
     try:
         MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
@@ -88,11 +89,9 @@ class SRALambda:
             Lambda function arn if created, else "None"
         """
         self.LOGGER.info(f"Role ARN passed to create_lambda_function: {role_arn}...")
-        max_retries = 10
-        retries = 0
         self.LOGGER.info(f"Size of {code_zip_file} is {os.path.getsize(code_zip_file)} bytes")
-        while retries < max_retries:
-            self.LOGGER.info(f"Create function attempt {retries+1} of {max_retries}...")
+
+        def deploy_function() -> bool:
             try:
                 create_response = self.LAMBDA_CLIENT.create_function(
                     FunctionName=function_name,
@@ -105,7 +104,6 @@ class SRALambda:
                     Tags={"sra-solution": solution_name},
                 )
                 self.LOGGER.info(f"Lambda function created successfully: {create_response}")
-                break
             except ClientError as error:
                 if error.response["Error"]["Code"] == "ResourceConflictException":
                     try:
@@ -115,37 +113,32 @@ class SRALambda:
                             ZipFile=open(code_zip_file, "rb").read(),  # noqa: SIM115
                         )
                         self.LOGGER.info(f"Lambda function code updated successfully: {update_response}")
-                        break
                     except Exception as e:
                         self.LOGGER.info(f"Error deploying Lambda function: {e}")
-                        break
                 elif error.response["Error"]["Code"] == "InvalidParameterValueException":
                     self.LOGGER.info(f"Lambda not ready to deploy yet. {error}; Retrying...")
-                    retries += 1
-                    sleep(5)
+                    return False
                 else:
                     self.LOGGER.info(f"Error deploying Lambda function: {error}")
-                    break
-        retries = 0
-        while retries < max_retries:
+            return True
+
+        sra_waiter.wait_until(deploy_function, f"Lambda function {function_name} deployment", self.WAITER_TIMEOUT_SECONDS)
+        get_response: dict = {}
+
+        def function_active() -> bool:
             try:
-                self.LOGGER.info(f"Search for function attempt {retries+1} of {max_retries}...")
-                get_response = self.LAMBDA_CLIENT.get_function(FunctionName=function_name)
-                if get_response["Configuration"]["State"] == "Active":
-                    self.LOGGER.info(f"Lambda function {function_name} is now active")
-                    break
-                else:
-                    self.LOGGER.info(f"{function_name} lambda function state is {get_response['Configuration']['State']}.  Waiting to retry...")
-                retries += 1
-                sleep(5)
+                get_response.update(self.LAMBDA_CLIENT.get_function(FunctionName=function_name))
             except ClientError as e:
                 if e.response["Error"]["Code"] == "ResourceNotFoundException":
                     self.LOGGER.info(f"Lambda function {function_name} not found.  Retrying...")
-                    retries += 1
-                    sleep(5)
-                else:
-                    self.LOGGER.info(f"Error getting Lambda function: {e}")
-                    raise ValueError(f"Error getting Lambda function: {e}") from None
+                    return False
+                self.LOGGER.info(f"Error getting Lambda function: {e}")
+                raise ValueError(f"Error getting Lambda function: {e}") from None
+            self.LOGGER.info(f"{function_name} lambda function state is {get_response['Configuration']['State']}")
+            return get_response["Configuration"]["State"] == "Active"
+
+        if not sra_waiter.wait_until(function_active, f"Lambda function {function_name}", self.WAITER_TIMEOUT_SECONDS) and not get_response:
+            raise ValueError(f"Lambda function {function_name} was not found after it was deployed")
         return get_response["Configuration"]["FunctionArn"]
 
     def get_permissions(self, function_name: str) -> str:
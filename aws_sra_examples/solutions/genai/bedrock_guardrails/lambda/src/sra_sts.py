@@ -9,12 +9,16 @@ SPDX-License-Identifier: MIT-0
 """
 import logging
 import os
+import threading
+from collections import OrderedDict
 from typing import Any
 
 import boto3
 import botocore
 import botocore.exceptions
 from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
+from botocore.session import get_session
 
 
 class SRASTS:
@@ -27,6 +31,19 @@ class SRASTS:
     BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
     PARTITION: str = ""
     HOME_REGION: str = ""
+    # Assumed role sessions are shared by all instances and keyed by (account, role, partition, role session name)
+    ROLE_SESSION_NAME: str = "SRA-AssumeCrossAccountRole"
+    ROLE_SESSION_DURATION_SECONDS: int = 900
+    CREDENTIAL_REFRESH_MARGIN_SECONDS: int = int(os.environ.get("CREDENTIAL_REFRESH_MARGIN_SECONDS", "300"))
+    ROLE_SESSION_CACHE: dict = {}
+    ROLE_SESSION_CACHE_STATS: dict = {"Hits": 0, "Misses": 0}
+    ROLE_SESSION_LOCKS: dict = {}
+    ROLE_SESSION_LOCK = threading.Lock()
+    # Least recently used pool of boto3 clients keyed by (account, region, service, role)
+    CLIENT_POOL_MAX_SIZE: int = int(os.environ.get("CLIENT_POOL_MAX_SIZE", "256"))
+    CLIENT_POOL: OrderedDict = OrderedDict()
+    CLIENT_POOL_STATS: dict = {"Hits": 0, "Misses": 0, "Evictions": 0}
+    CLIENT_POOL_LOCK = threading.Lock()
 
     # Setup Default Logger
     LOGGER = logging.getLogger(__name__)
@@ -80,6 +97,116 @@ class SRASTS:
                 self.LOGGER.info(f"Error: {error}")
                 raise ValueError(f"Error: {error}") from None
 
+    def get_role_session(self, account: str, role_name: str) -> boto3.Session:
+        """Get a cached boto3 session for the role, assuming it only when no session exists for the account and role.
+
+        The session credentials are refreshed automatically by botocore once they are within
+        CREDENTIAL_REFRESH_MARGIN_SECONDS of expiring.
+
+        Args:
+            account: aws account id
+            role_name: aws role name
+
+        Returns:
+            boto3.Session: session with auto-refreshing credentials for the role
+        """
+        cache_key = (account, role_name, self.PARTITION, self.ROLE_SESSION_NAME)
+        with self.ROLE_SESSION_LOCK:
+            key_lock = self.ROLE_SESSION_LOCKS.setdefault(cache_key, threading.Lock())
+
+        with key_lock:
+            if cache_key in self.ROLE_SESSION_CACHE:
+                self.ROLE_SESSION_CACHE_STATS["Hits"] += 1
+                return self.ROLE_SESSION_CACHE[cache_key]
+            self.ROLE_SESSION_CACHE_STATS["Misses"] += 1
+            role_arn = "arn:" + self.PARTITION + ":iam::" + account + ":role/" + role_name
+
+            def refresh_credentials() -> dict:
+                self.LOGGER.info(f"Assuming {role_arn}")
+                sts_response = self.STS_CLIENT.assume_role(
+                    RoleArn=role_arn,
+                    RoleSessionName=self.ROLE_SESSION_NAME,
+                    DurationSeconds=self.ROLE_SESSION_DURATION_SECONDS,
+                )
+                return {
+                    "access_key": sts_response["Credentials"]["AccessKeyId"],
+                    "secret_key": sts_response["Credentials"]["SecretAccessKey"],
+                    "token": sts_response["Credentials"]["SessionToken"],
+                    "expiry_time": sts_response["Credentials"]["Expiration"].isoformat(),
+                }
+
+            credentials = RefreshableCredentials.create_from_metadata(
+                metadata=refresh_credentials(), refresh_using=refresh_credentials, method="sts-assume-role"
+            )
+            # botocore refreshes 15 minutes before expiry by default, which would refresh these 900 second sessions on every call.
+            # The refresh windows and the session credentials have no public setters, so the attributes are set directly.
+            credentials._advisory_refresh_timeout = self.CREDENTIAL_REFRESH_MARGIN_SECONDS
+            credentials._mandatory_refresh_timeout = self.CREDENTIAL_REFRESH_MARGIN_SECONDS // 2
+            botocore_session = get_session()
+            botocore_session._credentials = credentials
+            self.ROLE_SESSION_CACHE[cache_key] = boto3.Session(botocore_session=botocore_session)
+            return self.ROLE_SESSION_CACHE[cache_key]
+
+    def get_role_session_cache_stats(self) -> dict:
+        """Get the assumed role session cache statistics.
+
+        Returns:
+            dict: cache hits, misses and number of cached sessions
+        """
+        return {**self.ROLE_SESSION_CACHE_STATS, "Sessions": len(self.ROLE_SESSION_CACHE)}
+
+    def get_pooled_client(self, account: str, role_name: str, service: str, region_name: str) -> Any:
+        """Get a boto3 client from the pool, creating it when the pool has no usable client for the key.
+
+        Pooled clients whose credentials are within the refresh margin of expiring are evicted and recreated. The pool is
+        bounded to CLIENT_POOL_MAX_SIZE clients, evicting the least recently used client first.
+
+        Args:
+            account: aws account id
+            role_name: aws role name
+            service: aws service
+            region_name: aws region
+
+        Returns:
+            Any: boto3 client
+        """
+        pool_key = (account, region_name, service, role_name)
+        with self.CLIENT_POOL_LOCK:
+            pooled = self.CLIENT_POOL.get(pool_key)
+            if pooled is not None:
+                credentials = pooled["Credentials"]
+                if isinstance(credentials, RefreshableCredentials) and credentials.refresh_needed():
+                    self.LOGGER.info(f"Evicting client with expiring credentials: {pool_key}")
+                    del self.CLIENT_POOL[pool_key]
+                    self.CLIENT_POOL_STATS["Evictions"] += 1
+                else:
+                    self.CLIENT_POOL.move_to_end(pool_key)
+                    self.CLIENT_POOL_STATS["Hits"] += 1
+                    return pooled["Client"]
+
+        if account != self.MANAGEMENT_ACCOUNT:
+            session = self.get_role_session(account, role_name)
+        else:
+            session = self.MANAGEMENT_ACCOUNT_SESSION
+
+        with self.CLIENT_POOL_LOCK:
+            # boto3 sessions are not thread safe, so clients are created while holding the pool lock
+            client = session.client(service, region_name=region_name, config=self.BOTO3_CONFIG)  # type: ignore
+            self.CLIENT_POOL[pool_key] = {"Client": client, "Credentials": session.get_credentials()}
+            self.CLIENT_POOL_STATS["Misses"] += 1
+            while len(self.CLIENT_POOL) > self.CLIENT_POOL_MAX_SIZE:
+                self.CLIENT_POOL.popitem(last=False)
+                self.CLIENT_POOL_STATS["Evictions"] += 1
+        return client
+
+    def get_client_pool_stats(self) -> dict:
+        """Get the client pool statistics.
+
+        Returns:
+            dict: pool hits, misses, evictions and number of pooled clients
+        """
+        return {**self.CLIENT_POOL_STATS, "Clients": len(self.CLIENT_POOL)}
+
     def assume_role(self, account: str, role_name: str, service: str, region_name: str) -> Any:
         """Get boto3 client assumed into an account for a specified service.
 
@@ -92,23 +219,8 @@ class SRASTS:
         Returns:
             Any: boto3 client
         """
-        self.LOGGER.info(f"ASSUME ROLE CALLER ID INFO: {self.MANAGEMENT_ACCOUNT_SESSION.client('sts').get_caller_identity()}")
         self.LOGGER.info(f"ASSUME ROLE ACCOUNT (CLIENT): {account}; ROLE NAME: {role_name}; SERVICE: {service}; REGION: {region_name}")
-        client = self.MANAGEMENT_ACCOUNT_SESSION.client("sts")
-        if account != self.MANAGEMENT_ACCOUNT:
-            sts_response = client.assume_role(
-                RoleArn="arn:" + self.PARTITION + ":iam::" + account + ":role/" + role_name,
-                RoleSessionName="SRA-AssumeCrossAccountRole",
-                DurationSeconds=900,
-            )
-            return self.MANAGEMENT_ACCOUNT_SESSION.client(
-                service,  # type: ignore
-                region_name=region_name,
-                aws_access_key_id=sts_response["Credentials"]["AccessKeyId"],
-                aws_secret_access_key=sts_response["Credentials"]["SecretAccessKey"],
-                aws_session_token=sts_response["Credentials"]["SessionToken"],
-            )
-        return self.MANAGEMENT_ACCOUNT_SESSION.client(service, region_name=region_name, config=self.BOTO3_CONFIG)  # type: ignore
+        return self.get_pooled_client(account, role_name, service, region_name)
 
     def assume_role_resource(self, account: str, role_name: str, service: str, region_name: str) -> Any:
         """Get boto3 resource assumed into an account for a specified service.
@@ -122,21 +234,10 @@ class SRASTS:
         Returns:
             Any: boto3 client
         """
-        self.LOGGER.info(f"ASSUME ROLE CALLER ID INFO: {self.MANAGEMENT_ACCOUNT_SESSION.client('sts').get_caller_identity()}")
         self.LOGGER.info(f"ASSUME ROLE ACCOUNT (RESOURCE): {account}; ROLE NAME: {role_name}; SERVICE: {service}; REGION: {region_name}")
-        client = self.MANAGEMENT_ACCOUNT_SESSION.client("sts")
-        sts_response = client.assume_role(
-            RoleArn="arn:" + self.PARTITION + ":iam::" + account + ":role/" + role_name,
-            RoleSessionName="SRA-AssumeCrossAccountRole",
-            DurationSeconds=900,
-        )
-        return self.MANAGEMENT_ACCOUNT_SESSION.resource(
-            service,  # type: ignore
-            region_name=region_name,
-            aws_access_key_id=sts_response["Credentials"]["AccessKeyId"],
-            aws_secret_access_key=sts_response["Credentials"]["SecretAccessKey"],
-            aws_session_token=sts_response["Credentials"]["SessionToken"],
-        )
+        session = self.get_role_session(account, role_name)
+        with self.CLIENT_POOL_LOCK:
+            return session.resource(service, region_name=region_name)  # type: ignore
 
     def get_lambda_execution_role(self) -> str:
         """Get the current lambda execution role arn.
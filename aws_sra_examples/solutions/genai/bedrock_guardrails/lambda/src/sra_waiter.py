@@ -0,0 +1,84 @@
+"""Lambda module to wait for SRA resources to become ready.
+
+Version: 1.0
+
+WAITER module for SRA in the repo, https://github.com/aws-samples/aws-security-reference-architecture-examples
+
+Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+SPDX-License-Identifier: MIT-0
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+from time import monotonic, sleep
+from typing import Any, Callable
+
+# Setup Default Logger
+LOGGER = logging.getLogger(__name__)
+log_level: str = os.environ.get("LOG_LEVEL", "INFO")
+LOGGER.setLevel(log_level)
+
+# Readiness waiter settings. Waits are also bounded by the remaining Lambda execution time once a context is set.
+WAITER_BASE_DELAY_SECONDS = float(os.environ.get("WAITER_BASE_DELAY_SECONDS", "1"))
+WAITER_MAX_DELAY_SECONDS = float(os.environ.get("WAITER_MAX_DELAY_SECONDS", "15"))
+WAITER_DEADLINE_MARGIN_SECONDS = int(os.environ.get("WAITER_DEADLINE_MARGIN_SECONDS", "30"))
+LAMBDA_CONTEXT: dict = {"Context": None}
+
+
+def set_lambda_context(context: Any) -> None:
+    """Remember the Lambda context so waits can be bounded by the remaining execution time.
+
+    Args:
+        context: Lambda runtime information
+    """
+    LAMBDA_CONTEXT["Context"] = context
+
+
+def get_remaining_seconds() -> float:
+    """Get the seconds left before the Lambda deadline, less WAITER_DEADLINE_MARGIN_SECONDS.
+
+    Returns:
+        Remaining seconds, or infinity when no Lambda context is set
+    """
+    context = LAMBDA_CONTEXT["Context"]
+    if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+        return float("inf")
+    return context.get_remaining_time_in_millis() / 1000 - WAITER_DEADLINE_MARGIN_SECONDS
+
+
+def wait_until(
+    condition: Callable[[], bool],
+    description: str,
+    timeout_seconds: float = 300,
+    base_delay: float = WAITER_BASE_DELAY_SECONDS,
+    max_delay: float = WAITER_MAX_DELAY_SECONDS,
+) -> bool:
+    """Poll a condition with exponential backoff and full jitter until it is met or the deadline passes.
+
+    Args:
+        condition: Function returning True once the resource is ready
+        description: Description of what is being waited on, used for logging
+        timeout_seconds: Maximum seconds to wait. Defaults to 300.
+        base_delay: Delay cap for the first retry. Defaults to WAITER_BASE_DELAY_SECONDS.
+        max_delay: Upper bound for any single delay. Defaults to WAITER_MAX_DELAY_SECONDS.
+
+    Returns:
+        True if the condition was met, False if the deadline passed first
+    """
+    deadline = monotonic() + min(timeout_seconds, get_remaining_seconds())
+    attempt = 0
+    while True:
+        attempt += 1
+        if condition():
+            LOGGER.info(f"{description} ready after {attempt} check(s)")
+            return True
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            LOGGER.info(f"{description} not ready after {attempt} check(s)")
+            return False
+        delay = min(remaining, random.uniform(0, min(max_delay, base_delay * 2 ** min(attempt, 16))))  # noqa: S311
+        LOGGER.debug(f"{description} not ready, checking again in {delay:.1f} seconds")
+        sleep(delay)
@@ -14,6 +14,8 @@ import json
 import logging
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional
@@ -31,6 +33,7 @@ import sra_s3
 import sra_sns
 import sra_ssm_params
 import sra_sts
+import sra_waiter
 
 LOGGER = logging.getLogger(__name__)
 log_level: str = os.environ.get("LOG_LEVEL", "INFO")
@@ -144,6 +147,14 @@ DRY_RUN_DATA: dict = {}
 
 # other global variables
 LIVE_RUN_DATA: dict = {}
+# store the fanout payload in the staging bucket and only send its key in the SNS messages
+SNS_CLAIM_CHECK: bool = os.environ.get("SNS_CLAIM_CHECK", "true").lower() == "true"
+# (rule, account) config rule deployments run concurrently; shared run data updates take RUN_DATA_LOCK
+CONFIG_RULE_DEPLOY_MAX_WORKERS: int = int(os.environ.get("CONFIG_RULE_DEPLOY_MAX_WORKERS", "10"))
+# Handler, runtime, timeout and memory size of the config rule lambda functions, for both creating and updating them
+RULE_LAMBDA_SETTINGS: dict = {"handler": "app.lambda_handler", "runtime": "python3.12", "timeout": 900, "memory_size": 512}
+RUN_DATA_LOCK = threading.Lock()
+STATE_TABLE_LOCK = threading.Lock()
 IAM_POLICY_DOCUMENTS: Dict[str, Any] = load_iam_policy_documents()
 CLOUDWATCH_METRIC_FILTERS: dict = load_cloudwatch_metric_filters()
 KMS_KEY_POLICIES: dict = load_kms_key_policies()
@@ -549,6 +560,8 @@ def deploy_state_table() -> None:
 
         if dynamodb.table_exists(STATE_TABLE) is False:
             dynamodb.create_table(STATE_TABLE)
+        else:
+            dynamodb.create_missing_indexes(STATE_TABLE)
 
         item_found, find_result = dynamodb.find_item(
             STATE_TABLE,
@@ -585,6 +598,20 @@ def deploy_state_table() -> None:
         DRY_RUN_DATA["StateTableCreate"] = f"DRY_RUN: Create the {STATE_TABLE} state table"
 
 
+def increment_deployment_info(action_count: int = 0, resources_deployed: int = 0, configuration_changes: int = 0) -> None:
+    """Increment the deployment info counters, safe to call from worker threads.
+
+    Args:
+        action_count (int): actions to add
+        resources_deployed (int): deployed resources to add
+        configuration_changes (int): configuration changes to add
+    """
+    with RUN_DATA_LOCK:
+        CFN_RESPONSE_DATA["deployment_info"]["action_count"] += action_count
+        CFN_RESPONSE_DATA["deployment_info"]["resources_deployed"] += resources_deployed
+        CFN_RESPONSE_DATA["deployment_info"]["configuration_changes"] += configuration_changes
+
+
 def add_state_table_record(  # noqa: CFQ002
     aws_service: str,
     component_state: str,
@@ -610,43 +637,56 @@ def add_state_table_record(  # noqa: CFQ002
         key_id (str): key id
 
     Returns:
-        None
+        str: record id
     """
     LOGGER.info(f"Add a record to the state table for {component_name}")
     if account_id is None:
         account_id = "Unknown"
-    dynamodb.DYNAMODB_RESOURCE = sts.assume_role_resource(ssm_params.SRA_SECURITY_ACCT, sts.CONFIGURATION_ROLE, "dynamodb", sts.HOME_REGION)
+    # records are buffered and written in batches by flush_state_table_records
+    with STATE_TABLE_LOCK:
+        dynamodb.DYNAMODB_RESOURCE = sts.assume_role_resource(ssm_params.SRA_SECURITY_ACCT, sts.CONFIGURATION_ROLE, "dynamodb", sts.HOME_REGION)
+        return dynamodb.buffer_item(
+            STATE_TABLE,
+            SOLUTION_NAME,
+            {
+                "aws_service": aws_service,
+                "component_state": component_state,
+                "account": account_id,
+                "description": description,
+                "component_region": region,
+                "component_type": component_type,
+                "component_name": component_name,
+                "key_id": key_id,
+                "arn": resource_arn,
+                "date_time": dynamodb.get_date_time(),
+            },
+        )
 
-    item_found, find_result = dynamodb.find_item(
-        STATE_TABLE,
-        SOLUTION_NAME,
-        {
-            "arn": resource_arn,
-        },
-    )
-    if item_found is False:
-        sra_resource_record_id, iam_date_time = dynamodb.insert_item(STATE_TABLE, SOLUTION_NAME)
-    else:
-        sra_resource_record_id = find_result["record_id"]
-
-    dynamodb.update_item(
-        STATE_TABLE,
-        SOLUTION_NAME,
-        sra_resource_record_id,
-        {
-            "aws_service": aws_service,
-            "component_state": component_state,
-            "account": account_id,
-            "description": description,
-            "component_region": region,
-            "component_type": component_type,
-            "component_name": component_name,
-            "key_id": key_id,
-            "arn": resource_arn,
-            "date_time": dynamodb.get_date_time(),
-        },
-    )
-    return sra_resource_record_id
+
+def flush_state_table_records() -> None:
+    """Write the buffered state table records to the state table."""
+    with STATE_TABLE_LOCK:
+        dynamodb.DYNAMODB_RESOURCE = sts.assume_role_resource(ssm_params.SRA_SECURITY_ACCT, sts.CONFIGURATION_ROLE, "dynamodb", sts.HOME_REGION)
+        dynamodb.flush_items()
+
+
+def flush_state_table_records_or_fail(event: dict, context: Any) -> None:
+    """Write the buffered state table records after an error, then report the failure to CloudFormation.
+
+    The records of the resources deployed before the error are kept, and a failure to write them is logged so the
+    CloudFormation response is still sent.
+
+    Args:
+        event: Lambda event
+        context: Lambda context
+    """
+    try:
+        flush_state_table_records()
+    except Exception:
+        LOGGER.exception("Unable to write the buffered state table records")
+    reason = f"See the details in CloudWatch Log Stream: '{context.log_group_name}'"
+    if RESOURCE_TYPE != "Other":
+        cfnresponse.send(event, context, cfnresponse.FAILED, {}, CFN_RESOURCE_ID, reason=reason)
 
 
 def remove_state_table_record(resource_arn: str) -> Any:
@@ -658,6 +698,7 @@ def remove_state_table_record(resource_arn: str) -> Any:
     Returns:
         Any: response from the dynamodb delete_item function
     """
+    flush_state_table_records()
     dynamodb.DYNAMODB_RESOURCE = sts.assume_role_resource(ssm_params.SRA_SECURITY_ACCT, sts.CONFIGURATION_ROLE, "dynamodb", sts.HOME_REGION)
     LOGGER.info(f"Searching for {resource_arn} in {STATE_TABLE} dynamodb table...")
     try:
@@ -794,6 +835,9 @@ def deploy_sns_configuration_topics(context: Any) -> str:
 def deploy_config_rules(region: str, accounts: list, resource_properties: dict) -> None:  # noqa: CCR001
     """Deploy config rules.
 
+    Each rule's lambda code is retrieved once, then the (rule, account) deployments run concurrently with up to
+    CONFIG_RULE_DEPLOY_MAX_WORKERS at a time. The IAM role, lambda and config rule steps of a deployment stay in order.
+
     Args:
         region (str): aws region
         accounts (list): aws accounts
@@ -802,6 +846,7 @@ def deploy_config_rules(region: str, accounts: list, resource_properties: dict)
     global DRY_RUN_DATA
     global LIVE_RUN_DATA
     global CFN_RESPONSE_DATA
+    deployments: list = []
     for prop in resource_properties:
         if prop.startswith("SRA-BEDROCK-CHECK-"):
             rule_name: str = prop
@@ -815,6 +860,7 @@ def deploy_config_rules(region: str, accounts: list, resource_properties: dict)
                     LOGGER.info(f"{rule_name} does not apply to {region}; skipping...")
                     continue
 
+            deploy_accounts = []
             for acct in accounts:
 
                 if rule_deploy is False:
@@ -830,43 +876,65 @@ def deploy_config_rules(region: str, accounts: list, resource_properties: dict)
                     if acct not in rule_accounts:
                         LOGGER.info(f"{rule_name} does not apply to {acct}; skipping...")
                         continue
-                if DRY_RUN is False:
-                    # 3a) Deploy IAM role for custom config rule lambda
-                    LOGGER.info(f"Deploying IAM role for custom config rule lambda in {acct}")
-                    role_arn = deploy_iam_role(acct, rule_name)
-                    LIVE_RUN_DATA[f"{rule_name}_{acct}_IAMRole"] = "Deployed IAM role for custom config rule lambda"
+                deploy_accounts.append(acct)
 
-                else:
-                    LOGGER.info(f"DRY_RUN: Deploying IAM role for custom config rule lambda in {acct}")
-                    DRY_RUN_DATA[f"{rule_name}_{acct}_IAMRole"] = "DRY_RUN: Deploy IAM role for custom config rule lambda"
-                # 3b) Deploy lambda for custom config rule
-                if DRY_RUN is False:
-                    # download rule zip file
-                    s3_key = f"{SOLUTION_NAME}/rules/{rule_name}/{rule_name}.zip"
-                    local_base_path = "/tmp/sra_staging_upload"  # noqa: S108
-                    local_file_path = os.path.join(local_base_path, f"{SOLUTION_NAME}", "rules", rule_name, f"{rule_name}.zip")  # noqa: PL118
-                    s3.download_s3_file(local_file_path, s3_key, s3.STAGING_BUCKET)
-                    LIVE_RUN_DATA[f"{rule_name}_{acct}_{region}_LambdaCode"] = "Downloaded custom config rule lambda code"
-                    CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
+            rule_code = b""
+            if deploy_accounts and DRY_RUN is False:
+                # get rule zip file once for all of the rule's deployments; the bytes stay cached for later runs
+                rule_code = s3.get_artifact(s3.STAGING_BUCKET, f"{SOLUTION_NAME}/rules/{rule_name}/{rule_name}.zip")
+                LIVE_RUN_DATA[f"{rule_name}_{region}_LambdaCode"] = "Retrieved custom config rule lambda code"
+                increment_deployment_info(action_count=1)
+            deployments.extend((rule_name, acct, region, rule_input_params, rule_code) for acct in deploy_accounts)
 
-                    LOGGER.info(f"Deploying lambda for custom config rule in {acct} in {region}")
-                    lambda_arn = deploy_lambda_function(acct, rule_name, role_arn, region)
-                    LIVE_RUN_DATA[f"{rule_name}_{acct}_{region}_Lambda"] = "Deployed custom config lambda function"
-                    CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-                    CFN_RESPONSE_DATA["deployment_info"]["resources_deployed"] += 1
-                else:
-                    LOGGER.info(f"DRY_RUN: Deploying lambda for custom config rule in {acct} in {region}")
-                    DRY_RUN_DATA[f"{rule_name}_{acct}_{region}_Lambda"] = "DRY_RUN: Deploy custom config lambda function"
+    if not deployments:
+        return
+    with ThreadPoolExecutor(max_workers=min(CONFIG_RULE_DEPLOY_MAX_WORKERS, len(deployments))) as executor:
+        list(executor.map(lambda deployment: deploy_config_rule_to_account(*deployment), deployments))
 
-                # 3c) Deploy the config rule (requires config_org [non-CT] or config_mgmt [CT] solution)
-                if DRY_RUN is False:
-                    deploy_config_rule(acct, rule_name, lambda_arn, region, rule_input_params)
-                    LIVE_RUN_DATA[f"{rule_name}_{acct}_{region}_Config"] = "Deployed custom config rule"
-                    CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-                    CFN_RESPONSE_DATA["deployment_info"]["resources_deployed"] += 1
-                else:
-                    LOGGER.info(f"DRY_RUN: Deploying custom config rule in {acct} in {region}")
-                    DRY_RUN_DATA[f"{rule_name}_{acct}_{region}_Config"] = "DRY_RUN: Deploy custom config rule"
+
+def deploy_config_rule_to_account(rule_name: str, acct: str, region: str, rule_input_params: dict, rule_code: bytes) -> None:
+    """Deploy the IAM role, lambda function and config rule for a custom config rule in one account, in that order.
+
+    Each deployment uses its own IAM, Lambda and Config helpers because their clients are set per account and region.
+
+    Args:
+        rule_name (str): config rule name
+        acct (str): aws account
+        region (str): aws region
+        rule_input_params (dict): input parameters for the config rule
+        rule_code (bytes): config rule lambda code zip file contents
+    """
+    rule_iam = sra_iam.SRAIAM()
+    rule_lambdas = sra_lambda.SRALambda()
+    rule_config = sra_config.SRAConfig()
+
+    if DRY_RUN is False:
+        # 3a) Deploy IAM role for custom config rule lambda
+        LOGGER.info(f"Deploying IAM role for custom config rule lambda in {acct}")
+        role_arn = deploy_iam_role(acct, rule_name, rule_iam)
+        LIVE_RUN_DATA[f"{rule_name}_{acct}_IAMRole"] = "Deployed IAM role for custom config rule lambda"
+
+    else:
+        LOGGER.info(f"DRY_RUN: Deploying IAM role for custom config rule lambda in {acct}")
+        DRY_RUN_DATA[f"{rule_name}_{acct}_IAMRole"] = "DRY_RUN: Deploy IAM role for custom config rule lambda"
+    # 3b) Deploy lambda for custom config rule
+    if DRY_RUN is False:
+        LOGGER.info(f"Deploying lambda for custom config rule in {acct} in {region}")
+        lambda_arn = deploy_lambda_function(acct, rule_name, role_arn, region, rule_code, rule_lambdas)
+        LIVE_RUN_DATA[f"{rule_name}_{acct}_{region}_Lambda"] = "Deployed custom config lambda function"
+        increment_deployment_info(action_count=1, resources_deployed=1)
+    else:
+        LOGGER.info(f"DRY_RUN: Deploying lambda for custom config rule in {acct} in {region}")
+        DRY_RUN_DATA[f"{rule_name}_{acct}_{region}_Lambda"] = "DRY_RUN: Deploy custom config lambda function"
+
+    # 3c) Deploy the config rule (requires config_org [non-CT] or config_mgmt [CT] solution)
+    if DRY_RUN is False:
+        deploy_config_rule(acct, rule_name, lambda_arn, region, rule_input_params, rule_config, rule_lambdas)
+        LIVE_RUN_DATA[f"{rule_name}_{acct}_{region}_Config"] = "Deployed custom config rule"
+        increment_deployment_info(action_count=1, resources_deployed=1)
+    else:
+        LOGGER.info(f"DRY_RUN: Deploying custom config rule in {acct} in {region}")
+        DRY_RUN_DATA[f"{rule_name}_{acct}_{region}_Config"] = "DRY_RUN: Deploy custom config rule"
 
 
 def deploy_metric_filters_and_alarms(region: str, accounts: list, resource_properties: dict) -> None:  # noqa: CCR001, CFQ001, C901
@@ -947,13 +1015,18 @@ def deploy_metric_filters_and_alarms(region: str, accounts: list, resource_prope
                     kms_key_policy["Statement"][2]["Principal"]["AWS"] = execution_role_arn
                     LOGGER.info(f"Customizing key policy...done: {kms_key_policy}")
                     LOGGER.info("Searching for existing keys with proper policy...")
-                    kms_search_result, kms_found_id = kms.search_key_policies(kms.KMS_CLIENT, json.dumps(kms_key_policy))
+                    tagging_client = sts.assume_role(acct, sts.CONFIGURATION_ROLE, "resourcegroupstaggingapi", region)
+                    kms_search_result, kms_found_id = kms.search_key_policies(
+                        kms.KMS_CLIENT, json.dumps(kms_key_policy), SOLUTION_NAME, tagging_client
+                    )
                     if kms_search_result is True:
                         LOGGER.info(f"Found existing key with proper policy: {kms_found_id}")
                         alarm_key_id = kms_found_id
                     else:
                         LOGGER.info("No existing key found with proper policy. Creating new key...")
-                        alarm_key_id = kms.create_kms_key(kms.KMS_CLIENT, json.dumps(kms_key_policy), "Key for CloudWatch Alarm SNS Topic Encryption")
+                        alarm_key_id = kms.create_kms_key(
+                            kms.KMS_CLIENT, json.dumps(kms_key_policy), SOLUTION_NAME, "Key for CloudWatch Alarm SNS Topic Encryption"
+                        )
                         LOGGER.info(f"Created SRA alarm KMS key: {alarm_key_id}")
                         LIVE_RUN_DATA["KMSKeyCreate"] = "Created SRA alarm KMS key"
                         CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
@@ -1479,6 +1552,7 @@ def create_event(event: dict, context: Any) -> str:
         )
         LOGGER.info(f"Dry run data file uploaded to s3://{s3.STAGING_BUCKET}/dry_run_data_{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}.json")
 
+    flush_state_table_records()
     if RESOURCE_TYPE == CFN_CUSTOM_RESOURCE:
         LOGGER.info("Resource type is a custom resource")
         cfnresponse.send(event, context, cfnresponse.SUCCESS, CFN_RESPONSE_DATA, CFN_RESOURCE_ID)
@@ -1873,6 +1947,15 @@ def delete_event(event: dict, context: Any) -> None:  # noqa: CFQ001, CCR001, C9
 
     # 4) Delete config rules
     accounts, regions = get_accounts_and_regions(event["ResourceProperties"])
+    # include the accounts the state table has solution records for, such as accounts no longer in the solution's scope
+    dynamodb.DYNAMODB_RESOURCE = sts.assume_role_resource(ssm_params.SRA_SECURITY_ACCT, sts.CONFIGURATION_ROLE, "dynamodb", sts.HOME_REGION)
+    try:
+        for solution_name, account in dynamodb.scan_solutions_and_accounts(STATE_TABLE):
+            if solution_name == SOLUTION_NAME and re.match(r"^\d{12}$", account) and account not in accounts:
+                LOGGER.info(f"Adding {account} from the {STATE_TABLE} dynamodb table to the config rule delete accounts")
+                accounts.append(account)
+    except Exception as error:
+        LOGGER.info(f"Unable to scan {STATE_TABLE} dynamodb table for accounts: {error}")
     for prop in event["ResourceProperties"]:
         if prop.startswith("SRA-BEDROCK-CHECK-"):
             rule_name: str = prop
@@ -1898,6 +1981,7 @@ def delete_event(event: dict, context: Any) -> None:  # noqa: CFQ001, CCR001, C9
     else:
         LOGGER.info(json.dumps({"RUN STATS": CFN_RESPONSE_DATA, "RUN DATA": DRY_RUN_DATA}))
 
+    flush_state_table_records()
     if RESOURCE_TYPE != "Other":
         cfnresponse.send(event, context, cfnresponse.SUCCESS, CFN_RESPONSE_DATA, CFN_RESOURCE_ID)
 
@@ -1926,8 +2010,12 @@ def create_sns_messages(
     sns_messages = []
     LOGGER.info("ResourceProperties found in event")
 
+    payload: dict = {"Accounts": accounts, "ResourceProperties": resource_properties}
+    if SNS_CLAIM_CHECK and s3.STAGING_BUCKET:
+        payload = {"PayloadBucket": s3.STAGING_BUCKET, "PayloadKey": s3.put_payload(s3.STAGING_BUCKET, payload)}
+
     for region in regions:
-        sns_message = {"Accounts": accounts, "Region": region, "ResourceProperties": resource_properties, "Action": action}
+        sns_message = {**payload, "Region": region, "Action": action}
         sns_messages.append(
             {
                 "Id": region,
@@ -1943,6 +2031,20 @@ def create_sns_messages(
         DRY_RUN_DATA["SNSFanout"] = "DRY_RUN: Published SNS messages for regional fanout configuration. More dry run data in subsequent log streams."
 
 
+def resolve_sns_message(message: dict) -> dict:
+    """Resolve an SNS fanout message, loading the accounts and resource properties from the staging bucket when needed.
+
+    Args:
+        message: SNS message
+
+    Returns:
+        SNS message with the Accounts and ResourceProperties
+    """
+    if "PayloadKey" not in message:
+        return message
+    return {**message, **s3.get_payload(message["PayloadBucket"], message["PayloadKey"])}
+
+
 def process_sns_records(event: dict) -> None:
     """Process SNS records.
 
@@ -1953,27 +2055,28 @@ def process_sns_records(event: dict) -> None:
     for record in event["Records"]:
         record["Sns"]["Message"] = json.loads(record["Sns"]["Message"])
         LOGGER.info({"SNS Record": record})
-        message = record["Sns"]["Message"]
+        message = resolve_sns_message(record["Sns"]["Message"])
         if message["Action"] == "configure":
             LOGGER.info("Continuing process to enable SRA safeguards for Bedrock (sns event)")
 
             # 3) Deploy config rules (regional)
-            message["Accounts"].append(sts.MANAGEMENT_ACCOUNT)
+            accounts = message["Accounts"] + [sts.MANAGEMENT_ACCOUNT]
             deploy_config_rules(
                 message["Region"],
-                message["Accounts"],
+                accounts,
                 message["ResourceProperties"],
             )
 
             # 4) deploy kms cmk, cloudwatch metric filters, and SNS topics for alarms (regional)
             deploy_metric_filters_and_alarms(
                 message["Region"],
-                message["Accounts"],
+                accounts,
                 message["ResourceProperties"],
             )
 
         else:
             LOGGER.info(f"Action specified is {message['Action']}")
+    flush_state_table_records()
     LOGGER.info("SNS records processed.")
     if DRY_RUN is False:
         LOGGER.info(json.dumps({"RUN STATS": CFN_RESPONSE_DATA, "RUN DATA": LIVE_RUN_DATA}))
@@ -1998,27 +2101,26 @@ def create_json_file(file_name: str, data: dict) -> None:
         json.dump(data, f, ensure_ascii=False, indent=4)
 
 
-def deploy_iam_role(account_id: str, rule_name: str) -> str:  # noqa: CFQ001, CCR001, C901
+def deploy_iam_role(account_id: str, rule_name: str, rule_iam: sra_iam.SRAIAM = iam) -> str:  # noqa: CFQ001, CCR001, C901
     """Deploy IAM role.
 
     Args:
         account_id: AWS account ID
         rule_name: config rule name
+        rule_iam: IAM helper for the account. Defaults to the shared IAM helper.
 
     Returns:
         IAM role ARN
     """
-    global CFN_RESPONSE_DATA
-    iam.IAM_CLIENT = sts.assume_role(account_id, sts.CONFIGURATION_ROLE, "iam", iam.get_iam_global_region())
+    rule_iam.IAM_CLIENT = sts.assume_role(account_id, sts.CONFIGURATION_ROLE, "iam", rule_iam.get_iam_global_region())
     LOGGER.info(f"Deploying IAM {rule_name} execution role for rule lambda in {account_id}...")
     role_arn = ""
-    iam_role_search = iam.check_iam_role_exists(rule_name)
+    iam_role_search = rule_iam.check_iam_role_exists(rule_name)
     if iam_role_search[0] is False:
         if DRY_RUN is False:
             LOGGER.info(f"Creating {rule_name} IAM role")
-            role_arn = iam.create_role(rule_name, iam.SRA_TRUST_DOCUMENTS["sra-config-rule"], SOLUTION_NAME)["Role"]["Arn"]
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["resources_deployed"] += 1
+            role_arn = rule_iam.create_role(rule_name, rule_iam.SRA_TRUST_DOCUMENTS["sra-config-rule"], SOLUTION_NAME)["Role"]["Arn"]
+            increment_deployment_info(action_count=1, resources_deployed=1)
             # add IAM role state table record
             add_state_table_record("iam", "implemented", "role for config rule", "role", role_arn, account_id, "Global", rule_name)
 
@@ -2033,24 +2135,20 @@ def deploy_iam_role(account_id: str, rule_name: str) -> str:  # noqa: CFQ001, CC
         if DRY_RUN is False:
             add_state_table_record("iam", "implemented", "role for config rule", "role", role_arn, account_id, "Global", rule_name)
 
-    iam.SRA_POLICY_DOCUMENTS["sra-lambda-basic-execution"]["Statement"][0]["Resource"] = iam.SRA_POLICY_DOCUMENTS[  # noqa: ECE001
-        "sra-lambda-basic-execution"
-    ]["Statement"][0]["Resource"].replace("ACCOUNT_ID", account_id)
-    iam.SRA_POLICY_DOCUMENTS["sra-lambda-basic-execution"]["Statement"][1]["Resource"] = iam.SRA_POLICY_DOCUMENTS[  # noqa: ECE001
-        "sra-lambda-basic-execution"
-    ]["Statement"][1]["Resource"].replace("ACCOUNT_ID", account_id)
-    iam.SRA_POLICY_DOCUMENTS["sra-lambda-basic-execution"]["Statement"][1]["Resource"] = iam.SRA_POLICY_DOCUMENTS[  # noqa: ECE001
-        "sra-lambda-basic-execution"
-    ]["Statement"][1]["Resource"].replace("CONFIG_RULE_NAME", rule_name)
-    LOGGER.info(f"Policy document: {iam.SRA_POLICY_DOCUMENTS['sra-lambda-basic-execution']}")
+    # customize a copy so the shared policy template keeps its placeholders for the other accounts and rules
+    basic_execution_policy = copy.deepcopy(rule_iam.SRA_POLICY_DOCUMENTS["sra-lambda-basic-execution"])
+    basic_execution_policy["Statement"][0]["Resource"] = basic_execution_policy["Statement"][0]["Resource"].replace("ACCOUNT_ID", account_id)
+    basic_execution_policy["Statement"][1]["Resource"] = (
+        basic_execution_policy["Statement"][1]["Resource"].replace("ACCOUNT_ID", account_id).replace("CONFIG_RULE_NAME", rule_name)
+    )
+    LOGGER.info(f"Policy document: {basic_execution_policy}")
     policy_arn = f"arn:{sts.PARTITION}:iam::{account_id}:policy/{rule_name}-lamdba-basic-execution"
-    iam_policy_search = iam.check_iam_policy_exists(policy_arn)
+    iam_policy_search = rule_iam.check_iam_policy_exists(policy_arn)
     if iam_policy_search is False:
         if DRY_RUN is False:
             LOGGER.info(f"Creating {rule_name}-lamdba-basic-execution IAM policy in {account_id}...")
-            iam.create_policy(f"{rule_name}-lamdba-basic-execution", iam.SRA_POLICY_DOCUMENTS["sra-lambda-basic-execution"], SOLUTION_NAME)
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["resources_deployed"] += 1
+            rule_iam.create_policy(f"{rule_name}-lamdba-basic-execution", basic_execution_policy, SOLUTION_NAME)
+            increment_deployment_info(action_count=1, resources_deployed=1)
             # add IAM policy state table record
             add_state_table_record(
                 "iam", "implemented", "policy for config rule role", "policy", policy_arn, account_id, "Global", f"{rule_name}-lamdba-basic-execution"
@@ -2066,13 +2164,12 @@ def deploy_iam_role(account_id: str, rule_name: str) -> str:  # noqa: CFQ001, CC
             )
 
     policy_arn2 = f"arn:{sts.PARTITION}:iam::{account_id}:policy/{rule_name}"
-    iam_policy_search2 = iam.check_iam_policy_exists(policy_arn2)
+    iam_policy_search2 = rule_iam.check_iam_policy_exists(policy_arn2)
     if iam_policy_search2 is False:
         if DRY_RUN is False:
             LOGGER.info(f"Creating {rule_name} IAM policy in {account_id}...")
-            iam.create_policy(f"{rule_name}", IAM_POLICY_DOCUMENTS[rule_name], SOLUTION_NAME)
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["resources_deployed"] += 1
+            rule_iam.create_policy(f"{rule_name}", IAM_POLICY_DOCUMENTS[rule_name], SOLUTION_NAME)
+            increment_deployment_info(action_count=1, resources_deployed=1)
             # add IAM policy state table record
             add_state_table_record("iam", "implemented", "policy for config rule", "policy", policy_arn2, account_id, "Global", rule_name)
         else:
@@ -2083,50 +2180,52 @@ def deploy_iam_role(account_id: str, rule_name: str) -> str:  # noqa: CFQ001, CC
         if DRY_RUN is False:
             add_state_table_record("iam", "implemented", "policy for config rule", "policy", policy_arn2, account_id, "Global", rule_name)
 
-    policy_attach_search1 = iam.check_iam_policy_attached(rule_name, policy_arn)
+    policy_attach_search1 = rule_iam.check_iam_policy_attached(rule_name, policy_arn)
     if policy_attach_search1 is False:
         if DRY_RUN is False:
             LOGGER.info(f"Attaching {rule_name}-lamdba-basic-execution policy to {rule_name} IAM role in {account_id}...")
-            iam.attach_policy(rule_name, policy_arn)
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["configuration_changes"] += 1
+            rule_iam.attach_policy(rule_name, policy_arn)
+            increment_deployment_info(action_count=1, configuration_changes=1)
         else:
             LOGGER.info(f"DRY_RUN: attaching {rule_name}-lamdba-basic-execution policy to {rule_name} IAM role in {account_id}...")
 
-    policy_attach_search2 = iam.check_iam_policy_attached(rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSConfigRulesExecutionRole")
+    policy_attach_search2 = rule_iam.check_iam_policy_attached(
+        rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSConfigRulesExecutionRole"
+    )
     if policy_attach_search2 is False:
         if DRY_RUN is False:
             LOGGER.info(f"Attaching AWSConfigRulesExecutionRole policy to {rule_name} IAM role in {account_id}...")
-            iam.attach_policy(rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSConfigRulesExecutionRole")
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["configuration_changes"] += 1
+            rule_iam.attach_policy(rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSConfigRulesExecutionRole")
+            increment_deployment_info(action_count=1, configuration_changes=1)
         else:
             LOGGER.info(f"DRY_RUN: Attaching AWSConfigRulesExecutionRole policy to {rule_name} IAM role in {account_id}...")
 
-    policy_attach_search3 = iam.check_iam_policy_attached(rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole")
+    policy_attach_search3 = rule_iam.check_iam_policy_attached(
+        rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
+    )
     if policy_attach_search3 is False:
         if DRY_RUN is False:
             LOGGER.info(f"Attaching AWSConfigRulesExecutionRole policy to {rule_name} IAM role in {account_id}...")
-            iam.attach_policy(rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole")
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["configuration_changes"] += 1
+            rule_iam.attach_policy(rule_name, f"arn:{sts.PARTITION}:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole")
+            increment_deployment_info(action_count=1, configuration_changes=1)
         else:
             LOGGER.info(f"DRY_RUN: Attaching AWSLambdaBasicExecutionRole policy to {rule_name} IAM role in {account_id}...")
 
-    policy_attach_search4 = iam.check_iam_policy_attached(rule_name, policy_arn2)
+    policy_attach_search4 = rule_iam.check_iam_policy_attached(rule_name, policy_arn2)
     if policy_attach_search4 is False:
         if DRY_RUN is False:
             LOGGER.info(f"Attaching {rule_name} to {rule_name} IAM role in {account_id}...")
-            iam.attach_policy(rule_name, policy_arn2)
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["configuration_changes"] += 1
+            rule_iam.attach_policy(rule_name, policy_arn2)
+            increment_deployment_info(action_count=1, configuration_changes=1)
         else:
             LOGGER.info(f"DRY_RUN: attaching {rule_name} to {rule_name} IAM role in {account_id}...")
 
     return role_arn
 
 
-def deploy_lambda_function(account_id: str, rule_name: str, role_arn: str, region: str) -> str:
+def deploy_lambda_function(  # noqa: CFQ002
+    account_id: str, rule_name: str, role_arn: str, region: str, rule_code: bytes, rule_lambdas: sra_lambda.SRALambda = lambdas
+) -> str:
     """Deploy lambda function.
 
     Args:
@@ -2134,33 +2233,24 @@ def deploy_lambda_function(account_id: str, rule_name: str, role_arn: str, regio
         rule_name: config rule name
         role_arn: IAM role ARN
         region: AWS region
+        rule_code: lambda code zip file contents
+        rule_lambdas: Lambda helper for the account and region. Defaults to the shared Lambda helper.
 
     Returns:
         Lambda function ARN
     """
-    lambdas.LAMBDA_CLIENT = sts.assume_role(account_id, sts.CONFIGURATION_ROLE, "lambda", region)
+    rule_lambdas.LAMBDA_CLIENT = sts.assume_role(account_id, sts.CONFIGURATION_ROLE, "lambda", region)
     LOGGER.info(f"Deploying lambda function for {rule_name} config rule to {account_id} in {region}...")
-    lambda_function_search = lambdas.find_lambda_function(rule_name)
+    lambda_function_search = rule_lambdas.find_lambda_function(rule_name)
     if lambda_function_search == "None":
         LOGGER.info(f"{rule_name} lambda function not found in {account_id}.  Creating...")
-        lambda_source_zip = f"/tmp/sra_staging_upload/{SOLUTION_NAME}/rules/{rule_name}/{rule_name}.zip"  # noqa: S108
-        LOGGER.info(f"Lambda zip file: {lambda_source_zip}")
-        lambda_create = lambdas.create_lambda_function(
-            lambda_source_zip,
-            role_arn,
-            rule_name,
-            "app.lambda_handler",
-            "python3.12",
-            900,
-            512,
-            SOLUTION_NAME,
-        )
+        lambda_create = rule_lambdas.create_lambda_function(rule_code, role_arn, rule_name, solution_name=SOLUTION_NAME, **RULE_LAMBDA_SETTINGS)
         lambda_arn = lambda_create
         # add Lambda state table record
         add_state_table_record("lambda", "implemented", "lambda for config rule", "lambda", lambda_arn, account_id, region, rule_name)
     else:
         LOGGER.info(f"{rule_name} already exists in {account_id}.  Search result: {lambda_function_search}")
-        lambda_arn = lambda_function_search
+        lambda_arn = rule_lambdas.update_lambda_function(rule_code, role_arn, rule_name, **RULE_LAMBDA_SETTINGS)
         # add Lambda state table record
         if DRY_RUN is False:
             add_state_table_record("lambda", "implemented", "lambda for config rule", "lambda", lambda_arn, account_id, region, rule_name)
@@ -2168,7 +2258,15 @@ def deploy_lambda_function(account_id: str, rule_name: str, role_arn: str, regio
     return lambda_arn
 
 
-def deploy_config_rule(account_id: str, rule_name: str, lambda_arn: str, region: str, input_params: dict) -> None:
+def deploy_config_rule(  # noqa: CFQ002
+    account_id: str,
+    rule_name: str,
+    lambda_arn: str,
+    region: str,
+    input_params: dict,
+    rule_config: sra_config.SRAConfig = config,
+    rule_lambdas: sra_lambda.SRALambda = lambdas,
+) -> None:
     """Deploy config rule.
 
     Args:
@@ -2177,21 +2275,23 @@ def deploy_config_rule(account_id: str, rule_name: str, lambda_arn: str, region:
         lambda_arn: lambda function ARN
         region: AWS region
         input_params: input parameters for the config rule
+        rule_config: Config helper for the account and region. Defaults to the shared Config helper.
+        rule_lambdas: Lambda helper for the account and region the rule lambda was deployed with. Defaults to the shared Lambda helper.
     """
     LOGGER.info(f"Deploying {rule_name} config rule to {account_id} in {region}...")
-    config.CONFIG_CLIENT = sts.assume_role(account_id, sts.CONFIGURATION_ROLE, "config", region)
-    config_rule_search = config.find_config_rule(rule_name)
+    rule_config.CONFIG_CLIENT = sts.assume_role(account_id, sts.CONFIGURATION_ROLE, "config", region)
+    config_rule_search = rule_config.find_config_rule(rule_name)
     if config_rule_search[0] is False:
         if DRY_RUN is False:
             LOGGER.info(f"Creating Config policy permissions for {rule_name} lambda function in {account_id} in {region}...")
             statement_id = "sra-config-invoke"
-            if lambdas.find_permission(rule_name, statement_id) is False:
+            if rule_lambdas.find_permission(rule_name, statement_id) is False:
                 LOGGER.info(f"Adding {statement_id} to {rule_name} lambda function in {account_id} in {region}...")
-                lambdas.put_permissions_acct(rule_name, "config-invoke", "config.amazonaws.com", "lambda:InvokeFunction", account_id)
+                rule_lambdas.put_permissions_acct(rule_name, "config-invoke", "config.amazonaws.com", "lambda:InvokeFunction", account_id)
             else:
                 LOGGER.info(f"{statement_id} already exists on {rule_name} lambda function in {account_id} in {region}...")
             LOGGER.info(f"Creating {rule_name} config rule in {account_id} in {region}...")
-            config.create_config_rule(
+            rule_config.create_config_rule(
                 rule_name,
                 lambda_arn,
                 "One_Hour",
@@ -2201,10 +2301,9 @@ def deploy_config_rule(account_id: str, rule_name: str, lambda_arn: str, region:
                 "DETECTIVE",
                 SOLUTION_NAME,
             )
-            config_rule_search = config.find_config_rule(rule_name)
+            config_rule_search = rule_config.find_config_rule(rule_name)
             config_rule_arn = config_rule_search[1]["ConfigRules"][0]["ConfigRuleArn"]
-            CFN_RESPONSE_DATA["deployment_info"]["action_count"] += 1
-            CFN_RESPONSE_DATA["deployment_info"]["resources_deployed"] += 1
+            increment_deployment_info(action_count=1, resources_deployed=1)
             # add Config rule state table record
             add_state_table_record("config", "implemented", "config rule", "rule", config_rule_arn, account_id, region, rule_name)
         else:
@@ -2341,6 +2440,7 @@ def lambda_handler(event: dict, context: Any) -> dict:  # noqa: CCR001
     global DRY_RUN
 
     LAMBDA_START = dynamodb.get_date_time()
+    sra_waiter.set_lambda_context(context)
     LOGGER.info(event)
     LOGGER.info({"boto3 version": boto3.__version__})
     try:
@@ -2355,7 +2455,7 @@ def lambda_handler(event: dict, context: Any) -> dict:  # noqa: CCR001
                 f"The event did not include Records or RequestType. Review CloudWatch logs '{context.log_group_name}' for details."
             ) from None
         elif "Records" in event and event["Records"][0]["EventSource"] == "aws:sns":
-            get_resource_parameters(json.loads(event["Records"][0]["Sns"]["Message"]))
+            get_resource_parameters(resolve_sns_message(json.loads(event["Records"][0]["Sns"]["Message"])))
             process_sns_records(event)
         elif "RequestType" in event:
             get_resource_parameters(event)
@@ -2374,9 +2474,7 @@ def lambda_handler(event: dict, context: Any) -> dict:  # noqa: CCR001
 
     except Exception:
         LOGGER.exception("Unexpected!")
-        reason = f"See the details in CloudWatch Log Stream: '{context.log_group_name}'"
-        if RESOURCE_TYPE != "Other":
-            cfnresponse.send(event, context, cfnresponse.FAILED, {}, CFN_RESOURCE_ID, reason=reason)
+        flush_state_table_records_or_fail(event, context)
         LAMBDA_FINISH = dynamodb.get_date_time()
         return {
             "statusCode": 500,
@@ -2387,6 +2485,7 @@ def lambda_handler(event: dict, context: Any) -> dict:  # noqa: CCR001
             "dry_run_data": DRY_RUN_DATA,
         }
     LAMBDA_FINISH = dynamodb.get_date_time()
+    LOGGER.info({"Role_Session_Cache_Stats": sts.get_role_session_cache_stats()})
 
     lambda_data = {
         "start_time": LAMBDA_START,
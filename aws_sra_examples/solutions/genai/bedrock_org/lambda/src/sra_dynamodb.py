@@ -8,16 +8,22 @@ Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 SPDX-License-Identifier: MIT-0
 """
 
+import hashlib
 import logging
 import os
+import queue
 import random
 import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from time import sleep
-from typing import TYPE_CHECKING, Any, Dict, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence
 
 import boto3
+import sra_waiter
+from boto3.dynamodb.types import TypeDeserializer
 from boto3.session import Session
+from botocore.exceptions import ClientError
 
 if TYPE_CHECKING:
     from mypy_boto3_dynamodb.client import DynamoDBClient
@@ -30,6 +36,7 @@ class SRADynamoDB:
 
     PROFILE = "default"
     UNEXPECTED = "Unexpected!"
+    TABLE_ACTIVE_TIMEOUT_SECONDS = 60
 
     LOGGER = logging.getLogger(__name__)
     log_level: str = os.environ.get("LOG_LEVEL", "INFO")
@@ -49,6 +56,16 @@ class SRADynamoDB:
         LOGGER.info(f"Error creating boto3 dymanodb resource and/or client: {error}")
         raise ValueError(f"Error creating boto3 dymanodb resource and/or client: {error}") from None
 
+    # global secondary indexes of the state table; each is keyed on the attribute and solution_name
+    STATE_TABLE_INDEXES: dict = {"arn-index": "arn", "account-index": "account"}
+    ACTIVE_INDEXES: dict = {}
+    # write-behind buffer of state table records, flushed with batch writes by flush_items
+    WRITE_BUFFER: dict = {}
+    WRITE_BUFFER_LOCK = threading.Lock()
+    RECORD_IDS: dict = {}
+
+    STATE_TABLE_SCAN_SEGMENTS: int = int(os.environ.get("STATE_TABLE_SCAN_SEGMENTS", "4"))
+
     def __init__(self, profile: str = "default") -> None:
         """Initialize class object.
 
@@ -77,8 +94,6 @@ class SRADynamoDB:
         Args:
             table_name (str): DynamoDB table name
         """
-        max_retries = 10
-        retries = 0
         # Define table schema
         key_schema: Sequence[KeySchemaElementTypeDef] = [
             {"AttributeName": "solution_name", "KeyType": "HASH"},
@@ -87,6 +102,8 @@ class SRADynamoDB:
         attribute_definitions: Sequence[AttributeDefinitionTypeDef] = [
             {"AttributeName": "solution_name", "AttributeType": "S"},  # String type
             {"AttributeName": "record_id", "AttributeType": "S"},  # String type
+            {"AttributeName": "arn", "AttributeType": "S"},  # String type, arn-index key
+            {"AttributeName": "account", "AttributeType": "S"},  # String type, account-index key
         ]
 
         # Create table
@@ -97,21 +114,109 @@ class SRADynamoDB:
                 KeySchema=key_schema,
                 AttributeDefinitions=attribute_definitions,
                 BillingMode="PAY_PER_REQUEST",  # on-demand capacity mode
+                GlobalSecondaryIndexes=self.get_global_secondary_indexes(),  # type: ignore
             )
             self.LOGGER.info(f"{table_name} dynamodb table created successfully.")
         except Exception as e:
             self.LOGGER.info("Error creating table:", e)
+
         # wait for the table to become active
-        while retries < max_retries:
-            self.LOGGER.info(f"Checking to see if {table_name} dynamodb table is active attempt {retries+1} of {max_retries}...")
-            wait_response = self.DYNAMODB_CLIENT.describe_table(TableName=table_name)
-            if wait_response["Table"]["TableStatus"] == "ACTIVE":
-                self.LOGGER.info(f"{table_name} dynamodb table is active")
-                break
-            else:
-                self.LOGGER.info(f"{table_name} dynamodb table is not active yet. Status is '{wait_response['Table']['TableStatus']}'  Waiting...")
-                retries += 1
-                sleep(5)
+        def table_active() -> bool:
+            table_status = self.DYNAMODB_CLIENT.describe_table(TableName=table_name)["Table"]["TableStatus"]
+            self.LOGGER.info(f"{table_name} dynamodb table status is '{table_status}'")
+            return table_status == "ACTIVE"
+
+        sra_waiter.wait_until(table_active, f"{table_name} dynamodb table", self.TABLE_ACTIVE_TIMEOUT_SECONDS)
+        self.ACTIVE_INDEXES.pop(table_name, None)
+
+    def get_global_secondary_indexes(self, provisioned_throughput: Optional[Mapping[str, int]] = None) -> list:
+        """Get the global secondary index definitions of the state table.
+
+        Args:
+            provisioned_throughput (Optional[Mapping[str, int]]): provisioned throughput of each index, for provisioned capacity tables
+
+        Returns:
+            list: global secondary index definitions
+        """
+        indexes = []
+        for index_name, attribute in self.STATE_TABLE_INDEXES.items():
+            index: Dict[str, Any] = {
+                "IndexName": index_name,
+                "KeySchema": [{"AttributeName": attribute, "KeyType": "HASH"}, {"AttributeName": "solution_name", "KeyType": "RANGE"}],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            if provisioned_throughput:
+                index["ProvisionedThroughput"] = provisioned_throughput
+            indexes.append(index)
+        return indexes
+
+    def get_active_indexes(self, table_name: str) -> set:
+        """Get the active global secondary indexes of a DynamoDB table, cached for the life of the Lambda container.
+
+        Args:
+            table_name (str): DynamoDB table name
+
+        Returns:
+            set: names of the active indexes
+        """
+        if table_name not in self.ACTIVE_INDEXES:
+            try:
+                table = self.DYNAMODB_RESOURCE.meta.client.describe_table(TableName=table_name)["Table"]
+            except ClientError as e:
+                self.LOGGER.info(f"Unable to describe {table_name} dynamodb table indexes: {e}")
+                return set()
+            self.ACTIVE_INDEXES[table_name] = {
+                index["IndexName"] for index in table.get("GlobalSecondaryIndexes", []) if index["IndexStatus"] == "ACTIVE"
+            }
+        return self.ACTIVE_INDEXES[table_name]
+
+    def create_missing_indexes(self, table_name: str) -> None:
+        """Add the state table indexes to a DynamoDB table created without them.
+
+        DynamoDB builds one new index at a time, so each call starts at most one index. Lookups use the base table
+        until an index is active.
+
+        Args:
+            table_name (str): DynamoDB table name
+        """
+        self.ACTIVE_INDEXES.pop(table_name, None)
+        table = self.DYNAMODB_CLIENT.describe_table(TableName=table_name)["Table"]
+        index_statuses = {index["IndexName"]: index["IndexStatus"] for index in table.get("GlobalSecondaryIndexes", [])}
+        provisioned_throughput = None
+        if table.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+            provisioned_throughput = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+        missing_indexes = [index for index in self.get_global_secondary_indexes(provisioned_throughput) if index["IndexName"] not in index_statuses]
+        if not missing_indexes:
+            return
+        if any(status != "ACTIVE" for status in index_statuses.values()):
+            self.LOGGER.info(f"{table_name} dynamodb table indexes are being updated: {index_statuses}")
+            return
+        index = missing_indexes[0]
+        self.LOGGER.info(f"Creating {index['IndexName']} index on {table_name} dynamodb table...")
+        try:
+            self.DYNAMODB_CLIENT.update_table(
+                TableName=table_name,
+                AttributeDefinitions=[{"AttributeName": key["AttributeName"], "AttributeType": "S"} for key in index["KeySchema"]],
+                GlobalSecondaryIndexUpdates=[{"Create": index}],  # type: ignore
+            )
+        except ClientError as e:
+            self.LOGGER.info(f"Error creating {index['IndexName']} index on {table_name} dynamodb table: {e}")
+
+    def get_index_key(self, table_name: str, attributes: Iterable) -> tuple[str, str]:
+        """Get an active state table index keyed on one of the attributes.
+
+        Args:
+            table_name (str): DynamoDB table name
+            attributes (Iterable): attribute names to look up by
+
+        Returns:
+            tuple[str, str]: index name and its key attribute, or empty strings if no active index applies
+        """
+        active_indexes = self.get_active_indexes(table_name)
+        for index_name, attribute in self.STATE_TABLE_INDEXES.items():
+            if attribute in attributes and index_name in active_indexes:
+                return index_name, attribute
+        return "", ""
 
     def table_exists(self, table_name: str) -> bool:
         """Check if DynamoDB table exists.
@@ -154,6 +259,93 @@ class SRADynamoDB:
         now = datetime.now()
         return now.strftime("%Y%m%d%H%M%S")
 
+    def get_record_ids(self, table_name: str, solution_name: str) -> dict:
+        """Get the record ids of a solution's existing records by arn, cached for the life of the Lambda container.
+
+        Args:
+            table_name: dynamodb table name
+            solution_name: solution name
+
+        Returns:
+            dict of record ids by arn
+        """
+        if (table_name, solution_name) not in self.RECORD_IDS:
+            table = self.DYNAMODB_RESOURCE.Table(table_name)
+            query_params: Dict[str, Any] = {
+                "KeyConditionExpression": "solution_name = :solution_name",
+                "ExpressionAttributeValues": {":solution_name": solution_name},
+                "ProjectionExpression": "arn, record_id",
+            }
+            record_ids = {}
+            while True:
+                response = table.query(**query_params)
+                record_ids.update({item["arn"]: item["record_id"] for item in response["Items"] if "arn" in item})
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            self.LOGGER.info(f"Found {len(record_ids)} {solution_name} records in {table_name} dynamodb table")
+            self.RECORD_IDS[(table_name, solution_name)] = record_ids
+        return self.RECORD_IDS[(table_name, solution_name)]
+
+    def get_record_id(self, table_name: str, solution_name: str, arn: str) -> str:
+        """Get the record id of a resource's record.
+
+        Records written before record ids were derived from the arn keep their id; new records get an id hashed from the
+        solution name and arn, so writing the same resource again updates its record without reading it first.
+
+        Args:
+            table_name: dynamodb table name
+            solution_name: solution name
+            arn: resource arn
+
+        Returns:
+            record id
+        """
+        record_ids = self.get_record_ids(table_name, solution_name)
+        if arn not in record_ids:
+            record_ids[arn] = hashlib.sha256(f"{solution_name}|{arn}".encode("utf-8")).hexdigest()[:16]
+        return record_ids[arn]
+
+    def buffer_item(self, table_name: str, solution_name: str, attributes_and_values: dict) -> str:
+        """Add or replace a resource's record in the write buffer; flush_items writes the buffered records.
+
+        Args:
+            table_name: dynamodb table name
+            solution_name: solution name
+            attributes_and_values: record attributes and values, including the resource arn
+
+        Returns:
+            record id
+        """
+        with self.WRITE_BUFFER_LOCK:
+            record_id = self.get_record_id(table_name, solution_name, attributes_and_values["arn"])
+            item = {"date_time": self.get_date_time(), **attributes_and_values, "solution_name": solution_name, "record_id": record_id}
+            self.WRITE_BUFFER.setdefault(table_name, {})[(solution_name, record_id)] = item
+        self.LOGGER.info(f"Buffered {record_id} record for {table_name} dynamodb table")
+        return record_id
+
+    def flush_items(self) -> None:
+        """Write the buffered records with batch writes of up to 25 items, resending unprocessed items.
+
+        Records are removed from the buffer only after their table's batch write completes, so records that fail to
+        write stay buffered for the next flush. A record replaced in the buffer during the write is kept.
+        """
+        with self.WRITE_BUFFER_LOCK:
+            write_buffer = {table_name: dict(items) for table_name, items in self.WRITE_BUFFER.items()}
+        for table_name, items in write_buffer.items():
+            self.LOGGER.info(f"Writing {len(items)} buffered records to {table_name} dynamodb table")
+            table = self.DYNAMODB_RESOURCE.Table(table_name)
+            with table.batch_writer(overwrite_by_pkeys=["solution_name", "record_id"]) as batch:
+                for item in items.values():
+                    batch.put_item(Item=item)
+            with self.WRITE_BUFFER_LOCK:
+                buffered_items = self.WRITE_BUFFER.get(table_name, {})
+                for key, item in items.items():
+                    if buffered_items.get(key) is item:
+                        del buffered_items[key]
+                if not buffered_items:
+                    self.WRITE_BUFFER.pop(table_name, None)
+
     def insert_item(self, table_name: str, solution_name: str) -> tuple[str, str]:
         """Insert an item into the dynamodb table.
 
@@ -224,18 +416,19 @@ class SRADynamoDB:
         self.LOGGER.info(f"Searching for {additional_attributes} in {table_name} dynamodb table")
         table = self.DYNAMODB_RESOURCE.Table(table_name)
         expression_attribute_values = {":solution_name": solution_name}
-
-        filter_expression = " AND ".join([f"{attr} = :{attr}" for attr in additional_attributes.keys()])
-
         expression_attribute_values.update({f":{attr}": value for attr, value in additional_attributes.items()})
 
-        query_params: Dict[str, Any] = {}
-
-        query_params = {
+        query_params: Dict[str, Any] = {
             "KeyConditionExpression": "solution_name = :solution_name",
             "ExpressionAttributeValues": expression_attribute_values,
-            "FilterExpression": filter_expression,
         }
+        index_name, index_attribute = self.get_index_key(table_name, additional_attributes)
+        if index_name:
+            query_params["IndexName"] = index_name
+            query_params["KeyConditionExpression"] = f"{index_attribute} = :{index_attribute} AND solution_name = :solution_name"
+        filter_attributes = [attr for attr in additional_attributes if attr != index_attribute]
+        if filter_attributes:
+            query_params["FilterExpression"] = " AND ".join([f"{attr} = :{attr}" for attr in filter_attributes])
 
         response = table.query(**query_params)
 
@@ -256,14 +449,75 @@ class SRADynamoDB:
             list_of_values: list of values
 
         Returns:
-            list of unique values
+            list of unique values, in the order first seen
         """
         self.LOGGER.info(f"Getting unique values from {list_of_values}")
-        unique_values = []
-        for value in list_of_values:
-            if value not in unique_values:
-                unique_values.append(value)
-        return unique_values
+        return list(dict.fromkeys(list_of_values))
+
+    def scan_solutions_and_accounts(self, table_name: str, total_segments: int = STATE_TABLE_SCAN_SEGMENTS) -> Iterator[tuple[str, str]]:
+        """Yield the distinct solution and account pairs of the dynamodb table.
+
+        The table is read with a parallel segmented scan that follows pagination and projects only solution_name and
+        account. Each segment is scanned with the thread-safe dynamodb client rather than a shared Table resource, and
+        pages are handed over through a bounded queue, so at most a few pages are held in memory while pairs are yielded.
+
+        Args:
+            table_name: dynamodb table name
+            total_segments: number of scan segments read in parallel
+
+        Yields:
+            solution name and account pairs
+        """
+        self.LOGGER.info(f"Scanning {table_name} dynamodb table for solutions and accounts with {total_segments} segments")
+        deserializer = TypeDeserializer()
+        pages: queue.Queue = queue.Queue(maxsize=total_segments * 2)
+        stop_scan = threading.Event()
+
+        def put_page(page: Optional[list]) -> bool:
+            while not stop_scan.is_set():
+                try:
+                    pages.put(page, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan_segment(segment: int) -> None:
+            try:
+                scan_params: Dict[str, Any] = {
+                    "TableName": table_name,
+                    "Segment": segment,
+                    "TotalSegments": total_segments,
+                    "ProjectionExpression": "solution_name, account",
+                }
+                while not stop_scan.is_set():
+                    response = self.DYNAMODB_CLIENT.scan(**scan_params)
+                    items = [{name: deserializer.deserialize(value) for name, value in item.items()} for item in response["Items"]]
+                    if not put_page(items) or "LastEvaluatedKey" not in response:
+                        break
+                    scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            finally:
+                put_page(None)
+
+        seen_pairs = set()
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            segment_scans = [executor.submit(scan_segment, segment) for segment in range(total_segments)]
+            try:
+                finished_segments = 0
+                while finished_segments < total_segments:
+                    items = pages.get()
+                    if items is None:
+                        finished_segments += 1
+                        continue
+                    for item in items:
+                        pair = (item.get("solution_name"), item.get("account"))
+                        if None not in pair and pair not in seen_pairs:
+                            seen_pairs.add(pair)
+                            yield pair
+            finally:
+                stop_scan.set()
+            for segment_scan in segment_scans:
+                segment_scan.result()
 
     def get_distinct_solutions_and_accounts(self, table_name: str) -> tuple[list, list]:
         """Get distinct solutions and accounts from the dynamodb table.
@@ -275,13 +529,12 @@ class SRADynamoDB:
             list of distinct solutions and accounts
         """
         self.LOGGER.info(f"Getting distinct solutions and accounts from {table_name} dynamodb table")
-        table = self.DYNAMODB_RESOURCE.Table(table_name)
-        response = table.scan()
-        solution_names = [item["solution_name"] for item in response["Items"]]
-        solution_names = self.get_unique_values_from_list(solution_names)
-        accounts = [item["account"] for item in response["Items"]]
-        accounts = self.get_unique_values_from_list(accounts)
-        return solution_names, accounts
+        solution_names: dict = {}
+        accounts: dict = {}
+        for solution_name, account in self.scan_solutions_and_accounts(table_name):
+            solution_names[solution_name] = None
+            accounts[account] = None
+        return list(solution_names), list(accounts)
 
     def get_resources_for_solutions_by_account(self, table_name: str, solutions: list, account: str) -> dict:
         """Get resources for solutions by account from the dynamodb table.
@@ -296,6 +549,7 @@ class SRADynamoDB:
         """
         self.LOGGER.info(f"Getting resources for solutions by account from {table_name} dynamodb table")
         table = self.DYNAMODB_RESOURCE.Table(table_name)
+        index_name, _ = self.get_index_key(table_name, ["account"])
         query_results = {}
         for solution in solutions:
             query_params: Dict[str, Any] = {
@@ -303,6 +557,10 @@ class SRADynamoDB:
                 "ExpressionAttributeValues": {":solution_name": solution, ":account": account},
                 "FilterExpression": "account = :account",
             }
+            if index_name:
+                query_params["IndexName"] = index_name
+                query_params["KeyConditionExpression"] = "account = :account AND solution_name = :solution_name"
+                del query_params["FilterExpression"]
             response = table.query(**query_params)
             self.LOGGER.info(f"response: {response}")
             query_results[solution] = response
@@ -320,5 +578,8 @@ class SRADynamoDB:
             response from dynamodb delete_item
         """
         self.LOGGER.info(f"Deleting {record_id} from {table_name} dynamodb table")
+        record_ids = self.RECORD_IDS.get((table_name, solution_name), {})
+        for arn in [arn for arn, arn_record_id in record_ids.items() if arn_record_id == record_id]:
+            del record_ids[arn]
         table = self.DYNAMODB_RESOURCE.Table(table_name)
         return table.delete_item(Key={"solution_name": solution_name, "record_id": record_id})
@@ -10,13 +10,16 @@ SPDX-License-Identifier: MIT-0
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
-from typing import TYPE_CHECKING, Literal, cast
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Literal, Optional, cast
 
 if TYPE_CHECKING:
     from mypy_boto3_kms.client import KMSClient
     from mypy_boto3_kms.type_defs import DescribeKeyResponseTypeDef
+    from mypy_boto3_resourcegroupstaggingapi.client import ResourceGroupsTaggingAPIClient
     from boto3 import Session
 
 import json
@@ -24,6 +27,7 @@ import urllib.parse
 
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
 
 class SRAKMS:
@@ -38,6 +42,7 @@ class SRAKMS:
     UNEXPECTED = "Unexpected!"
     BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
     SERVICE_NAME: Literal["kms"] = "kms"
+    KEY_SEARCH_MAX_WORKERS: int = int(os.environ.get("KMS_KEY_SEARCH_MAX_WORKERS", "10"))
 
     try:
         MANAGEMENT_ACCOUNT_SESSION: Session = boto3.Session()
@@ -53,12 +58,13 @@ class SRAKMS:
         LOGGER.exception(UNEXPECTED)
         raise ValueError("Unexpected error executing Lambda function. Review CloudWatch logs for details.") from None
 
-    def create_kms_key(self, kms_client: KMSClient, key_policy: str, description: str = "Key description") -> str:
+    def create_kms_key(self, kms_client: KMSClient, key_policy: str, solution_name: str, description: str = "Key description") -> str:
         """Create KMS key.
 
         Args:
             kms_client (KMSClient): KMS boto3 client
             key_policy (str): key policy
+            solution_name (str): sra solution name
             description (str): Description of KMS key. Defaults to "Key description".
 
         Returns:
@@ -70,6 +76,7 @@ class SRAKMS:
             Description=description,
             KeyUsage="ENCRYPT_DECRYPT",
             CustomerMasterKeySpec="SYMMETRIC_DEFAULT",
+            Tags=[{"TagKey": "sra-solution", "TagValue": solution_name}],
         )
         key_id = key_response["KeyMetadata"]["KeyId"]
 
@@ -111,36 +118,117 @@ class SRAKMS:
         self.LOGGER.info(f"Schedule deletion of key: {key_id} in {pending_window_in_days} days")
         kms_client.schedule_key_deletion(KeyId=key_id, PendingWindowInDays=pending_window_in_days)
 
-    def search_key_policies(self, kms_client: KMSClient, key_policy: str) -> tuple[bool, str]:
+    def get_policy_hash(self, policy: str) -> str:
+        """Get the hash of a policy's canonical JSON, so policies compare equal regardless of formatting and key order.
+
+        Args:
+            policy (str): policy JSON
+
+        Returns:
+            str: SHA-256 hex digest of the canonical policy JSON
+        """
+        canonical_policy = json.dumps(json.loads(policy), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical_policy.encode("utf-8")).hexdigest()
+
+    def search_key_policies(
+        self,
+        kms_client: KMSClient,
+        key_policy: str,
+        solution_name: Optional[str] = None,
+        tagging_client: Optional[ResourceGroupsTaggingAPIClient] = None,
+    ) -> tuple[bool, str]:
         """Search KMS keys for a specific policy.
 
+        Keys behind AWS managed aliases are skipped. Keys tagged with the solution are checked first, then the other
+        keys; the key state and policy checks run concurrently and stop at the first match.
+
         Args:
             kms_client (KMSClient): KMS boto3 client
             key_policy (str): key policy
+            solution_name (Optional[str]): sra solution name the key is tagged with. Defaults to None.
+            tagging_client (Optional[ResourceGroupsTaggingAPIClient]): resource groups tagging boto3 client for the same account and
+                region as kms_client, used to find the keys tagged with solution_name. Defaults to None.
 
         Returns:
             tuple[bool, str]: True if policy is found, False if not found
         """
-        for key in self.list_all_keys(kms_client):
-            self.LOGGER.info(f"Examining state of key: {key['KeyId']}")
-            if kms_client.describe_key(KeyId=key["KeyId"])["KeyMetadata"]["KeyState"] != "Enabled":
-                self.LOGGER.info(f"Skipping non-enabled key: {key['KeyId']}")
-                continue
-            self.LOGGER.info(f"Examinining policies in {key} kms key...")
-            for policy in self.list_key_policies(kms_client, key["KeyId"]):
-                policy_body = kms_client.get_key_policy(KeyId=key["KeyId"], PolicyName=policy)["Policy"]
-                policy_body = json.loads(policy_body)
-                self.LOGGER.info(f"Examining policy: {policy_body}")
-                self.LOGGER.info(f"Comparing policy to provided policy: {key_policy}")
-                expected_key_policy = json.loads(key_policy)
-                if policy_body == expected_key_policy:
-                    self.LOGGER.info(f"Key policy match found for key {key['KeyId']} policy {policy}: {policy_body}")
-                    self.LOGGER.info(f"Attempted to match to: {expected_key_policy}")
-                    return True, key["KeyId"]
-                self.LOGGER.info(f"No key policy match found for key {key['KeyId']} policy {policy}: {policy_body}")
-                self.LOGGER.info(f"Attempted to match to: {expected_key_policy}")
+        policy_hash = self.get_policy_hash(key_policy)
+        aws_managed_key_ids = {
+            alias["TargetKeyId"]
+            for alias in self.list_all_aliases(kms_client)
+            if alias["AliasName"].startswith("alias/aws/") and "TargetKeyId" in alias
+        }
+        key_ids = [key["KeyId"] for key in self.list_all_keys(kms_client) if key["KeyId"] not in aws_managed_key_ids]
+        self.LOGGER.info(f"Searching {len(key_ids)} KMS keys for policy hash {policy_hash}")
+        solution_key_ids = []
+        if solution_name and tagging_client:
+            tagged_key_ids = set(self.get_solution_key_ids(tagging_client, solution_name))
+            solution_key_ids = [key_id for key_id in key_ids if key_id in tagged_key_ids]
+        other_key_ids = [key_id for key_id in key_ids if key_id not in set(solution_key_ids)]
+        for candidate_key_ids in (solution_key_ids, other_key_ids):
+            key_id = self.find_key_with_policy(kms_client, candidate_key_ids, policy_hash)
+            if key_id:
+                self.LOGGER.info(f"Key policy match found for key {key_id}")
+                return True, key_id
+        self.LOGGER.info("No key policy match found")
         return False, "None"
 
+    def get_solution_key_ids(self, tagging_client: ResourceGroupsTaggingAPIClient, solution_name: str) -> list:
+        """Get the KMS keys tagged with an sra solution.
+
+        Args:
+            tagging_client (ResourceGroupsTaggingAPIClient): resource groups tagging boto3 client
+            solution_name (str): sra solution name
+
+        Returns:
+            list: ids of the keys with an sra-solution tag of solution_name
+        """
+        solution_key_ids = []
+        try:
+            paginator = tagging_client.get_paginator("get_resources")
+            for page in paginator.paginate(ResourceTypeFilters=["kms:key"], TagFilters=[{"Key": "sra-solution", "Values": [solution_name]}]):
+                for resource in page["ResourceTagMappingList"]:
+                    solution_key_ids.append(resource["ResourceARN"].split("/")[-1])
+        except ClientError as e:
+            self.LOGGER.info(f"Unable to get the keys tagged for {solution_name}: {e}")
+        self.LOGGER.info(f"Keys tagged for {solution_name}: {solution_key_ids}")
+        return solution_key_ids
+
+    def find_key_with_policy(self, kms_client: KMSClient, key_ids: list, policy_hash: str) -> str:
+        """Find an enabled customer managed KMS key whose default key policy has the given hash.
+
+        Args:
+            kms_client (KMSClient): KMS boto3 client
+            key_ids (list): KMS key ids to check
+            policy_hash (str): hash of the canonical policy JSON, from get_policy_hash
+
+        Returns:
+            str: id of a matching key, or an empty string if none match
+        """
+
+        def key_has_policy(key_id: str) -> bool:
+            try:
+                key_metadata = kms_client.describe_key(KeyId=key_id)["KeyMetadata"]
+                if key_metadata["KeyState"] != "Enabled" or key_metadata.get("KeyManager") == "AWS":
+                    self.LOGGER.info(f"Skipping non-enabled or AWS managed key: {key_id}")
+                    return False
+                policy = kms_client.get_key_policy(KeyId=key_id, PolicyName="default")["Policy"]
+            except ClientError as e:
+                self.LOGGER.info(f"Unable to examine key {key_id}: {e}")
+                return False
+            return self.get_policy_hash(policy) == policy_hash
+
+        if not key_ids:
+            return ""
+        with ThreadPoolExecutor(max_workers=min(self.KEY_SEARCH_MAX_WORKERS, len(key_ids))) as executor:
+            key_checks = {executor.submit(key_has_policy, key_id): key_id for key_id in key_ids}
+            for key_check in as_completed(key_checks):
+                if key_check.result():
+                    for pending_check in key_checks:
+                        pending_check.cancel()
+                    return key_checks[key_check]
+        return ""
+
     def list_key_policies(self, kms_client: KMSClient, key_id: str) -> list:
         """List KMS key policies.
 
@@ -163,8 +251,26 @@ class SRAKMS:
         Returns:
             list: list of KMS keys
         """
-        response = kms_client.list_keys()
-        return response["Keys"]
+        keys = []
+        paginator = kms_client.get_paginator("list_keys")
+        for page in paginator.paginate():
+            keys.extend(page["Keys"])
+        return keys
+
+    def list_all_aliases(self, kms_client: KMSClient) -> list:
+        """List all KMS aliases.
+
+        Args:
+            kms_client (KMSClient): KMS boto3 client
+
+        Returns:
+            list: list of KMS aliases
+        """
+        aliases = []
+        paginator = kms_client.get_paginator("list_aliases")
+        for page in paginator.paginate():
+            aliases.extend(page["Aliases"])
+        return aliases
 
     def check_key_exists(self, kms_client: KMSClient, key_id: str) -> tuple[bool, DescribeKeyResponseTypeDef]:
         """Check if a KMS key exists.
@@ -194,10 +300,7 @@ class SRAKMS:
         """
         self.LOGGER.info(f"Checking alias: {alias_name}")
         try:
-            response = kms_client.list_aliases()
-            self.LOGGER.info(f"Aliases: {response['Aliases']}")
-            for alias in response["Aliases"]:
-                self.LOGGER.info(f"Alias: {alias}")
+            for alias in self.list_all_aliases(kms_client):
                 if alias["AliasName"] == alias_name:
                     self.LOGGER.info(f"Found alias: {alias}")
                     return True, alias["AliasName"], alias["TargetKeyId"], alias["AliasArn"]
@@ -10,12 +10,14 @@ SPDX-License-Identifier: MIT-0
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import logging
 import os
-from time import sleep
 from typing import TYPE_CHECKING
 
 import boto3
+import sra_waiter
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
@@ -33,6 +35,7 @@ class SRALambda:
 
     BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
     UNEXPECTED = "Unexpected!"
+    WAITER_TIMEOUT_SECONDS = 120
 
     try:
         MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
@@ -59,9 +62,66 @@ class SRALambda:
             self.LOGGER.error(f"Error encountered searching for lambda function: {e}")
             return "None"
 
+    def update_lambda_function(  # noqa: CFQ002
+        self, code_zip: bytes, role_arn: str, function_name: str, handler: str, runtime: str, timeout: int, memory_size: int
+    ) -> str:
+        """Update an existing Lambda function only where its code or configuration differs from the requested deployment.
+
+        The deployed CodeSha256 is compared with the hash of the code zip to decide whether update_function_code is needed,
+        and the Role, Handler, Runtime, Timeout and MemorySize are compared to decide whether update_function_configuration is needed.
+
+        Args:
+            code_zip: Lambda function code zip file contents
+            role_arn: Lambda function role arn
+            function_name: Lambda function name
+            handler: Lambda function handler
+            runtime: Lambda function runtime
+            timeout: Lambda function timeout
+            memory_size: Lambda function memory size
+
+        Raises:
+            ValueError: Lambda function update did not complete
+
+        Returns:
+            Lambda function arn
+        """
+        configuration = self.LAMBDA_CLIENT.get_function(FunctionName=function_name)["Configuration"]
+        code_sha256 = base64.b64encode(hashlib.sha256(code_zip).digest()).decode("utf-8")
+        expected_configuration = {"Role": role_arn, "Handler": handler, "Runtime": runtime, "Timeout": timeout, "MemorySize": memory_size}
+        changed_configuration = [key for key, value in expected_configuration.items() if configuration.get(key) != value]
+        if configuration.get("CodeSha256") == code_sha256 and not changed_configuration:
+            self.LOGGER.info(f"{function_name} lambda function code and configuration are unchanged; skipping deployment")
+            return configuration["FunctionArn"]
+
+        def update_complete() -> bool:
+            status = self.LAMBDA_CLIENT.get_function(FunctionName=function_name)["Configuration"].get("LastUpdateStatus", "Successful")
+            self.LOGGER.info(f"{function_name} lambda function last update status is {status}")
+            return status != "InProgress"
+
+        if configuration.get("CodeSha256") != code_sha256:
+            self.LOGGER.info(f"{function_name} lambda function code differs from the requested deployment.  Updating code...")
+            response = self.LAMBDA_CLIENT.update_function_code(FunctionName=function_name, ZipFile=code_zip)
+            self.LOGGER.info(f"Lambda function code updated successfully: {response}")
+            if not sra_waiter.wait_until(update_complete, f"Lambda function {function_name} code update", self.WAITER_TIMEOUT_SECONDS):
+                raise ValueError(f"Lambda function {function_name} code update did not complete")
+        if changed_configuration:
+            self.LOGGER.info(f"{function_name} lambda function configuration differs: {changed_configuration}.  Updating configuration...")
+            response = self.LAMBDA_CLIENT.update_function_configuration(
+                FunctionName=function_name,
+                Role=role_arn,
+                Handler=handler,
+                Runtime=runtime,  # type: ignore
+                Timeout=timeout,
+                MemorySize=memory_size,
+            )
+            self.LOGGER.info(f"Lambda function configuration updated successfully: {response}")
+            if not sra_waiter.wait_until(update_complete, f"Lambda function {function_name} configuration update", self.WAITER_TIMEOUT_SECONDS):
+                raise ValueError(f"Lambda function {function_name} configuration update did not complete")
+        return configuration["FunctionArn"]
+
     def create_lambda_function(  # noqa: CFQ002, CCR001
         self,
-        code_zip_file: str,
+        code_zip: bytes,
         role_arn: str,
         function_name: str,
         handler: str,
@@ -73,7 +133,7 @@ class SRALambda:
         """Create Lambda Function.
 
         Args:
-            code_zip_file: Lambda function code zip file
+            code_zip: Lambda function code zip file contents
             role_arn: Lambda function role arn
             function_name: Lambda function name
             handler: Lambda function handler
@@ -89,64 +149,52 @@ class SRALambda:
             Lambda function arn if created, else "None"
         """
         self.LOGGER.info(f"Role ARN passed to create_lambda_function: {role_arn}...")
-        max_retries = 10
-        retries = 0
-        self.LOGGER.info(f"Size of {code_zip_file} is {os.path.getsize(code_zip_file)} bytes")
-        while retries < max_retries:
-            self.LOGGER.info(f"Create function attempt {retries+1} of {max_retries}...")
+        self.LOGGER.info(f"Size of {function_name} code is {len(code_zip)} bytes")
+
+        def deploy_function() -> bool:
             try:
                 create_response = self.LAMBDA_CLIENT.create_function(
                     FunctionName=function_name,
                     Runtime=runtime,  # type: ignore
                     Handler=handler,
                     Role=role_arn,
-                    Code={"ZipFile": open(code_zip_file, "rb").read()},  # noqa: SIM115
+                    Code={"ZipFile": code_zip},
                     Timeout=timeout,
                     MemorySize=memory_size,
                     Tags={"sra-solution": solution_name},
                 )
                 self.LOGGER.info(f"Lambda function created successfully: {create_response}")
-                break
             except ClientError as error:
                 if error.response["Error"]["Code"] == "ResourceConflictException":
                     try:
                         self.LOGGER.info(f"{function_name} function already exists.  Updating...")
-                        update_response = self.LAMBDA_CLIENT.update_function_code(
-                            FunctionName=function_name,
-                            ZipFile=open(code_zip_file, "rb").read(),  # noqa: SIM115
-                        )
-                        self.LOGGER.info(f"Lambda function code updated successfully: {update_response}")
-                        break
+                        self.update_lambda_function(code_zip, role_arn, function_name, handler, runtime, timeout, memory_size)
                     except Exception as e:
                         self.LOGGER.info(f"Error deploying Lambda function: {e}")
-                        break
                 elif error.response["Error"]["Code"] == "InvalidParameterValueException":
                     self.LOGGER.info(f"Lambda not ready to deploy yet. {error}; Retrying...")
-                    retries += 1
-                    sleep(5)
+                    return False
                 else:
                     self.LOGGER.info(f"Error deploying Lambda function: {error}")
-                    break
-        retries = 0
-        while retries < max_retries:
+            return True
+
+        sra_waiter.wait_until(deploy_function, f"Lambda function {function_name} deployment", self.WAITER_TIMEOUT_SECONDS)
+        get_response: dict = {}
+
+        def function_active() -> bool:
             try:
-                self.LOGGER.info(f"Search for function attempt {retries+1} of {max_retries}...")
-                get_response = self.LAMBDA_CLIENT.get_function(FunctionName=function_name)
-                if get_response["Configuration"]["State"] == "Active":
-                    self.LOGGER.info(f"Lambda function {function_name} is now active")
-                    break
-                else:
-                    self.LOGGER.info(f"{function_name} lambda function state is {get_response['Configuration']['State']}.  Waiting to retry...")
-                retries += 1
-                sleep(5)
+                get_response.update(self.LAMBDA_CLIENT.get_function(FunctionName=function_name))
             except ClientError as e:
                 if e.response["Error"]["Code"] == "ResourceNotFoundException":
                     self.LOGGER.info(f"Lambda function {function_name} not found.  Retrying...")
-                    retries += 1
-                    sleep(5)
-                else:
-                    self.LOGGER.info(f"Error getting Lambda function: {e}")
-                    raise ValueError(f"Error getting Lambda function: {e}") from None
+                    return False
+                self.LOGGER.info(f"Error getting Lambda function: {e}")
+                raise ValueError(f"Error getting Lambda function: {e}") from None
+            self.LOGGER.info(f"{function_name} lambda function state is {get_response['Configuration']['State']}")
+            return get_response["Configuration"]["State"] == "Active"
+
+        if not sra_waiter.wait_until(function_active, f"Lambda function {function_name}", self.WAITER_TIMEOUT_SECONDS) and not get_response:
+            raise ValueError(f"Lambda function {function_name} was not found after it was deployed")
         return get_response["Configuration"]["FunctionArn"]
 
     def get_permissions(self, function_name: str) -> str:
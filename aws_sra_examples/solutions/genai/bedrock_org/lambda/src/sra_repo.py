@@ -8,11 +8,13 @@ Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 SPDX-License-Identifier: MIT-0
 """
 
+import hashlib
 import logging
 import os
 import shutil
 import subprocess  # noqa S404 (best practice for calling pip from script)
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from zipfile import ZIP_DEFLATED, ZipFile
 
@@ -32,6 +34,9 @@ class SRARepo:
     SOLUTIONS_DIR: str = f"/tmp/aws-security-reference-architecture-examples-{REPO_BRANCH}/aws_sra_examples/solutions"  # noqa: S108
     STAGING_UPLOAD_FOLDER = "/tmp/sra_staging_upload"  # noqa: S108
     STAGING_TEMP_FOLDER = "/tmp/sra_temp"  # noqa: S108
+    # config rule zips keyed by a hash of the rule source files; kept across invocations of a warm Lambda container
+    BUILD_CACHE_FOLDER = "/tmp/sra_build_cache"  # noqa: S108
+    RULE_BUILD_MAX_WORKERS: int = int(os.environ.get("RULE_BUILD_MAX_WORKERS", "4"))
 
     CONFIG_RULES: dict = {}
 
@@ -131,7 +136,9 @@ class SRARepo:
             shutil.rmtree(staging_temp_folder)
         os.mkdir(staging_upload_folder)  # noqa: PL102
         os.mkdir(staging_temp_folder)  # noqa: PL102
+        os.makedirs(self.BUILD_CACHE_FOLDER, exist_ok=True)
 
+        rule_builds = []
         service_folders = os.listdir(solutions_dir)
         for service in service_folders:
             service_dir = solutions_dir + "/" + service
@@ -176,51 +183,77 @@ class SRARepo:
                                     os.mkdir(config_rule_upload_folder_path)  # noqa: PL102
                                 self.LOGGER.info(f"DEBUG: config_rule_staging_folder_path: {config_rule_staging_folder_path}")
                                 self.LOGGER.info(f"DEBUG: config_rule_upload_folder_path: {config_rule_upload_folder_path}")
-                                # lambda code
-                                if os.path.exists(config_rule_source_files) and os.path.exists(  # noqa: PL110
-                                    os.path.join(config_rule_source_files, "requirements.txt")
-                                ):
-                                    self.LOGGER.info(f"Downloading required packages for {solution} lambda...")
-                                    self.pip_install(
-                                        os.path.join(config_rule_source_files, "requirements.txt"),
+                                rule_builds.append(
+                                    (
+                                        config_rule_source_files,
                                         config_rule_staging_folder_path,
+                                        f"{config_rule_upload_folder_path}/{config_rule_upload_folder_name}.zip",
                                     )
-                                for source_file in os.listdir(config_rule_source_files):
-                                    self.LOGGER.info(f"source_file: {source_file}")
-                                    if os.path.isdir(os.path.join(config_rule_source_files, source_file)):  # noqa: PL112
-                                        self.LOGGER.info(f"{source_file} is a directory, skipping...")
-                                    else:
-                                        shutil.copy(
-                                            os.path.join(config_rule_source_files, source_file),
-                                            config_rule_staging_folder_path,
-                                        )
-                                        self.LOGGER.info(f"DEBUG: Copied {source_file} to {config_rule_staging_folder_path}")
-                                        self.LOGGER.info(f"DEBUG: listdir = {os.listdir(config_rule_staging_folder_path)}")
-                                        self.LOGGER.info(f"DEBUG: isdir = {os.path.isdir(config_rule_staging_folder_path)}")
-                                        for dest_file in os.listdir(config_rule_staging_folder_path):
-                                            self.LOGGER.info(f"DEBUG: listing {dest_file} in {config_rule_staging_folder_path}")
-                                lambda_target_folder = config_rule_upload_folder_path
-                                self.LOGGER.info(
-                                    f"Zipping config rule code for {solution} / {config_rule} lambda to"
-                                    + f"{lambda_target_folder}{config_rule_upload_folder_name}.zip..."
-                                )
-
-                                zip_file = ZipFile(f"{lambda_target_folder}/{config_rule_upload_folder_name}.zip", "w", ZIP_DEFLATED)
-                                self.LOGGER.info(
-                                    f"DEBUG: Zipping {config_rule_staging_folder_path} folder in to"
-                                    + f"{lambda_target_folder}/{config_rule_upload_folder_name}.zip"
-                                )
-                                self.zip_folder(f"{config_rule_staging_folder_path}", zip_file)
-                                zip_file.close()
-                                self.LOGGER.info(
-                                    f"{lambda_target_folder}{config_rule_upload_folder_name}.zip file size is"
-                                    + f"{os.path.getsize(f'{lambda_target_folder}{config_rule_upload_folder_name}.zip')}"
                                 )
                         # debug stuff:
                         else:
                             self.LOGGER.info(f"{os.path.join(service_dir, solution, 'rules')} does not exist!")
+
+        cached_zip_paths = []
+        cache_misses: dict = {}
+        for source_folder, staging_folder, zip_file_path in rule_builds:
+            cached_zip_path = os.path.join(self.BUILD_CACHE_FOLDER, f"{self.get_config_rule_source_hash(source_folder)}.zip")  # noqa: PL118
+            cached_zip_paths.append(cached_zip_path)
+            if os.path.exists(cached_zip_path):  # noqa: PL110
+                self.LOGGER.info(f"Using cached build of {source_folder} for {zip_file_path}")
+            else:
+                cache_misses.setdefault(cached_zip_path, (source_folder, staging_folder, cached_zip_path))
+        self.LOGGER.info(f"Config rule builds: {len(rule_builds)} total, {len(cache_misses)} not cached")
+        if cache_misses:
+            # pip runs in its own process, so the builds run in parallel from a thread pool
+            with ThreadPoolExecutor(max_workers=min(self.RULE_BUILD_MAX_WORKERS, len(cache_misses))) as executor:
+                list(executor.map(lambda build: self.build_config_rule(*build), cache_misses.values()))
+        for (_, _, zip_file_path), cached_zip_path in zip(rule_builds, cached_zip_paths):
+            shutil.copyfile(cached_zip_path, zip_file_path)
+            self.LOGGER.info(f"{zip_file_path} file size is {os.path.getsize(zip_file_path)}")
         self.LOGGER.info(f"All config rules: {self.CONFIG_RULES}")
 
+    def get_config_rule_source_hash(self, source_folder: str) -> str:
+        """Get a hash of a config rule's source files, including its requirements.txt, and the python version.
+
+        Args:
+            source_folder: config rule source folder
+
+        Returns:
+            SHA-256 hex digest identifying the config rule build
+        """
+        source_hash = hashlib.sha256(f"python{sys.version_info.major}.{sys.version_info.minor}".encode("utf-8"))
+        for source_file in sorted(os.listdir(source_folder)):
+            source_file_path = os.path.join(source_folder, source_file)  # noqa: PL118
+            if os.path.isfile(source_file_path):  # noqa: PL113
+                source_hash.update(source_file.encode("utf-8") + b"\0")
+                with open(source_file_path, "rb") as source:  # noqa: PL123
+                    source_hash.update(hashlib.sha256(source.read()).digest())
+        return source_hash.hexdigest()
+
+    def build_config_rule(self, source_folder: str, staging_folder: str, cached_zip_path: str) -> None:
+        """Install a config rule's requirements, copy its source files and zip them into the build cache.
+
+        Args:
+            source_folder: config rule source folder
+            staging_folder: folder the config rule code is assembled in
+            cached_zip_path: build cache path of the config rule zip file
+        """
+        if os.path.exists(os.path.join(source_folder, "requirements.txt")):  # noqa: PL110
+            self.LOGGER.info(f"Downloading required packages for {source_folder} lambda...")
+            self.pip_install(os.path.join(source_folder, "requirements.txt"), staging_folder)
+        for source_file in os.listdir(source_folder):
+            if os.path.isdir(os.path.join(source_folder, source_file)):  # noqa: PL112
+                self.LOGGER.info(f"{source_file} is a directory, skipping...")
+            else:
+                shutil.copy(os.path.join(source_folder, source_file), staging_folder)
+        self.LOGGER.info(f"Zipping config rule code in {staging_folder} to {cached_zip_path}...")
+        # write to a temporary name first so an interrupted build never leaves a partial zip in the cache
+        zip_file = ZipFile(f"{cached_zip_path}.tmp", "w", ZIP_DEFLATED)
+        self.zip_folder(staging_folder, zip_file)
+        zip_file.close()
+        os.replace(f"{cached_zip_path}.tmp", cached_zip_path)
+
     def prepare_code_for_staging(self, staging_upload_folder: str, staging_temp_folder: str, solutions_dir: str) -> None:  # noqa: CCR001
         """Prepare code for staging.
 
@@ -8,6 +8,7 @@ Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 SPDX-License-Identifier: MIT-0
 """
 
+import hashlib
 import json
 import logging
 import os
@@ -30,6 +31,9 @@ class SRAS3:
     ORG_ID: str = boto3.client("organizations").describe_organization()["Organization"]["Id"]
     PARTITION = boto3.session.Session().get_partition_for_region(REGION)
     STAGING_BUCKET: str = ""
+    PAYLOAD_PREFIX: str = "sra-payloads"
+    PAYLOAD_CACHE: dict = {}
+    ARTIFACT_CACHE: dict = {}
     BUCKET_POLICY_TEMPLATE: dict = {  # noqa: ECE001
         "Version": "2012-10-17",
         "Statement": [
@@ -194,3 +198,70 @@ class SRAS3:
             self.LOGGER.info(f"File uploaded successfully to {bucket_name}/{s3_key}")
         except ClientError as e:
             self.LOGGER.info(f"Error uploading file: {e}")
+
+    def put_payload(self, bucket_name: str, payload: dict) -> str:
+        """Store a JSON payload in an S3 bucket under a key derived from its content.
+
+        The same payload always maps to the same key, so an unchanged payload is only written once.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket
+            payload (dict): JSON serializable payload
+
+        Returns:
+            str: S3 key of the payload
+        """
+        body = json.dumps(payload, sort_keys=True).encode("utf-8")
+        s3_key = f"{self.PAYLOAD_PREFIX}/{hashlib.sha256(body).hexdigest()}.json"
+        try:
+            self.S3_CLIENT.head_object(Bucket=bucket_name, Key=s3_key)
+            self.LOGGER.info(f"Payload already stored at {bucket_name}/{s3_key}")
+        except ClientError:
+            self.S3_CLIENT.put_object(Bucket=bucket_name, Key=s3_key, Body=body, ContentType="application/json")
+            self.LOGGER.info(f"Payload ({len(body)} bytes) stored at {bucket_name}/{s3_key}")
+        self.PAYLOAD_CACHE[s3_key] = payload
+        return s3_key
+
+    def get_payload(self, bucket_name: str, s3_key: str) -> dict:
+        """Get a JSON payload stored by put_payload, memoized for the life of the Lambda container.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket
+            s3_key (str): S3 key of the payload
+
+        Returns:
+            dict: Payload
+        """
+        if s3_key not in self.PAYLOAD_CACHE:
+            response = self.S3_CLIENT.get_object(Bucket=bucket_name, Key=s3_key)
+            self.PAYLOAD_CACHE[s3_key] = json.loads(response["Body"].read())
+            self.LOGGER.info(f"Payload loaded from {bucket_name}/{s3_key}")
+        return self.PAYLOAD_CACHE[s3_key]
+
+    def get_artifact(self, bucket_name: str, s3_key: str) -> bytes:
+        """Get the contents of an S3 object, cached in memory for the life of the Lambda container.
+
+        A cached object is revalidated with its ETag, so it is only downloaded again when it has changed.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket
+            s3_key (str): S3 key (path) of the object
+
+        Returns:
+            bytes: Object contents
+        """
+        cached = self.ARTIFACT_CACHE.get((bucket_name, s3_key))
+        try:
+            if cached:
+                response = self.S3_CLIENT.get_object(Bucket=bucket_name, Key=s3_key, IfNoneMatch=cached["ETag"])
+            else:
+                response = self.S3_CLIENT.get_object(Bucket=bucket_name, Key=s3_key)
+        except ClientError as e:
+            if cached and e.response["Error"]["Code"] in ("304", "NotModified"):
+                self.LOGGER.info(f"{bucket_name}/{s3_key} not modified; using cached copy ({len(cached['Body'])} bytes)")
+                return cached["Body"]
+            raise
+        body = response["Body"].read()
+        self.ARTIFACT_CACHE[(bucket_name, s3_key)] = {"ETag": response["ETag"], "Body": body}
+        self.LOGGER.info(f"Downloaded {bucket_name}/{s3_key} ({len(body)} bytes)")
+        return body
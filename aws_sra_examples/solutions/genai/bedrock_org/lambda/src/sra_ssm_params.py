@@ -13,7 +13,6 @@ from __future__ import annotations
 import logging
 import os
 import re
-from time import sleep
 from typing import TYPE_CHECKING, Any, List, Literal, Optional, Sequence, Union
 
 import boto3
@@ -42,7 +41,6 @@ class SRASSMParams:
     OTHER_SECURITY_ACCT: str = ""
     OTHER_LOG_ARCHIVE_ACCT: str = ""
     RESOURCE_TYPE: str = ""
-    CLOUDFORMATION_THROTTLE_PERIOD = 0.2
     CLOUDFORMATION_PAGE_SIZE = 100
     SSM_DELETE_PARAMETERS_MAX = 10
     SRA_CONTROL_TOWER_SSM_PATH = "/sra/control-tower"
@@ -66,6 +64,9 @@ class SRASSMParams:
     UNEXPECTED = "Unexpected!"
     EMPTY_VALUE = "NONE"
     BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
+    # Clients paced by botocore's adaptive retry mode. Its client-side token bucket slows the client down when the service
+    # throttles and speeds it back up on success, in place of a fixed sleep between calls.
+    ADAPTIVE_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
     SRA_SECURITY_ACCT: str = ""
     SRA_ORG_ID: str = ""
     SSM_SECURITY_ACCOUNT_ID: str = ""
@@ -74,7 +75,7 @@ class SRASSMParams:
     try:
         MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
         ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=BOTO3_CONFIG)
-        CFN_CLIENT: CloudFormationClient = MANAGEMENT_ACCOUNT_SESSION.client("cloudformation", config=BOTO3_CONFIG)
+        CFN_CLIENT: CloudFormationClient = MANAGEMENT_ACCOUNT_SESSION.client("cloudformation", config=ADAPTIVE_BOTO3_CONFIG)
         STS_CLIENT = boto3.client("sts")
         HOME_REGION = MANAGEMENT_ACCOUNT_SESSION.region_name
         LOGGER.info(f"Detected home region: {HOME_REGION}")
@@ -154,7 +155,6 @@ class SRASSMParams:
                 break
             if all_regions_identified:
                 break
-            sleep(self.CLOUDFORMATION_THROTTLE_PERIOD)
 
         return customer_regions
 
@@ -313,7 +313,6 @@ class SRASSMParams:
                     }
                 )
                 ssm_data["helper"]["LogArchiveAccountId"] = instance["Account"]
-            sleep(self.CLOUDFORMATION_THROTTLE_PERIOD)
 
         self.LOGGER.info(ssm_data["helper"])
         return ssm_data
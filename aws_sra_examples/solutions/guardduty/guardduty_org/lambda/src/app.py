@@ -19,7 +19,7 @@ import json
 import logging
 import os
 import re
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any, Dict
 
 import boto3
@@ -45,8 +45,8 @@ helper = CfnResource(json_logging=True, log_level=log_level, boto_level="CRITICA
 PRINCIPAL_NAME = "malware-protection.guardduty.amazonaws.com"
 SERVICE_NAME = "guardduty.amazonaws.com"
 UNEXPECTED = "Unexpected!"
-MAX_RUN_COUNT = 60  # 5 minute wait = 30 x 10 seconds
-SLEEP_SECONDS = 10
+DETECTOR_WAIT_TIMEOUT_SECONDS = int(os.environ.get("DETECTOR_WAIT_TIMEOUT_SECONDS", "660"))
+CLEANUP_MEMBER_ACCOUNTS_MAX_WORKERS = int(os.environ.get("CLEANUP_MEMBER_ACCOUNTS_MAX_WORKERS", "5"))
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 
 try:
@@ -103,6 +103,7 @@ def get_validated_parameters(event: CloudFormationCustomResourceEvent) -> dict:
     parameter_pattern_validator("DELEGATED_ADMIN_ACCOUNT_ID", params.get("DELEGATED_ADMIN_ACCOUNT_ID", ""), pattern=r"^\d{12}$")
     parameter_pattern_validator("DELETE_DETECTOR_ROLE_NAME", params.get("DELETE_DETECTOR_ROLE_NAME", ""), pattern=r"^[\w+=,.@-]{1,64}$")
     parameter_pattern_validator("DISABLE_GUARD_DUTY", params.get("DISABLE_GUARD_DUTY", ""), pattern=true_false_pattern)
+    parameter_pattern_validator("PLAN_ONLY", params.get("PLAN_ONLY", "false"), pattern=true_false_pattern)
     parameter_pattern_validator("ENABLED_REGIONS", params.get("ENABLED_REGIONS", ""), pattern=r"^$|[a-z0-9-, ]+$")
     parameter_pattern_validator(
         "FINDING_PUBLISHING_FREQUENCY", params.get("FINDING_PUBLISHING_FREQUENCY", ""), pattern=r"^FIFTEEN_MINUTES|ONE_HOUR|SIX_HOURS$"
@@ -196,65 +197,124 @@ def process_create_update_event(params: dict, regions: list) -> None:
             "A service-linked role required for Amazon GuardDuty to access your resources.",
         )
         guardduty.process_organization_admin_account(params.get("DELEGATED_ADMIN_ACCOUNT_ID", ""), regions)
-        sleep(60)
         session = common.assume_role(params.get("CONFIGURATION_ROLE_NAME", ""), "CreateGuardDuty", params.get("DELEGATED_ADMIN_ACCOUNT_ID", ""))
-        detectors_exist = False
-        run_count = 0
-
-        while not detectors_exist and run_count < MAX_RUN_COUNT:
-            run_count += 1
-            detectors_exist = guardduty.check_for_detectors(session, regions)
-            LOGGER.info(f"All Detectors Exist?: {detectors_exist}. Count: {run_count}")
-            if not detectors_exist:
-                sleep(SLEEP_SECONDS)
+        detectors_exist = guardduty.wait_for_detectors(session, regions, DETECTOR_WAIT_TIMEOUT_SECONDS)
+        LOGGER.info(f"All Detectors Exist?: {detectors_exist}")
 
         if not detectors_exist:
             raise ValueError("GuardDuty Detectors did not get created in the allowed time. Check the Org Management delegated admin setup.")
-        else:
-            auto_enable_s3_logs = (params.get("AUTO_ENABLE_S3_LOGS", "false")).lower() in "true"
-            enable_eks_audit_logs = (params.get("ENABLE_EKS_AUDIT_LOGS", "false")).lower() in "true"
-            auto_enable_malware_protection = (params.get("AUTO_ENABLE_MALWARE_PROTECTION", "false")).lower() in "true"
-            enable_rds_login_events = (params.get("ENABLE_RDS_LOGIN_EVENTS", "false")).lower() in "true"
-            enable_eks_addon_management = (params.get("ENABLE_EKS_ADDON_MANAGEMENT", "false")).lower() in "true"
-            enable_lambda_network_logs = (params.get("ENABLE_LAMBDA_NETWORK_LOGS", "false")).lower() in "true"
-            enable_runtime_monitoring = (params.get("ENABLE_RUNTIME_MONITORING", "false")).lower() in "true"
-            enable_ecs_fargate_agent_management = (params.get("ENABLE_ECS_FARGATE_AGENT_MANAGEMENT", "false")).lower() in "true"
-            enable_ec2_agent_management = (params.get("ENABLE_EC2_AGENT_MANAGEMENT", "false")).lower() in "true"
-
-            gd_features = {
-                "S3_DATA_EVENTS": auto_enable_s3_logs,
-                "EKS_AUDIT_LOGS": enable_eks_audit_logs,
-                "EBS_MALWARE_PROTECTION": auto_enable_malware_protection,
-                "RDS_LOGIN_EVENTS": enable_rds_login_events,
-                "LAMBDA_NETWORK_LOGS": enable_lambda_network_logs,
-                "RUNTIME_MONITORING": enable_runtime_monitoring,
-                "EKS_ADDON_MANAGEMENT": enable_eks_addon_management,
-                "ECS_FARGATE_AGENT_MANAGEMENT": enable_ecs_fargate_agent_management,
-                "EC2_AGENT_MANAGEMENT": enable_ec2_agent_management,
-            }
-
-            guardduty.configure_guardduty(
-                session,
-                params["DELEGATED_ADMIN_ACCOUNT_ID"],
-                gd_features,
-                regions,
-                params.get("FINDING_PUBLISHING_FREQUENCY", "FIFTEEN_MINUTES"),
-                params["KMS_KEY_ARN"],
-                params["PUBLISHING_DESTINATION_BUCKET_ARN"],
-            )
+        configure_guardduty(params, regions)
+
+
+def get_guardduty_features(params: dict) -> dict:
+    """Get the GuardDuty protection plans configuration from the parameters.
+
+    Args:
+        params: input parameters
+
+    Returns:
+        GuardDuty protection plans configuration
+    """
+    auto_enable_s3_logs = (params.get("AUTO_ENABLE_S3_LOGS", "false")).lower() in "true"
+    enable_eks_audit_logs = (params.get("ENABLE_EKS_AUDIT_LOGS", "false")).lower() in "true"
+    auto_enable_malware_protection = (params.get("AUTO_ENABLE_MALWARE_PROTECTION", "false")).lower() in "true"
+    enable_rds_login_events = (params.get("ENABLE_RDS_LOGIN_EVENTS", "false")).lower() in "true"
+    enable_eks_addon_management = (params.get("ENABLE_EKS_ADDON_MANAGEMENT", "false")).lower() in "true"
+    enable_lambda_network_logs = (params.get("ENABLE_LAMBDA_NETWORK_LOGS", "false")).lower() in "true"
+    enable_runtime_monitoring = (params.get("ENABLE_RUNTIME_MONITORING", "false")).lower() in "true"
+    enable_ecs_fargate_agent_management = (params.get("ENABLE_ECS_FARGATE_AGENT_MANAGEMENT", "false")).lower() in "true"
+    enable_ec2_agent_management = (params.get("ENABLE_EC2_AGENT_MANAGEMENT", "false")).lower() in "true"
+
+    return {
+        "S3_DATA_EVENTS": auto_enable_s3_logs,
+        "EKS_AUDIT_LOGS": enable_eks_audit_logs,
+        "EBS_MALWARE_PROTECTION": auto_enable_malware_protection,
+        "RDS_LOGIN_EVENTS": enable_rds_login_events,
+        "LAMBDA_NETWORK_LOGS": enable_lambda_network_logs,
+        "RUNTIME_MONITORING": enable_runtime_monitoring,
+        "EKS_ADDON_MANAGEMENT": enable_eks_addon_management,
+        "ECS_FARGATE_AGENT_MANAGEMENT": enable_ecs_fargate_agent_management,
+        "EC2_AGENT_MANAGEMENT": enable_ec2_agent_management,
+    }
+
+
+def configure_guardduty(params: dict, regions: list, work_items: list = None, failed_regions: dict = None) -> None:
+    """Configure GuardDuty in the delegated admin account, continuing through the SNS topic before the Lambda deadline.
+
+    Args:
+        params: input parameters
+        regions: AWS regions
+        work_items: Remaining work items when resuming a previous invocation. Defaults to None.
+        failed_regions: Error by region for regions that failed in previous invocations. Defaults to None.
+    """
+    session = common.assume_role(params.get("CONFIGURATION_ROLE_NAME", ""), "CreateGuardDuty", params.get("DELEGATED_ADMIN_ACCOUNT_ID", ""))
+    completed = guardduty.configure_guardduty(
+        session,
+        params["DELEGATED_ADMIN_ACCOUNT_ID"],
+        get_guardduty_features(params),
+        regions,
+        params.get("FINDING_PUBLISHING_FREQUENCY", "FIFTEEN_MINUTES"),
+        params["KMS_KEY_ARN"],
+        params["PUBLISHING_DESTINATION_BUCKET_ARN"],
+        work_items,
+        lambda remaining_items, failed: common.continue_with_sns(
+            params["SNS_TOPIC_ARN"], {"Action": "configure", "Params": params, "Regions": regions, "FailedRegions": failed}, remaining_items
+        ),
+        (params.get("PLAN_ONLY", "false")).lower() in "true",
+        failed_regions,
+    )
+    LOGGER.info(f"GuardDuty configuration {'completed' if completed else 'continuing in a new invocation'}")
+
+
+def cleanup_member_accounts(cleanup_requests: list) -> None:
+    """Cleanup GuardDuty in the member accounts concurrently and report the result for each account.
+
+    Args:
+        cleanup_requests: (account ID, delete detector role name, regions) tuples
+
+    Raises:
+        ValueError: GuardDuty cleanup failed in one or more member accounts
+    """
+
+    def cleanup_account(cleanup_request: tuple) -> dict:
+        account_id, delete_detector_role_name, regions = cleanup_request
+        try:
+            return guardduty.cleanup_member_account(account_id, delete_detector_role_name, regions)
+        except Exception as error:
+            LOGGER.exception(f"Failed to cleanup GuardDuty in {account_id}")
+            return {"AccountId": account_id, "Error": str(error)}
+
+    with ThreadPoolExecutor(max_workers=min(CLEANUP_MEMBER_ACCOUNTS_MAX_WORKERS, len(cleanup_requests))) as executor:
+        account_results = list(executor.map(cleanup_account, cleanup_requests))
+
+    failed_accounts = [result for result in account_results if result.get("Error") or result.get("FailedRegions")]
+    LOGGER.info({"Cleanup_Member_Accounts": {"Accounts": len(account_results), "Failed": failed_accounts}})
+    if failed_accounts:
+        failed_account_ids = [result["AccountId"] for result in failed_accounts]
+        raise ValueError(f"GuardDuty cleanup failed in {len(failed_account_ids)} member account(s): {failed_account_ids}")
 
 
 def process_sns_records(records: list) -> None:
     """Process SNS records.
 
+    Member cleanup messages can carry several accounts, and the accounts from all records are cleaned up concurrently.
+
     Args:
         records: list of SNS event records
     """
+    cleanup_requests = []
     for record in records:
         sns_info = record["Sns"]
         LOGGER.info(f"SNS INFO: {sns_info}")
         message = json.loads(sns_info["Message"])
-        guardduty.cleanup_member_account(message["AccountId"], message["DeleteDetectorRoleName"], message["Regions"])
+        if common.WORK_CURSOR_KEY in message:
+            configure_guardduty(message["Params"], message["Regions"], message[common.WORK_CURSOR_KEY], message.get("FailedRegions"))
+        else:
+            for account_id in message.get("AccountIds", [message.get("AccountId")]):
+                cleanup_requests.append((account_id, message["DeleteDetectorRoleName"], message["Regions"]))
+
+    if cleanup_requests:
+        cleanup_member_accounts(cleanup_requests)
 
 
 @helper.create
@@ -300,9 +360,11 @@ def lambda_handler(event: Dict[str, Any], context: Context) -> None:
         ValueError: Unexpected error executing Lambda function
     """
     LOGGER.info("....Lambda Handler Started....")
+    common.set_lambda_context(context)
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
+        common.refresh_account_inventory(event)
         if "Records" not in event and "RequestType" not in event and ("source" not in event and event["source"] != "aws.controltower"):
             raise ValueError(
                 f"The event did not include Records or RequestType. Review CloudWatch logs '{context.log_group_name}' for details."
@@ -311,6 +373,7 @@ def lambda_handler(event: Dict[str, Any], context: Context) -> None:
             process_sns_records(event["Records"])
         elif "RequestType" in event:
             helper(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs '{context.log_group_name}' for details.") from None
@@ -327,9 +390,11 @@ def terraform_handler(event: Dict[str, Any], context: Context) -> None:
         ValueError: Unexpected error executing Lambda function
     """
     LOGGER.info("....Lambda Handler Started....")
+    common.set_lambda_context(context)
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
+        common.refresh_account_inventory(event)
         if "Records" not in event and "RequestType" not in event and ("source" not in event and event["source"] != "aws.controltower"):
             raise ValueError(
                 f"The event did not include Records or RequestType. Review CloudWatch logs '{context.log_group_name}' for details."
@@ -338,6 +403,7 @@ def terraform_handler(event: Dict[str, Any], context: Context) -> None:
             process_sns_records(event["Records"])
         elif "RequestType" in event:
             process_cloudformation_event(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs '{context.log_group_name}' for details.") from None
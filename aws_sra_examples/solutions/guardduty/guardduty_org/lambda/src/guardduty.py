@@ -13,8 +13,11 @@ from __future__ import annotations
 import json
 import logging
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from time import sleep
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator
 
 import boto3
 import common
@@ -42,6 +45,16 @@ UNEXPECTED = "Unexpected!"
 MAX_RETRY = 5
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 CHECK_ACCT_MEMBER_RETRIES = 10
+UPDATE_MEMBER_DETECTORS_BATCH_SIZE = 50  # Max accounts per update_member_detectors call
+UPDATE_MEMBER_DETECTORS_MAX_WORKERS = int(os.environ.get("UPDATE_MEMBER_DETECTORS_MAX_WORKERS", "5"))
+UNPROCESSED_ACCOUNTS_RETRY_SECONDS = 60
+CONFIGURE_GUARDDUTY_STEPS = ["configure", "verify_members"]
+CONFIGURE_GUARDDUTY_MAX_WORKERS = int(os.environ.get("CONFIGURE_GUARDDUTY_MAX_WORKERS", "8"))
+CLEANUP_MEMBER_REGIONS_MAX_WORKERS = int(os.environ.get("CLEANUP_MEMBER_REGIONS_MAX_WORKERS", "8"))
+CLEANUP_MEMBER_ACCOUNTS_PER_MESSAGE = 10
+LIST_MEMBERS_PAGE_SIZE = 50  # Max results per list_members call
+MEMBER_BATCH_SIZE = 50  # Max accounts per disassociate_members and delete_members call
+FEATURE_DISABLED_STATUSES = [None, "DISABLED", "NONE"]  # A feature missing from a response is not enabled
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
@@ -82,7 +95,7 @@ def process_organization_admin_account(admin_account_id: str, available_regions:
     """
     # Loop through the regions and enable GuardDuty
     for region in available_regions:
-        guardduty_client: GuardDutyClient = MANAGEMENT_ACCOUNT_SESSION.client("guardduty", region, config=BOTO3_CONFIG)
+        guardduty_client: GuardDutyClient = MANAGEMENT_ACCOUNT_SESSION.client("guardduty", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
         response = guardduty_client.list_organization_admin_accounts()
 
         if enable_admin_account(admin_account_id, response):
@@ -265,6 +278,71 @@ def set_configuration_params(
     return configuration_params
 
 
+def flatten_features(features: list, status_key: str) -> dict:
+    """Flatten GuardDuty features and their additional configuration into a name to status mapping.
+
+    Additional configuration is keyed by its parent feature as well, since the same name can appear under several features
+    (EKS_ADDON_MANAGEMENT under both EKS_RUNTIME_MONITORING and RUNTIME_MONITORING).
+
+    Args:
+        features: GuardDuty features, as sent to or returned by the GuardDuty API
+        status_key: Key holding the feature status ("Status" or "AutoEnable")
+
+    Returns:
+        Feature status by (feature name,) or (parent feature name, additional configuration name)
+    """
+    flattened_features: dict = {}
+    for feature in features:
+        flattened_features[(feature["Name"],)] = feature.get(status_key)
+        for additional_configuration in feature.get("AdditionalConfiguration", []):
+            flattened_features[(feature["Name"], additional_configuration["Name"])] = additional_configuration.get(status_key)
+    return flattened_features
+
+
+def get_feature_changes(desired_features: list, current_features: list, status_key: str) -> dict:
+    """Compare desired GuardDuty features against the current features.
+
+    Args:
+        desired_features: Desired GuardDuty features
+        current_features: Current GuardDuty features
+        status_key: Key holding the feature status ("Status" or "AutoEnable")
+
+    Returns:
+        "current->desired" change by feature name ("PARENT/NAME" for additional configuration), empty when nothing differs
+    """
+    current = flatten_features(current_features, status_key)
+    desired = flatten_features(desired_features, status_key)
+    feature_changes: dict = {}
+    for key, status in desired.items():
+        current_status = current.get(key)
+        if current_status != status and not (current_status in FEATURE_DISABLED_STATUSES and status in FEATURE_DISABLED_STATUSES):
+            feature_changes["/".join(key)] = f"{current_status}->{status}"
+    return feature_changes
+
+
+def get_member_detector_changes(guardduty_client: GuardDutyClient, detector_id: str, account_ids: list, desired_features: list) -> dict:
+    """Get the member accounts whose detector features differ from the desired features.
+
+    Args:
+        guardduty_client: GuardDuty client
+        detector_id: GuardDuty detector id
+        account_ids: Member account list of at most UPDATE_MEMBER_DETECTORS_BATCH_SIZE accounts
+        desired_features: Desired GuardDuty features
+
+    Returns:
+        Feature changes by account ID
+    """
+    member_detectors_response = guardduty_client.get_member_detectors(DetectorId=detector_id, AccountIds=account_ids)
+    account_changes: dict = {}
+    for configuration in member_detectors_response["MemberDataSourceConfigurations"]:
+        feature_changes = get_feature_changes(desired_features, configuration.get("Features", []), "Status")
+        if feature_changes:
+            account_changes[configuration["AccountId"]] = feature_changes
+    for unprocessed_account in member_detectors_response.get("UnprocessedAccounts", []):
+        account_changes[unprocessed_account["AccountId"]] = {"Detector": unprocessed_account.get("Result", "UNKNOWN")}
+    return account_changes
+
+
 def get_remaining_accounts(update_member_response: UpdateMemberDetectorsResponseTypeDef, account_ids: list) -> list:
     """Get remaining accounts.
 
@@ -282,80 +360,53 @@ def get_remaining_accounts(update_member_response: UpdateMemberDetectorsResponse
     return remaining_accounts
 
 
-def check_for_unprocessed_accounts_over_50(
-    guardduty_client: GuardDutyClient, configuration_params: dict, account_ids: list, update_member_response: UpdateMemberDetectorsResponseTypeDef
-) -> list:
-    """Check for unprocessed accounts in an Organization with over 50 accounts.
-
-    Args:
-        guardduty_client: GuardDuty client
-        configuration_params: Configuration parameters
-        account_ids: Member account list
-        update_member_response: UpdateMemberDetectorsResponseTypeDef
-
-    Returns:
-        List of unprocessed accounts
-    """
-    unprocessed = True
-    retry_count = 0
-    unprocessed_accounts = []
-    while unprocessed:
-        LOGGER.info(f"Unprocessed accounts found. Retry number; {retry_count} for unprocessed accounts")
-        LOGGER.info(f"Sleeping for {SLEEP_SECONDS} before retry")
-        sleep(SLEEP_SECONDS)
-        retry_count += 1
-        remaining_accounts = get_remaining_accounts(update_member_response, account_ids)
-
-        if len(remaining_accounts) > 0:
-            configuration_params["AccountIds"] = remaining_accounts
-            LOGGER.info(f"Remaining accounts found during update_member_detectors {remaining_accounts}")
-            LOGGER.info(f"Calling retry update_member_detectors with params {configuration_params}")
-            update_member_response = guardduty_client.update_member_detectors(**configuration_params)
-            if "UnprocessedAccounts" in update_member_response and update_member_response["UnprocessedAccounts"]:
-                LOGGER.info(f"Unprocessed accounts found during retry: {update_member_response['UnprocessedAccounts']}")
-                LOGGER.info(f"Calling update_member_detectors with params {configuration_params}")
-                unprocessed_accounts = update_member_response["UnprocessedAccounts"]
-                if retry_count == 5:
-                    LOGGER.info("retry count is 5 setting unprocessed to false")
-                    unprocessed = False
-            else:
-                LOGGER.info("No more unprocessed accounts found setting unprocessed to false")
-    return unprocessed_accounts
-
+def update_member_detectors_chunk(guardduty_client: GuardDutyClient, configuration_params: dict, chunk: list, plan_only: bool = False) -> dict:
+    """Update the member detectors that differ from the desired features for a chunk of accounts.
 
-def check_for_unprocessed_accounts(
-    guardduty_client: GuardDutyClient, configuration_params: dict, account_ids: list, update_member_response: UpdateMemberDetectorsResponseTypeDef
-) -> None:
-    """Check for unprocessed accounts.
+    Only the chunk's unprocessed accounts are retried, with backoff.
 
     Args:
         guardduty_client: GuardDuty client
-        account_ids: Member account list
-        update_member_response: UpdateMemberDetectorsResponseTypeDef
         configuration_params: Configuration parameters
+        chunk: Member account list of at most UPDATE_MEMBER_DETECTORS_BATCH_SIZE accounts
+        plan_only: Report the changes without updating any detector. Defaults to False.
 
-    Raises:
-        ValueError: Unprocessed member accounts
+    Returns:
+        Chunk result summary
     """
-    unprocessed = True
-    retry_count = 0
-    unprocessed_accounts = []
-    while unprocessed:
-        sleep(SLEEP_SECONDS)
-        retry_count += 1
-        remaining_accounts = get_remaining_accounts(update_member_response, account_ids)
-
+    limiter = common.get_rate_limiter("guardduty", region=guardduty_client.meta.region_name)
+    with limiter:
+        account_changes = get_member_detector_changes(guardduty_client, configuration_params["DetectorId"], chunk, configuration_params["Features"])
+    feature_changes: Dict[str, int] = {}
+    for changes in account_changes.values():
+        for name, change in changes.items():
+            feature_changes[f"{name}: {change}"] = feature_changes.get(f"{name}: {change}", 0) + 1
+    result: Dict[str, Any] = {
+        "Accounts": len(chunk),
+        "AccountsToUpdate": len(account_changes),
+        "FeatureChanges": feature_changes,
+        "Attempts": 0,
+        "UnprocessedAccounts": [],
+    }
+    if plan_only or not account_changes:
+        return result
+    remaining_accounts = list(account_changes)
+
+    def update_remaining_accounts() -> bool:
+        nonlocal remaining_accounts
+        result["Attempts"] += 1
+        with limiter:
+            update_member_response = guardduty_client.update_member_detectors(**{**configuration_params, "AccountIds": remaining_accounts})
+        result["UnprocessedAccounts"] = update_member_response.get("UnprocessedAccounts", [])
+        remaining_accounts = get_remaining_accounts(update_member_response, remaining_accounts)
         if remaining_accounts:
-            configuration_params["AccountIds"] = remaining_accounts
-            update_member_response = guardduty_client.update_member_detectors(**configuration_params)
-            if "UnprocessedAccounts" in update_member_response and update_member_response["UnprocessedAccounts"]:
-                unprocessed_accounts = update_member_response["UnprocessedAccounts"]
-                if retry_count == 5:
-                    unprocessed = False
+            LOGGER.info(f"Unprocessed accounts found during update_member_detectors: {result['UnprocessedAccounts']}")
+        return not remaining_accounts
 
-        if unprocessed_accounts:
-            LOGGER.info(f"Update Member Detectors Unprocessed Member Accounts: {unprocessed_accounts}")
-            raise ValueError("Unprocessed Member Accounts while Updating Member Detectors")
+    common.wait_until(
+        update_remaining_accounts, f"update_member_detectors for {len(account_changes)} account(s)", UNPROCESSED_ACCOUNTS_RETRY_SECONDS, base_delay=2
+    )
+    return result
 
 
 def update_member_detectors(
@@ -363,30 +414,52 @@ def update_member_detectors(
     detector_id: str,
     account_ids: list,
     gd_features: dict,
-) -> None:
+    plan_only: bool = False,
+) -> list:
     """Update member detectors.
 
+    Accounts are split into chunks of UPDATE_MEMBER_DETECTORS_BATCH_SIZE that are processed concurrently under the
+    GuardDuty rate limiter for the region. Each chunk reads the current member detectors first and only updates the
+    accounts that differ from the desired features.
+
     Args:
         guardduty_client: GuardDuty client
         detector_id: GuardDuty detector id
         account_ids: Member account list
         gd_features: GuardDuty protection plans configuration
+        plan_only: Report the changes without updating any detector. Defaults to False.
+
+    Raises:
+        ValueError: Unprocessed member accounts
 
+    Returns:
+        Result summary for each chunk
     """
     configuration_params = set_configuration_params(detector_id, account_ids, gd_features)
-    number_of_create_members_calls: int = math.ceil(len(configuration_params["AccountIds"]) / 50)
-    LOGGER.info("Iterating through api calls for each group of accounts...")
-    for api_call_number in range(0, number_of_create_members_calls):
-        configuration_params["AccountIds"] = account_ids[api_call_number * 50 : (api_call_number * 50) + 50]
-
-        LOGGER.info(f"Calling update_member_detectors with params {configuration_params}")
-        update_member_response = guardduty_client.update_member_detectors(**configuration_params)
-
-        if "UnprocessedAccounts" in update_member_response and update_member_response["UnprocessedAccounts"]:
-            check_for_unprocessed_accounts_over_50(guardduty_client, configuration_params, account_ids, update_member_response)
+    chunks = [
+        account_ids[index : index + UPDATE_MEMBER_DETECTORS_BATCH_SIZE] for index in range(0, len(account_ids), UPDATE_MEMBER_DETECTORS_BATCH_SIZE)
+    ]
+    LOGGER.info(f"Checking member detectors for {len(account_ids)} account(s) in {len(chunks)} chunk(s)...")
+    with ThreadPoolExecutor(max_workers=max(1, min(UPDATE_MEMBER_DETECTORS_MAX_WORKERS, len(chunks)))) as executor:
+        chunk_results = list(
+            executor.map(lambda chunk: update_member_detectors_chunk(guardduty_client, configuration_params, chunk, plan_only), chunks)
+        )
+    LOGGER.info(
+        {
+            "Update_Member_Detectors_Summary": {
+                "Region": guardduty_client.meta.region_name,
+                "PlanOnly": plan_only,
+                "AccountsToUpdate": sum(chunk_result["AccountsToUpdate"] for chunk_result in chunk_results),
+                "Chunks": chunk_results,
+            }
+        }
+    )
 
-    if "UnprocessedAccounts" in update_member_response and update_member_response["UnprocessedAccounts"]:
-        check_for_unprocessed_accounts(guardduty_client, configuration_params, account_ids, update_member_response)
+    unprocessed_accounts = [account for chunk_result in chunk_results for account in chunk_result["UnprocessedAccounts"]]
+    if unprocessed_accounts:
+        LOGGER.info(f"Update Member Detectors Unprocessed Member Accounts: {unprocessed_accounts}")
+        raise ValueError("Unprocessed Member Accounts while Updating Member Detectors")
+    return chunk_results
 
 
 def set_org_configuration_params(detector_id: str, gd_features: dict) -> dict:
@@ -458,23 +531,192 @@ def update_guardduty_configuration(
     gd_features: dict,
     detector_id: str,
     finding_publishing_frequency: str,
-) -> None:
+    plan_only: bool = False,
+) -> dict:
     """Update GuardDuty configuration to auto enable GuardDuty and selected features in new accounts.
 
+    The current organization configuration and delegated admin detector are read first, and only the ones that differ
+    from the desired configuration are updated.
+
     Args:
         guardduty_client: GuardDuty Client
         gd_features: GuardDuty protection plans configuration
         detector_id: GuardDuty detector ID
         finding_publishing_frequency: Finding publishing frequency
+        plan_only: Report the changes without updating the configuration. Defaults to False.
+
+    Returns:
+        Change plan for the organization configuration and the delegated admin detector
     """
     org_configuration_params = set_org_configuration_params(detector_id, gd_features)
     admin_configuration_params = set_admin_configuration_params(detector_id, finding_publishing_frequency, gd_features)
 
-    guardduty_client.update_organization_configuration(**org_configuration_params)
-    guardduty_client.update_detector(**admin_configuration_params)
+    organization_configuration = guardduty_client.describe_organization_configuration(DetectorId=detector_id)
+    organization_changes = get_feature_changes(org_configuration_params["Features"], organization_configuration.get("Features", []), "AutoEnable")
+    if organization_configuration.get("AutoEnable") is not True:
+        organization_changes["AutoEnable"] = f"{organization_configuration.get('AutoEnable')}->True"
 
+    detector = guardduty_client.get_detector(DetectorId=detector_id)
+    detector_changes = get_feature_changes(admin_configuration_params["Features"], detector.get("Features", []), "Status")
+    if detector.get("FindingPublishingFrequency") != finding_publishing_frequency:
+        detector_changes["FindingPublishingFrequency"] = f"{detector.get('FindingPublishingFrequency')}->{finding_publishing_frequency}"
 
-def configure_guardduty(  # noqa: CFQ002, CFQ001
+    change_plan = {"OrganizationConfiguration": organization_changes, "Detector": detector_changes}
+    LOGGER.info({"GuardDuty_Change_Plan": {"Region": guardduty_client.meta.region_name, "PlanOnly": plan_only, **change_plan}})
+    if plan_only:
+        return change_plan
+    if organization_changes:
+        guardduty_client.update_organization_configuration(**org_configuration_params)
+    if detector_changes:
+        guardduty_client.update_detector(**admin_configuration_params)
+    return change_plan
+
+
+def get_member_account_ids(guardduty_client: GuardDutyClient, detector_id: str) -> list:
+    """Get the account IDs of the existing GuardDuty members.
+
+    Args:
+        guardduty_client: GuardDuty client
+        detector_id: GuardDuty detector ID
+
+    Returns:
+        Member account IDs
+    """
+    member_account_ids: list = []
+    paginator = guardduty_client.get_paginator("list_members")
+    for page in paginator.paginate(DetectorId=detector_id, PaginationConfig={"PageSize": LIST_MEMBERS_PAGE_SIZE}):
+        member_account_ids.extend(member["AccountId"] for member in page["Members"])
+    return member_account_ids
+
+
+def configure_publishing_destination(
+    regional_guardduty: GuardDutyClient, detector_id: str, kms_key_arn: str, publishing_destination_arn: str, plan_only: bool = False
+) -> str:
+    """Create or update the GuardDuty publishing destination when it differs from the desired destination.
+
+    Args:
+        regional_guardduty: GuardDuty client for the region
+        detector_id: GuardDuty detector ID
+        kms_key_arn: KMS Key ARN
+        publishing_destination_arn: Publishing Destination ARN (S3 Bucket)
+        plan_only: Report the change without writing it. Defaults to False.
+
+    Returns:
+        Planned change ("create", "update" or "none")
+    """
+    destination_properties = {"DestinationArn": publishing_destination_arn, "KmsKeyArn": kms_key_arn}
+    destinations = regional_guardduty.list_publishing_destinations(DetectorId=detector_id)
+
+    if "Destinations" in destinations and len(destinations["Destinations"]) == 1:
+        destination_id = destinations["Destinations"][0]["DestinationId"]
+        destination = regional_guardduty.describe_publishing_destination(DetectorId=detector_id, DestinationId=destination_id)
+        if destination.get("DestinationProperties") == destination_properties:
+            return "none"
+        if not plan_only:
+            regional_guardduty.update_publishing_destination(
+                DetectorId=detector_id, DestinationId=destination_id, DestinationProperties=destination_properties  # type: ignore
+            )
+        return "update"
+
+    if not plan_only:
+        regional_guardduty.create_publishing_destination(
+            DetectorId=detector_id, DestinationType="S3", DestinationProperties=destination_properties  # type: ignore
+        )
+    return "create"
+
+
+def configure_guardduty_in_region(  # noqa: CFQ002
+    regional_guardduty: GuardDutyClient,
+    gd_features: dict,
+    accounts: list,
+    finding_publishing_frequency: str,
+    kms_key_arn: str,
+    publishing_destination_arn: str,
+    plan_only: bool = False,
+) -> None:
+    """Configure the GuardDuty publishing destination, organization configuration and members in a region.
+
+    Current settings are read first and only the differences are written.
+
+    Args:
+        regional_guardduty: GuardDuty client for the region
+        gd_features: GuardDuty protection plans configuration
+        accounts: AWS Organization accounts
+        finding_publishing_frequency: Finding publishing frequency
+        kms_key_arn: KMS Key ARN
+        publishing_destination_arn: Publishing Destination ARN (S3 Bucket)
+        plan_only: Report the changes without writing them. Defaults to False.
+    """
+    region = regional_guardduty.meta.region_name
+    LOGGER.info(f"Configuring GuardDuty in {region}")
+    detectors = regional_guardduty.list_detectors()
+
+    if detectors["DetectorIds"]:
+        detector_id = detectors["DetectorIds"][0]
+        LOGGER.info(f"DetectorID: {detector_id} Region: {region}")
+
+        publishing_destination_change = configure_publishing_destination(
+            regional_guardduty, detector_id, kms_key_arn, publishing_destination_arn, plan_only
+        )
+
+        # Set GuardDuty Organization configuration to auto-enable selected features
+        update_guardduty_configuration(regional_guardduty, gd_features, detector_id, finding_publishing_frequency, plan_only)
+
+        # Create members for existing Organization accounts that are not members yet
+        member_account_ids = get_member_account_ids(regional_guardduty, detector_id)
+        new_members = [account for account in accounts if account["AccountId"] not in member_account_ids]
+        LOGGER.info(
+            {
+                "GuardDuty_Change_Plan": {
+                    "Region": region,
+                    "PlanOnly": plan_only,
+                    "PublishingDestination": publishing_destination_change,
+                    "MembersToCreate": len(new_members),
+                }
+            }
+        )
+        if new_members and not plan_only:
+            create_members(regional_guardduty, detector_id, new_members)
+            LOGGER.info(f"Creating members for existing accounts: {new_members} in {region}")
+
+
+def verify_guardduty_members_in_region(
+    regional_guardduty: GuardDutyClient, gd_features: dict, accounts: list, account_ids: list, plan_only: bool = False
+) -> None:
+    """Verify members were created for the existing Organization accounts and update their detectors in a region.
+
+    Args:
+        regional_guardduty: GuardDuty client for the region
+        gd_features: GuardDuty protection plans configuration
+        accounts: AWS Organization accounts
+        account_ids: AWS Organization account IDs
+        plan_only: Report the member detector changes without writing them. Defaults to False.
+
+    Raises:
+        ValueError: "Check members failure"
+    """
+    region = regional_guardduty.meta.region_name
+    detectors = regional_guardduty.list_detectors()
+    if not detectors["DetectorIds"]:
+        LOGGER.info(f"No detector found in {region}. Skipping member check.")
+        return
+    detector_id = detectors["DetectorIds"][0]
+    if not plan_only:
+        LOGGER.info(f"Checking for missing members. DetectorID: {detector_id} Region: {region}")
+        missing_members: list = check_members(regional_guardduty, detector_id, accounts)
+        if len(missing_members) > 0:
+            LOGGER.info(f"Check members failure: {missing_members}")
+            raise ValueError("Check members failure")
+    update_member_detectors(
+        regional_guardduty,
+        detector_id,
+        account_ids,
+        gd_features,
+        plan_only,
+    )
+
+
+def configure_guardduty(  # noqa: CFQ002
     session: boto3.Session,
     delegated_account_id: str,
     gd_features: dict,
@@ -482,9 +724,18 @@ def configure_guardduty(  # noqa: CFQ002, CFQ001
     finding_publishing_frequency: str,
     kms_key_arn: str,
     publishing_destination_arn: str,
-) -> None:
+    work_items: list = None,
+    continuation: Callable[[list, dict], None] = None,
+    plan_only: bool = False,
+    failed_regions: dict = None,
+) -> bool:
     """Configure GuardDuty with provided parameters.
 
+    Every region is configured before members are verified in any region. Regions run in parallel, each with its own
+    GuardDuty client, and a failure in one region does not stop the others. When a continuation is provided, the remaining
+    (account, region, step) work items are handed to it before the Lambda deadline, together with the regions that failed so
+    far. The remaining items of a failed region are dropped, and the failures are raised once the last invocation finishes.
+
     Args:
         session: boto3 session
         delegated_account_id: Delegated Admin Account ID
@@ -493,104 +744,102 @@ def configure_guardduty(  # noqa: CFQ002, CFQ001
         finding_publishing_frequency: Finding publishing frequency
         kms_key_arn: KMS Key ARN
         publishing_destination_arn: Publishing Destination ARN (S3 Bucket)
+        work_items: Remaining work items when resuming a previous invocation. Defaults to None.
+        continuation: Function that resumes the remaining work items and failed regions in a new invocation. Defaults to None.
+        plan_only: Log the change plan for every region without writing any configuration. Defaults to False.
+        failed_regions: Error by region for regions that failed in previous invocations. Defaults to None.
 
     Raises:
-        ValueError: "Check members failure"
+        ValueError: GuardDuty configuration failed in one or more regions
+
+    Returns:
+        True if every work item ran, False if the remaining items were handed to the continuation
     """
     accounts = common.get_all_organization_accounts([delegated_account_id])
     account_ids = common.get_account_ids(accounts)
+    if work_items is None:
+        work_items = common.build_work_items([delegated_account_id], region_list, CONFIGURE_GUARDDUTY_STEPS)
+    regional_clients: Dict[str, GuardDutyClient] = {
+        region: session.client("guardduty", region_name=region, config=common.RATE_LIMITED_BOTO3_CONFIG)
+        for region in {work_item["Region"] for work_item in work_items}
+    }
+    region_results: Dict[str, dict] = {region: {"Status": "FAILED", "Error": error} for region, error in (failed_regions or {}).items()}
 
-    # Loop through the regions and enable GuardDuty
-    for region in region_list:
-        LOGGER.info(f"Configuring GuardDuty in {region}")
-        regional_guardduty: GuardDutyClient = session.client("guardduty", region_name=region, config=BOTO3_CONFIG)
-        detectors = regional_guardduty.list_detectors()
-
-        if detectors["DetectorIds"]:
-            detector_id = detectors["DetectorIds"][0]
-            LOGGER.info(f"DetectorID: {detector_id} Region: {region}")
-
-            # Update Publish Destination
-            destinations = regional_guardduty.list_publishing_destinations(DetectorId=detector_id)
-
-            if "Destinations" in destinations and len(destinations["Destinations"]) == 1:
-                destination_id = destinations["Destinations"][0]["DestinationId"]
-
-                regional_guardduty.update_publishing_destination(
-                    DetectorId=detector_id,
-                    DestinationId=destination_id,
-                    DestinationProperties={
-                        "DestinationArn": publishing_destination_arn,
-                        "KmsKeyArn": kms_key_arn,
-                    },
+    def run_work_item(work_item: dict) -> None:
+        region = work_item["Region"]
+        if region_results.get(region, {}).get("Status") == "FAILED":
+            LOGGER.info(f"Skipping {work_item['Step']} in {region} after an earlier failure")
+            return
+        try:
+            if work_item["Step"] == "configure":
+                configure_guardduty_in_region(
+                    regional_clients[region], gd_features, accounts, finding_publishing_frequency, kms_key_arn, publishing_destination_arn, plan_only
                 )
             else:
-                # Create Publish Destination
-                regional_guardduty.create_publishing_destination(
-                    DetectorId=detector_id,
-                    DestinationType="S3",
-                    DestinationProperties={
-                        "DestinationArn": publishing_destination_arn,
-                        "KmsKeyArn": kms_key_arn,
-                    },
-                )
+                verify_guardduty_members_in_region(regional_clients[region], gd_features, accounts, account_ids, plan_only)
+            region_results[region] = {"Step": work_item["Step"], "Status": "SUCCEEDED"}
+        except Exception as error:
+            LOGGER.exception(f"GuardDuty {work_item['Step']} failed in {region}")
+            region_results[region] = {"Step": work_item["Step"], "Status": "FAILED", "Error": str(error)}
 
-            # Set GuardDuty Organization configuration to auto-enable selected features
-            update_guardduty_configuration(
-                regional_guardduty,
-                gd_features,
-                detector_id,
-                finding_publishing_frequency,
-            )
+    def get_failed_regions() -> dict:
+        return {region: result["Error"] for region, result in region_results.items() if result["Status"] == "FAILED"}
 
-            # Create members for existing Organization accounts
-            create_members(regional_guardduty, detector_id, accounts)
-            LOGGER.info(f"Creating members for existing accounts: {accounts} in {region}")
+    def continue_remaining(remaining_items: list) -> None:
+        failed = get_failed_regions()
+        continuation([work_item for work_item in remaining_items if work_item["Region"] not in failed], failed)  # type: ignore
 
-    # Verify members created for existing Organization accounts
-    for region in region_list:
-        detectors = regional_guardduty.list_detectors()
-        if detectors["DetectorIds"]:
-            detector_id = detectors["DetectorIds"][0]
-            LOGGER.info(f"Checking for missing members. DetectorID: {detector_id} Region: {region}")
-        missing_members: list = check_members(regional_guardduty, detector_id, accounts)
-        if len(missing_members) > 0:
-            LOGGER.info(f"Check members failure: {missing_members}")
-            raise ValueError("Check members failure")
-        update_member_detectors(
-            regional_guardduty,
-            detector_id,
-            account_ids,
-            gd_features,
-        )
+    completed = common.run_work_items(work_items, run_work_item, continue_remaining if continuation else None, CONFIGURE_GUARDDUTY_MAX_WORKERS)
+    LOGGER.info({"Configure_GuardDuty_Results": region_results})
+    if not completed:
+        return False
+    failed = get_failed_regions()
+    if failed:
+        raise ValueError(f"GuardDuty configuration failed in {len(failed)} region(s): {failed}")
+    return True
 
 
-def check_for_detectors(session: boto3.Session, regions: list) -> bool:  # noqa: CCR001 (cognitive complexity)
-    """Check to see if the GuardDuty detectors exist for all regions before configuring.
+def region_has_detector(guardduty_client: GuardDutyClient, region: str) -> bool:
+    """Check if a GuardDuty detector exists in the region.
 
     Args:
-        session: boto3 session
-        regions: AWS regions
+        guardduty_client: GuardDuty client
+        region: AWS region
 
     Returns:
         True or False
     """
-    region_detectors: Dict[str, list] = {}
+    try:
+        paginator = guardduty_client.get_paginator("list_detectors")
+        for page in paginator.paginate():
+            if page["DetectorIds"]:
+                return True
+    except ClientError as error:
+        if error.response["Error"]["Code"] == "AccessDeniedException":
+            LOGGER.info(f"Detector not found in {region}")
+    return False
 
-    for region in regions:
-        try:
-            region_detectors[region] = []
-            guardduty_client: GuardDutyClient = session.client("guardduty", region, config=BOTO3_CONFIG)
-            paginator = guardduty_client.get_paginator("list_detectors")
 
-            for page in paginator.paginate():
-                region_detectors[region].extend(page["DetectorIds"])
-                LOGGER.info(f"Detectors: {region_detectors}")
-        except ClientError as error:
-            if error.response["Error"]["Code"] == "AccessDeniedException":
-                LOGGER.info(f"Detector not found in {region}")
+def wait_for_detectors(session: boto3.Session, regions: list, timeout_seconds: float) -> bool:
+    """Wait until the GuardDuty detectors exist in all regions before configuring.
+
+    The regions are polled concurrently, each with its own backoff, so a slow region does not hold up the checks in the others.
 
-    return all(value for _, value in region_detectors.items())
+    Args:
+        session: boto3 session
+        regions: AWS regions
+        timeout_seconds: Maximum seconds to wait
+
+    Returns:
+        True or False
+    """
+    # Clients are created up front because boto3 sessions are not thread safe
+    regional_clients = {region: session.client("guardduty", region, config=common.RATE_LIMITED_BOTO3_CONFIG) for region in regions}
+    region_results = common.wait_until_in_regions(
+        lambda region: region_has_detector(regional_clients[region], region), regions, "GuardDuty detector", timeout_seconds, base_delay=5
+    )
+    LOGGER.info(f"Regions without detectors: {sorted(region for region, has_detector in region_results.items() if not has_detector)}")
+    return all(region_results.values())
 
 
 def process_delete_event(params: dict, regions: list, account_ids: list, include_members: bool = False) -> None:
@@ -605,25 +854,30 @@ def process_delete_event(params: dict, regions: list, account_ids: list, include
     delegated_admin_session = common.assume_role(params["CONFIGURATION_ROLE_NAME"], "DeleteGuardDuty", params["DELEGATED_ADMIN_ACCOUNT_ID"])
     # Loop through the regions and disable GuardDuty in the delegated admin account
     for region in regions:
-        management_guardduty_client: GuardDutyClient = MANAGEMENT_ACCOUNT_SESSION.client("guardduty", region_name=region, config=BOTO3_CONFIG)
+        management_guardduty_client: GuardDutyClient = MANAGEMENT_ACCOUNT_SESSION.client(
+            "guardduty", region_name=region, config=common.RATE_LIMITED_BOTO3_CONFIG
+        )
         disable_organization_admin_account(management_guardduty_client, region)
 
         # Delete Detectors in the Delegated Admin Account
-        delegated_admin_guardduty_client: GuardDutyClient = delegated_admin_session.client("guardduty", region_name=region, config=BOTO3_CONFIG)
+        delegated_admin_guardduty_client: GuardDutyClient = delegated_admin_session.client(
+            "guardduty", region_name=region, config=common.RATE_LIMITED_BOTO3_CONFIG
+        )
         delete_detectors(delegated_admin_guardduty_client, region, True)
 
     deregister_delegated_administrator(params["DELEGATED_ADMIN_ACCOUNT_ID"], SERVICE_NAME)
 
     if include_members:
         management_sns_client: SNSClient = MANAGEMENT_ACCOUNT_SESSION.client("sns", config=BOTO3_CONFIG)
-        for account_id in account_ids:
+        for index in range(0, len(account_ids), CLEANUP_MEMBER_ACCOUNTS_PER_MESSAGE):
+            message_account_ids = account_ids[index : index + CLEANUP_MEMBER_ACCOUNTS_PER_MESSAGE]
             sns_message = {
-                "AccountId": account_id,
+                "AccountIds": message_account_ids,
                 "Regions": regions,
                 "DeleteDetectorRoleName": params["DELETE_DETECTOR_ROLE_NAME"],
                 "Action": "delete-member",
             }
-            LOGGER.info(f"Publishing message to cleanup GuardDuty in {account_id}")
+            LOGGER.info(f"Publishing message to cleanup GuardDuty in {message_account_ids}")
             LOGGER.info(f"{json.dumps(sns_message)}")
             management_sns_client.publish(TopicArn=params["SNS_TOPIC_ARN"], Message=json.dumps(sns_message))
 
@@ -643,7 +897,7 @@ def disable_aws_service_access(service_principal: str) -> None:
 
 
 def cleanup_member_account(account_id: str, delete_detector_role_name: str, regions: list) -> dict:
-    """Cleanup member account.
+    """Cleanup member account, deleting the GuardDuty detectors in the regions concurrently.
 
     Args:
         account_id: Account ID
@@ -651,16 +905,29 @@ def cleanup_member_account(account_id: str, delete_detector_role_name: str, regi
         regions: AWS Regions
 
     Returns:
-        Account ID
+        Account ID and the regions that failed with their errors
     """
     session = common.assume_role(delete_detector_role_name, "sra-delete-guardduty", account_id)
+    # Clients are created up front because boto3 sessions are not thread safe
+    regional_clients = {region: session.client("guardduty", region_name=region, config=common.RATE_LIMITED_BOTO3_CONFIG) for region in regions}
 
-    for region in regions:
+    def delete_region_detectors(region: str) -> str:
         LOGGER.info(f"Deleting GuardDuty detector in {account_id} {region}")
-        guardduty_client: GuardDutyClient = session.client("guardduty", region_name=region, config=BOTO3_CONFIG)
-        delete_detectors(guardduty_client, region, False)
+        try:
+            delete_detectors(regional_clients[region], region, False)
+        except ClientError as error:
+            LOGGER.error(f"Failed to delete GuardDuty detector in {account_id} {region}: {error}")
+            return error.response["Error"]["Code"]
+        return ""
 
-    return {"AccountId": account_id}
+    failed_regions: Dict[str, str] = {}
+    if regions:
+        with ThreadPoolExecutor(max_workers=min(CLEANUP_MEMBER_REGIONS_MAX_WORKERS, len(regions))) as executor:
+            for region, error_code in zip(regions, executor.map(delete_region_detectors, regions)):
+                if error_code:
+                    failed_regions[region] = error_code
+
+    return {"AccountId": account_id, "FailedRegions": failed_regions}
 
 
 def delete_detectors(guardduty_client: GuardDutyClient, region: str, is_delegated_admin: bool = False) -> None:
@@ -676,37 +943,57 @@ def delete_detectors(guardduty_client: GuardDutyClient, region: str, is_delegate
     if detectors["DetectorIds"]:
         for detector_id in detectors["DetectorIds"]:
             if is_delegated_admin:
-                account_ids = get_associated_members(guardduty_client, detector_id)
-                LOGGER.info(f"Account IDs: {account_ids}")
+                delete_members(guardduty_client, detector_id, region)
 
-                if account_ids:
-                    guardduty_client.disassociate_members(DetectorId=detector_id, AccountIds=account_ids)
-                    LOGGER.info(f"GuardDuty accounts disassociated in {region}")
+            guardduty_client.delete_detector(DetectorId=detector_id)
 
-                    guardduty_client.delete_members(DetectorId=detector_id, AccountIds=account_ids)
-                    LOGGER.info(f"GuardDuty members deleted in {region}")
 
-            guardduty_client.delete_detector(DetectorId=detector_id)
+def delete_members(guardduty_client: GuardDutyClient, detector_id: str, region: str) -> None:
+    """Disassociate and delete the GuardDuty members in batches.
+
+    Each batch is read from the first list_members page, and the listing starts again from the first page after the batch is
+    deleted, since deleting members shifts the pages. Only one page is held at a time, and members that join while the
+    batches are deleted are picked up by the next listing.
+
+    Args:
+        guardduty_client: GuardDuty Client
+        detector_id: GuardDuty Detector ID
+        region: AWS Region
 
+    Raises:
+        ValueError: The same GuardDuty members are listed again after their batch was deleted
+    """
+    previous_account_ids: list = []
+    while True:
+        account_ids = list(islice(get_associated_members(guardduty_client, detector_id), MEMBER_BATCH_SIZE))
+        if not account_ids:
+            return
+        if account_ids == previous_account_ids:
+            raise ValueError(f"{len(account_ids)} GuardDuty member(s) remain in {region} after they were deleted: {account_ids}")
+        LOGGER.info(f"Account IDs: {account_ids}")
+        guardduty_client.disassociate_members(DetectorId=detector_id, AccountIds=account_ids)
+        LOGGER.info(f"GuardDuty accounts disassociated in {region}")
 
-def get_associated_members(guardduty_client: GuardDutyClient, detector_id: str) -> list:
-    """Get associated GuardDuty members.
+        guardduty_client.delete_members(DetectorId=detector_id, AccountIds=account_ids)
+        LOGGER.info(f"GuardDuty members deleted in {region}")
+        previous_account_ids = account_ids
+
+
+def get_associated_members(guardduty_client: GuardDutyClient, detector_id: str) -> Iterator[str]:
+    """Get associated GuardDuty members, yielding each account ID as the pages are listed.
 
     Args:
         guardduty_client: GuardDuty Client
         detector_id: GuardDuty Detector ID
 
-    Returns:
-        account_ids
+    Yields:
+        Account ID
     """
-    account_ids = []
     paginator = guardduty_client.get_paginator("list_members")
 
-    for page in paginator.paginate(DetectorId=detector_id, OnlyAssociated="false", PaginationConfig={"PageSize": 20}):
+    for page in paginator.paginate(DetectorId=detector_id, OnlyAssociated="false", PaginationConfig={"PageSize": LIST_MEMBERS_PAGE_SIZE}):
         for member in page["Members"]:
-            account_ids.append(member["AccountId"])
-
-    return account_ids
+            yield member["AccountId"]
 
 
 def deregister_delegated_administrator(delegated_admin_account_id: str, service_principal: str = SERVICE_NAME) -> None:
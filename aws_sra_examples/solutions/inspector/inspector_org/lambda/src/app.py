@@ -12,7 +12,9 @@ from __future__ import annotations
 import json
 import logging
 import os
+import random
 import re
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import TYPE_CHECKING, Any, Dict, Literal, Optional
 
@@ -36,6 +38,9 @@ LOGGER.setLevel(log_level)
 UNEXPECTED = "Unexpected!"
 SERVICE_NAME = "inspector2.amazonaws.com"
 SNS_PUBLISH_BATCH_MAX = 10
+SNS_PUBLISH_MAX_WORKERS = int(os.environ.get("SNS_PUBLISH_MAX_WORKERS", "5"))
+SNS_PUBLISH_MAX_RETRY = 5
+SNS_PUBLISH_MAX_DELAY_SECONDS = 20
 ALL_INSPECTOR_SCAN_COMPONENTS = ["EC2", "ECR", "LAMBDA", "LAMBDA_CODE"]
 
 helper = CfnResource(json_logging=True, log_level=log_level, boto_level="CRITICAL", sleep_on_delete=120)
@@ -83,6 +88,7 @@ def process_event(event: dict) -> None:
     """
     event_info = {"Event": event}
     LOGGER.info(event_info)
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({"RequestType": "Update"})
 
     excluded_accounts: list = [params["DELEGATED_ADMIN_ACCOUNT_ID"]]
@@ -406,8 +412,8 @@ def setup_inspector_in_region(
     )
 
     inspector.set_inspector_delegated_admin_in_mgmt(delegated_admin_account, region)
-    LOGGER.info("Waiting 20 seconds before configuring inspector org auto-enable.")
-    sleep(20)
+    if not inspector.wait_for_delegated_admin(delegated_admin_account, region):
+        LOGGER.info(f"Delegated admin is not yet enabled in {region}; continuing with inspector org auto-enable.")
 
     inspector.set_auto_enable_inspector_in_org(region, configuration_role_name, delegated_admin_account, scan_component_dict)
 
@@ -417,14 +423,14 @@ def setup_inspector_in_region(
     inspector.associate_inspector_member_accounts(configuration_role_name, delegated_admin_account, accounts, region)
 
     inspector.enable_inspector2_in_member_accounts(region, configuration_role_name, delegated_admin_account, scan_components, accounts)
-    LOGGER.info("Waiting 20 seconds before checking for components that need to be disabled.")
-    sleep(20)
 
     all_accounts: list = []
     for account in accounts:
         all_accounts.append(account["AccountId"])
     all_accounts.append(management_account)
     all_accounts.append(delegated_admin_account)
+    if not inspector.wait_for_account_statuses(configuration_role_name, delegated_admin_account, all_accounts, region):
+        LOGGER.info(f"Inspector status is still transitioning in some accounts in {region}; checking scan components anyway.")
     inspector.check_scan_component_enablement_for_accounts(
         all_accounts, delegated_admin_account, disabled_components, configuration_role_name, region
     )
@@ -485,36 +491,51 @@ def create_sns_messages(accounts: list, regions: list, sns_topic_arn: str, actio
 
 
 def publish_sns_message_batch(message_batch: list, sns_topic_arn: str) -> None:
-    """Publish SNS Message Batches.
+    """Publish SNS Message Batches, retrying only the entries that failed.
 
     Args:
         message_batch: Batch of SNS messages
         sns_topic_arn: SNS Topic ARN
+
+    Raises:
+        ValueError: SNS messages could not be published
     """
-    LOGGER.info("Publishing SNS Message Batch")
-    LOGGER.info({"SNSMessageBatch": message_batch})
-    response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=message_batch)
-    api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
-    LOGGER.info(api_call_details)
+    entries = message_batch
+    for attempt in range(1, SNS_PUBLISH_MAX_RETRY + 1):
+        LOGGER.info("Publishing SNS Message Batch")
+        LOGGER.info({"SNSMessageBatch": entries})
+        response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=entries)
+        api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
+        LOGGER.info(api_call_details)
+
+        failed_entries = response.get("Failed", [])
+        sender_faults = [failed for failed in failed_entries if failed.get("SenderFault")]
+        if sender_faults:
+            raise ValueError(f"SNS rejected {len(sender_faults)} message(s): {sender_faults}")
+        failed_ids = {failed["Id"] for failed in failed_entries}
+        entries = [entry for entry in entries if entry["Id"] in failed_ids]
+        if not entries:
+            return
+        delay = random.uniform(0, min(SNS_PUBLISH_MAX_DELAY_SECONDS, 2**attempt))  # noqa: S311
+        LOGGER.info(f"Retrying {len(entries)} failed SNS message(s) in {delay:.1f} seconds")
+        sleep(delay)
+    unpublished_ids = [entry["Id"] for entry in entries]
+    raise ValueError(f"Failed to publish {len(unpublished_ids)} SNS message(s) after {SNS_PUBLISH_MAX_RETRY} attempts: {unpublished_ids}")
 
 
 def process_sns_message_batches(sns_messages: list, sns_topic_arn: str) -> None:
-    """Process SNS Message Batches for Publishing.
+    """Process SNS Message Batches for Publishing, publishing the batches concurrently.
 
     Args:
         sns_messages: SNS messages to be batched.
         sns_topic_arn: SNS Topic ARN
     """
-    message_batches = []
-    for i in range(
-        SNS_PUBLISH_BATCH_MAX,
-        len(sns_messages) + SNS_PUBLISH_BATCH_MAX,
-        SNS_PUBLISH_BATCH_MAX,
-    ):
-        message_batches.append(sns_messages[i - SNS_PUBLISH_BATCH_MAX : i])
+    message_batches = [sns_messages[i : i + SNS_PUBLISH_BATCH_MAX] for i in range(0, len(sns_messages), SNS_PUBLISH_BATCH_MAX)]
+    if not message_batches:
+        return
 
-    for batch in message_batches:
-        publish_sns_message_batch(batch, sns_topic_arn)
+    with ThreadPoolExecutor(max_workers=min(SNS_PUBLISH_MAX_WORKERS, len(message_batches))) as executor:
+        list(executor.map(lambda batch: publish_sns_message_batch(batch, sns_topic_arn), message_batches))
 
 
 def process_event_sns(event: dict) -> None:
@@ -576,12 +597,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> None:
         ValueError: Unexpected error executing Lambda function
     """
     LOGGER.info("....Lambda Handler Started....")
+    common.set_lambda_context(context)
     boto3_version = boto3.__version__
     LOGGER.info(f"boto3 version: {boto3_version}")
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
         orchestrator(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs ({context.log_group_name}) for details.") from None
@@ -9,13 +9,21 @@ SPDX-License-Identifier: MIT-0
 
 from __future__ import annotations
 
+import json
 import logging
 import os
-from time import sleep
-from typing import TYPE_CHECKING
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from time import monotonic, sleep, time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Literal
 
 import boto3
+from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError, EndpointConnectionError
+from botocore.session import get_session
 
 if TYPE_CHECKING:
     from mypy_boto3_iam.client import IAMClient
@@ -30,17 +38,126 @@ LOGGER.setLevel(log_level)
 
 # Global variables
 ORGANIZATIONS_PAGE_SIZE = 20
-ORGANIZATIONS_THROTTLE_PERIOD = 0.2
+
+# Region probe settings. Probe results are memoized per region for the life of a warm container.
+REGION_PROBE_MAX_WORKERS = int(os.environ.get("REGION_PROBE_MAX_WORKERS", "10"))
+REGION_PROBE_TIMEOUT_SECONDS = int(os.environ.get("REGION_PROBE_TIMEOUT_SECONDS", "5"))
+REGION_PROBE_CACHE_TTL_SECONDS = int(os.environ.get("REGION_PROBE_CACHE_TTL_SECONDS", "3600"))
+REGION_PROBE_CONFIG = Config(
+    connect_timeout=REGION_PROBE_TIMEOUT_SECONDS, read_timeout=REGION_PROBE_TIMEOUT_SECONDS, retries={"max_attempts": 2, "mode": "standard"}
+)
+REGION_PROBE_CACHE: dict = {}
+REGION_PROBE_CACHED_STATUSES = ["enabled", "disabled"]
+
+# Assumed role session cache. Sessions are keyed by (account, role, partition, role session name) and their credentials are
+# refreshed automatically by botocore before they expire.
+CALLER_ARN_CACHE: dict = {}
+ROLE_SESSION_CACHE: dict = {}
+ROLE_SESSION_CACHE_STATS = {"Hits": 0, "Misses": 0}
+ROLE_SESSION_LOCKS: dict = {}
+ROLE_SESSION_LOCK = threading.Lock()
+
+# Adaptive rate limiter settings. Limiters are shared per (service, account, region) for the life of a warm container.
+RATE_LIMITER_DEFAULT_RATE = float(os.environ.get("RATE_LIMITER_DEFAULT_RATE", "5"))
+RATE_LIMITER_MAX_RATE = float(os.environ.get("RATE_LIMITER_MAX_RATE", "20"))
+RATE_LIMITER_INCREASE = 0.5
+RATE_LIMITERS: dict = {}
+RATE_LIMITERS_LOCK = threading.Lock()
+# Clients whose calls go through a rate limiter use botocore's adaptive retry mode. Standard mode retries throttled calls
+# at full speed inside botocore, so adaptive mode is what slows the client itself down when a service throttles.
+RATE_LIMITED_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
+
+# Readiness waiter settings. Waits are also bounded by the remaining Lambda execution time once a context is set.
+WAITER_BASE_DELAY_SECONDS = float(os.environ.get("WAITER_BASE_DELAY_SECONDS", "1"))
+WAITER_MAX_DELAY_SECONDS = float(os.environ.get("WAITER_MAX_DELAY_SECONDS", "30"))
+WAITER_DEADLINE_MARGIN_SECONDS = int(os.environ.get("WAITER_DEADLINE_MARGIN_SECONDS", "30"))
+LAMBDA_CONTEXT: dict = {"Context": None}
+
+# Organization account inventory cache. The snapshot is kept in memory for the life of a warm container and
+# optionally persisted to a local file and/or S3 object so concurrent workers can share it.
+ACCOUNT_CACHE_TTL_SECONDS = int(os.environ.get("ACCOUNT_CACHE_TTL_SECONDS", "900"))
+ACCOUNT_CACHE_FILE = os.environ.get("ACCOUNT_CACHE_FILE", "")
+ACCOUNT_CACHE_S3_BUCKET = os.environ.get("ACCOUNT_CACHE_S3_BUCKET", "")
+ACCOUNT_CACHE_S3_KEY = os.environ.get("ACCOUNT_CACHE_S3_KEY", "sra/organization-accounts.json")
+ACCOUNT_INVENTORY_FIELDS = ["Id", "Arn", "Email", "Name", "Status", "JoinedMethod"]
+ACCOUNT_INVENTORY: dict = {"Timestamp": 0.0, "Accounts": []}
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
-    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations")
+    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=RATE_LIMITED_BOTO3_CONFIG)
     SSM_CLIENT: SSMClient = MANAGEMENT_ACCOUNT_SESSION.client("ssm")
 except Exception as error:
     LOGGER.error({"Unexpected_Error": error})
     raise ValueError("Unexpected error executing Lambda function. Review CloudWatch logs for details.") from None
 
 
+def get_caller_arn(session: boto3.Session, sts_client: STSClient) -> str:
+    """Get the caller identity ARN for the session, calling STS only once per set of credentials.
+
+    Args:
+        session: Boto3 session
+        sts_client: STS client created from the session
+
+    Returns:
+        Caller identity ARN
+    """
+    access_key = session.get_credentials().access_key
+    if access_key not in CALLER_ARN_CACHE:
+        CALLER_ARN_CACHE[access_key] = sts_client.get_caller_identity()["Arn"]
+        LOGGER.info(f"USER: {CALLER_ARN_CACHE[access_key]}")
+    return CALLER_ARN_CACHE[access_key]
+
+
+def get_role_session(sts_client: STSClient, role_arn: str, role_session_name: str, cache_key: tuple) -> boto3.Session:
+    """Get a cached session for the role, assuming it only when no session exists for the cache key.
+
+    Args:
+        sts_client: STS client used to assume the role and refresh the credentials
+        role_arn: Role ARN to assume
+        role_session_name: Identifier for the assumed role session
+        cache_key: (account, role, partition, role session name)
+
+    Returns:
+        Session object with auto-refreshing credentials for the role
+    """
+    with ROLE_SESSION_LOCK:
+        key_lock = ROLE_SESSION_LOCKS.setdefault(cache_key, threading.Lock())
+
+    with key_lock:
+        if cache_key in ROLE_SESSION_CACHE:
+            ROLE_SESSION_CACHE_STATS["Hits"] += 1
+            return ROLE_SESSION_CACHE[cache_key]
+        ROLE_SESSION_CACHE_STATS["Misses"] += 1
+
+        def refresh_credentials() -> dict:
+            response = sts_client.assume_role(RoleArn=role_arn, RoleSessionName=role_session_name)
+            LOGGER.info(f"ASSUMED ROLE: {response['AssumedRoleUser']['Arn']}")
+            return {
+                "access_key": response["Credentials"]["AccessKeyId"],
+                "secret_key": response["Credentials"]["SecretAccessKey"],
+                "token": response["Credentials"]["SessionToken"],
+                "expiry_time": response["Credentials"]["Expiration"].isoformat(),
+            }
+
+        credentials = RefreshableCredentials.create_from_metadata(
+            metadata=refresh_credentials(), refresh_using=refresh_credentials, method="sts-assume-role"
+        )
+        botocore_session = get_session()
+        # botocore has no public setter for refreshable credentials; set_credentials only accepts static keys.
+        botocore_session._credentials = credentials
+        ROLE_SESSION_CACHE[cache_key] = boto3.Session(botocore_session=botocore_session)
+        return ROLE_SESSION_CACHE[cache_key]
+
+
+def get_role_session_cache_stats() -> dict:
+    """Get the assumed role session cache statistics.
+
+    Returns:
+        Cache hits, misses and number of cached sessions
+    """
+    return {**ROLE_SESSION_CACHE_STATS, "Sessions": len(ROLE_SESSION_CACHE)}
+
+
 def assume_role(
     role: str,
     role_session_name: str,
@@ -61,20 +178,307 @@ def assume_role(
     if not session:
         session = boto3.Session()
     sts_client: STSClient = session.client("sts")
-    sts_arn = sts_client.get_caller_identity()["Arn"]
-    LOGGER.info(f"USER: {sts_arn}")
+    sts_arn = get_caller_arn(session, sts_client)
     if not account:
         account = sts_arn.split(":")[4]
     partition = sts_arn.split(":")[1]
     role_arn = f"arn:{partition}:iam::{account}:role/{role}"
 
-    response = sts_client.assume_role(RoleArn=role_arn, RoleSessionName=role_session_name)
-    LOGGER.info(f"ASSUMED ROLE: {response['AssumedRoleUser']['Arn']}")
-    return boto3.Session(
-        aws_access_key_id=response["Credentials"]["AccessKeyId"],
-        aws_secret_access_key=response["Credentials"]["SecretAccessKey"],
-        aws_session_token=response["Credentials"]["SessionToken"],
-    )
+    return get_role_session(sts_client, role_arn, role_session_name, (account, role, partition, role_session_name))
+
+
+class AdaptiveRateLimiter:
+    """Token bucket rate limiter that backs off when an API throttles and speeds back up on success.
+
+    The limiter can be used as a context manager around a single API call or as a decorator. It paces the calls of every thread
+    sharing a service, account and region. Individual throttles are retried by the RATE_LIMITED_BOTO3_CONFIG clients, so the
+    limiter only halves its rate for throttles that are still failing once those retries are exhausted.
+    """
+
+    THROTTLING_ERROR_CODES = ["Throttling", "ThrottlingException", "ThrottledException", "TooManyRequestsException", "RequestLimitExceeded"]
+
+    def __init__(self, rate: float = RATE_LIMITER_DEFAULT_RATE, min_rate: float = 0.5, max_rate: float = RATE_LIMITER_MAX_RATE) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            rate: Initial calls per second. Defaults to RATE_LIMITER_DEFAULT_RATE.
+            min_rate: Lowest calls per second after backing off. Defaults to 0.5.
+            max_rate: Highest calls per second after speeding up. Defaults to RATE_LIMITER_MAX_RATE.
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = monotonic()
+        self.lock = threading.Lock()
+        self.stats = {"Calls": 0, "Throttles": 0, "WaitSeconds": 0.0, "Rate": rate}
+
+    def acquire(self) -> None:
+        """Wait until a token is available for the next call."""
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait_seconds = max(0.0, (1.0 - self.tokens) / self.rate)
+            self.tokens -= 1.0
+            self.stats["Calls"] += 1
+            self.stats["WaitSeconds"] += wait_seconds
+        if wait_seconds:
+            sleep(wait_seconds)
+
+    def record_success(self) -> None:
+        """Additively increase the rate after a successful call."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + RATE_LIMITER_INCREASE)
+            self.stats["Rate"] = self.rate
+
+    def record_throttle(self) -> None:
+        """Halve the rate and drain the bucket after a throttled call."""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self.stats["Throttles"] += 1
+            self.stats["Rate"] = self.rate
+
+    def __enter__(self) -> AdaptiveRateLimiter:
+        """Acquire a token before the call.
+
+        Returns:
+            The rate limiter
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> Literal[False]:
+        """Adjust the rate based on the outcome of the call.
+
+        Args:
+            exc_type: Exception type raised by the call
+            exc_value: Exception raised by the call
+            traceback: Exception traceback
+
+        Returns:
+            False so exceptions are not suppressed
+        """
+        if exc_value is None:
+            self.record_success()
+        elif isinstance(exc_value, ClientError) and exc_value.response["Error"]["Code"] in self.THROTTLING_ERROR_CODES:
+            self.record_throttle()
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        """Rate limit every call to the decorated function.
+
+        Args:
+            func: Function to rate limit
+
+        Returns:
+            Wrapped function
+        """
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self:
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def get_rate_limiter(service: str, account: str = "", region: str = "") -> AdaptiveRateLimiter:
+    """Get the shared rate limiter for the service, account and region.
+
+    Args:
+        service: AWS service name
+        account: AWS account ID. Defaults to "".
+        region: AWS region. Defaults to "".
+
+    Returns:
+        Rate limiter
+    """
+    with RATE_LIMITERS_LOCK:
+        return RATE_LIMITERS.setdefault((service, account, region), AdaptiveRateLimiter())
+
+
+def get_rate_limiter_stats() -> dict:
+    """Get the call, throttle and wait statistics of every rate limiter.
+
+    Returns:
+        Statistics by 'service/account/region'
+    """
+    return {"/".join(key): dict(limiter.stats) for key, limiter in RATE_LIMITERS.items()}
+
+
+def rate_limited_pages(page_iterator: Iterable, limiter: AdaptiveRateLimiter) -> Iterator:
+    """Yield paginator pages, fetching each page through the rate limiter.
+
+    Args:
+        page_iterator: Paginator page iterator
+        limiter: Rate limiter
+
+    Yields:
+        Paginator page
+    """
+    pages = iter(page_iterator)
+    while True:
+        with limiter:
+            page = next(pages, None)
+        if page is None:
+            return
+        yield page
+
+
+def set_lambda_context(context: Any) -> None:
+    """Remember the Lambda context so waits can be bounded by the remaining execution time.
+
+    Args:
+        context: Lambda runtime information
+    """
+    LAMBDA_CONTEXT["Context"] = context
+
+
+def get_remaining_seconds() -> float:
+    """Get the seconds left before the Lambda deadline, less WAITER_DEADLINE_MARGIN_SECONDS.
+
+    Returns:
+        Remaining seconds, or infinity when no Lambda context is set
+    """
+    context = LAMBDA_CONTEXT["Context"]
+    if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+        return float("inf")
+    return context.get_remaining_time_in_millis() / 1000 - WAITER_DEADLINE_MARGIN_SECONDS
+
+
+def wait_until(
+    condition: Callable[[], bool],
+    description: str,
+    timeout_seconds: float = 300,
+    base_delay: float = WAITER_BASE_DELAY_SECONDS,
+    max_delay: float = WAITER_MAX_DELAY_SECONDS,
+) -> bool:
+    """Poll a condition with exponential backoff and full jitter until it is met or the deadline passes.
+
+    Args:
+        condition: Function returning True once the resource is ready
+        description: Description of what is being waited on, used for logging
+        timeout_seconds: Maximum seconds to wait. Defaults to 300.
+        base_delay: Delay cap for the first retry. Defaults to WAITER_BASE_DELAY_SECONDS.
+        max_delay: Upper bound for any single delay. Defaults to WAITER_MAX_DELAY_SECONDS.
+
+    Returns:
+        True if the condition was met, False if the deadline passed first
+    """
+    deadline = monotonic() + min(timeout_seconds, get_remaining_seconds())
+    attempt = 0
+    while True:
+        attempt += 1
+        if condition():
+            LOGGER.info(f"{description} ready after {attempt} check(s)")
+            return True
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            LOGGER.info(f"{description} not ready after {attempt} check(s)")
+            return False
+        delay = min(remaining, random.uniform(0, min(max_delay, base_delay * 2 ** min(attempt, 16))))  # noqa: S311
+        LOGGER.debug(f"{description} not ready, checking again in {delay:.1f} seconds")
+        sleep(delay)
+
+
+def list_organization_accounts() -> list:
+    """List every account in the AWS Organization.
+
+    Returns:
+        List of account records. {'Id': '', 'Arn': '', 'Email': '', 'Name': '', 'Status': '', 'JoinedMethod': ''}
+    """
+    accounts: list[dict] = []
+    paginator = ORG_CLIENT.get_paginator("list_accounts")
+
+    for page in rate_limited_pages(paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}), get_rate_limiter("organizations")):
+        for account in page["Accounts"]:
+            accounts.append({field: account[field] for field in ACCOUNT_INVENTORY_FIELDS if field in account})
+
+    return accounts
+
+
+def load_account_inventory() -> dict:
+    """Load the persisted account inventory snapshot from the local cache file, then the S3 cache object.
+
+    Returns:
+        Account inventory snapshot. {'Timestamp': 0.0, 'Accounts': []}, empty when nothing fresh is persisted
+    """
+    if ACCOUNT_CACHE_FILE and os.path.isfile(ACCOUNT_CACHE_FILE):
+        try:
+            with open(ACCOUNT_CACHE_FILE, "r") as cache_file:
+                snapshot = json.load(cache_file)
+            if time() - snapshot.get("Timestamp", 0.0) < ACCOUNT_CACHE_TTL_SECONDS:
+                return snapshot
+        except (OSError, ValueError) as error:
+            LOGGER.info(f"Unable to load account inventory from {ACCOUNT_CACHE_FILE}: {error}")
+
+    if ACCOUNT_CACHE_S3_BUCKET:
+        try:
+            response = MANAGEMENT_ACCOUNT_SESSION.client("s3").get_object(Bucket=ACCOUNT_CACHE_S3_BUCKET, Key=ACCOUNT_CACHE_S3_KEY)
+            snapshot = json.loads(response["Body"].read())
+            if time() - snapshot.get("Timestamp", 0.0) < ACCOUNT_CACHE_TTL_SECONDS:
+                return snapshot
+        except (ClientError, ValueError) as error:
+            LOGGER.info(f"Unable to load account inventory from s3://{ACCOUNT_CACHE_S3_BUCKET}/{ACCOUNT_CACHE_S3_KEY}: {error}")
+    return {}
+
+
+def save_account_inventory(snapshot: dict) -> None:
+    """Persist the account inventory snapshot to the configured local cache file and S3 cache object.
+
+    Args:
+        snapshot: Account inventory snapshot. {'Timestamp': 0.0, 'Accounts': []}
+    """
+    body = json.dumps(snapshot, default=str)
+    if ACCOUNT_CACHE_FILE:
+        try:
+            with open(ACCOUNT_CACHE_FILE, "w") as cache_file:
+                cache_file.write(body)
+        except OSError as error:
+            LOGGER.info(f"Unable to save account inventory to {ACCOUNT_CACHE_FILE}: {error}")
+    if ACCOUNT_CACHE_S3_BUCKET:
+        try:
+            MANAGEMENT_ACCOUNT_SESSION.client("s3").put_object(Bucket=ACCOUNT_CACHE_S3_BUCKET, Key=ACCOUNT_CACHE_S3_KEY, Body=body.encode())
+        except ClientError as error:
+            LOGGER.info(f"Unable to save account inventory to s3://{ACCOUNT_CACHE_S3_BUCKET}/{ACCOUNT_CACHE_S3_KEY}: {error}")
+
+
+def get_account_inventory(force_refresh: bool = False) -> list:
+    """Get the AWS Organization account inventory, listing the accounts only when the cached snapshot is stale.
+
+    Args:
+        force_refresh: Ignore the cached snapshot and list the accounts again. Defaults to False.
+
+    Returns:
+        List of account records. {'Id': '', 'Arn': '', 'Email': '', 'Name': '', 'Status': '', 'JoinedMethod': ''}
+    """
+    if not force_refresh:
+        if time() - ACCOUNT_INVENTORY["Timestamp"] < ACCOUNT_CACHE_TTL_SECONDS:
+            return ACCOUNT_INVENTORY["Accounts"]
+        snapshot = load_account_inventory()
+        if snapshot:
+            LOGGER.info("Using persisted account inventory snapshot")
+            ACCOUNT_INVENTORY.update(snapshot)
+            return ACCOUNT_INVENTORY["Accounts"]
+
+    snapshot = {"Timestamp": time(), "Accounts": list_organization_accounts()}
+    LOGGER.info(f"Refreshed account inventory with {len(snapshot['Accounts'])} accounts")
+    ACCOUNT_INVENTORY.update(snapshot)
+    save_account_inventory(snapshot)
+    return ACCOUNT_INVENTORY["Accounts"]
+
+
+def refresh_account_inventory(event: dict) -> None:
+    """Refresh the account inventory when an AWS Organizations or Control Tower account lifecycle event is received.
+
+    Args:
+        event: event data
+    """
+    if event.get("source") in ["aws.organizations", "aws.controltower"]:
+        LOGGER.info(f"Account lifecycle event received from {event['source']}, refreshing account inventory")
+        get_account_inventory(force_refresh=True)
 
 
 def get_active_organization_accounts(exclude_accounts: list = None) -> list:
@@ -89,13 +493,10 @@ def get_active_organization_accounts(exclude_accounts: list = None) -> list:
     if exclude_accounts is None:
         exclude_accounts = ["00000000000"]
     accounts: list[dict] = []
-    paginator = ORG_CLIENT.get_paginator("list_accounts")
 
-    for page in paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}):
-        for account in page["Accounts"]:
-            if account["Status"] == "ACTIVE" and account["Id"] not in exclude_accounts:
-                accounts.append({"AccountId": account["Id"], "Email": account["Email"]})
-        sleep(ORGANIZATIONS_THROTTLE_PERIOD)
+    for account in get_account_inventory():
+        if account["Status"] == "ACTIVE" and account["Id"] not in exclude_accounts:
+            accounts.append({"AccountId": account["Id"], "Email": account["Email"]})
 
     return accounts
 
@@ -112,6 +513,67 @@ def get_control_tower_regions() -> list:  # noqa: CCR001
     return list(customer_regions)
 
 
+def probe_region(sts_client: STSClient, region: str) -> str:
+    """Call STS in the region to classify it as enabled, disabled or invalid.
+
+    Args:
+        sts_client: Regional STS client
+        region: AWS region
+
+    Returns:
+        Region status. 'enabled', 'disabled', 'invalid' or 'error'
+    """
+    try:
+        sts_client.get_caller_identity()
+        return "enabled"
+    except EndpointConnectionError:
+        LOGGER.error(f"Region: ({region}) is not valid or could not be reached")
+        return "invalid"
+    except ClientError as error:
+        LOGGER.error(f"Error {error.response['Error']} occurred testing region {region}")
+        if error.response["Error"]["Code"] == "InvalidClientTokenId":
+            return "disabled"
+    except Exception:
+        LOGGER.exception("Unexpected!")
+    return "error"
+
+
+def get_region_statuses(region_list: list) -> dict:
+    """Probe the regions concurrently, reusing memoized results that are still within REGION_PROBE_CACHE_TTL_SECONDS.
+
+    Only definitive results are memoized. Connection failures can be transient, so 'invalid' and 'error' regions are probed again on the next call.
+
+    Args:
+        region_list: AWS regions
+
+    Returns:
+        Region status by region name
+    """
+    region_statuses = {}
+    regions_to_probe = []
+    for region in region_list:
+        cached = REGION_PROBE_CACHE.get(region)
+        if cached and time() - cached["Timestamp"] < REGION_PROBE_CACHE_TTL_SECONDS:
+            region_statuses[region] = cached["Status"]
+        elif region not in regions_to_probe:
+            regions_to_probe.append(region)
+
+    if regions_to_probe:
+        region_session = boto3.Session()
+        # Clients are created up front since boto3 sessions are not thread safe, but the clients are.
+        sts_clients = [
+            region_session.client("sts", endpoint_url=f"https://sts.{region}.amazonaws.com", region_name=region, config=REGION_PROBE_CONFIG)
+            for region in regions_to_probe
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(REGION_PROBE_MAX_WORKERS, len(regions_to_probe)))) as executor:
+            for region, status in zip(regions_to_probe, executor.map(probe_region, sts_clients, regions_to_probe)):
+                region_statuses[region] = status
+                if status in REGION_PROBE_CACHED_STATUSES:
+                    REGION_PROBE_CACHE[region] = {"Status": status, "Timestamp": time()}
+
+    return region_statuses
+
+
 def get_enabled_regions(customer_regions: str, control_tower_regions_only: bool = False) -> list:  # noqa: CCR001, C901 # NOSONAR
     """Query STS to identify enabled regions.
 
@@ -137,28 +599,10 @@ def get_enabled_regions(customer_regions: str, control_tower_regions_only: bool
         LOGGER.info({"Default_Available_Regions": default_available_regions})
         region_list = default_available_regions
 
-    region_session = boto3.Session()
-    enabled_regions = []
-    disabled_regions = []
-    invalid_regions = []
-    for region in region_list:
-        try:
-            sts_client = region_session.client(
-                "sts",
-                endpoint_url=f"https://sts.{region}.amazonaws.com",
-                region_name=region,
-            )
-            sts_client.get_caller_identity()
-            enabled_regions.append(region)
-        except EndpointConnectionError:
-            invalid_regions.append(region)
-            LOGGER.error(f"Region: ({region}) is not valid")
-        except ClientError as error:
-            if error.response["Error"]["Code"] == "InvalidClientTokenId":
-                disabled_regions.append(region)
-            LOGGER.error(f"Error {error.response['Error']} occurred testing region {region}")
-        except Exception:
-            LOGGER.exception("Unexpected!")
+    region_statuses = get_region_statuses(region_list)
+    enabled_regions = [region for region in region_list if region_statuses.get(region) == "enabled"]
+    disabled_regions = [region for region in region_list if region_statuses.get(region) == "disabled"]
+    invalid_regions = [region for region in region_list if region_statuses.get(region) == "invalid"]
 
     LOGGER.info(
         {
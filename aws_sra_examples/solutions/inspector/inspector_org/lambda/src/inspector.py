@@ -36,9 +36,11 @@ LOGGER.setLevel(log_level)
 
 
 UNEXPECTED = "Unexpected!"
-INSPECTOR_THROTTLE_PERIOD = 0.2
 ENABLE_RETRY_ATTEMPTS = 10
 ENABLE_RETRY_SLEEP_INTERVAL = 10
+READINESS_TIMEOUT_SECONDS = int(os.environ.get("READINESS_TIMEOUT_SECONDS", "120"))
+TRANSITIONAL_STATUSES = ["ENABLING", "DISABLING", "SUSPENDING"]
+ACCOUNT_STATUS_BATCH_SIZE = 10  # Max accountIds for batch_get_account_status
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
@@ -59,11 +61,11 @@ def is_admin_account_enabled(inspector_client: Inspector2Client, admin_account_i
         True or False
     """
     paginator: ListDelegatedAdminAccountsPaginator = inspector_client.get_paginator("list_delegated_admin_accounts")
-    for page in paginator.paginate():
+    limiter = common.get_rate_limiter("inspector2", region=inspector_client.meta.region_name)
+    for page in common.rate_limited_pages(paginator.paginate(), limiter):
         for admin_account in page["delegatedAdminAccounts"]:
             if admin_account["accountId"] == admin_account_id and admin_account["status"] == "ENABLED":
                 return True
-        sleep(INSPECTOR_THROTTLE_PERIOD)
     return False
 
 
@@ -74,16 +76,15 @@ def disable_organization_admin_account(regions: list) -> None:
         regions: AWS Region List
     """
     for region in regions:
-        inspector_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client("inspector2", region)
+        inspector_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client("inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
         paginator: ListDelegatedAdminAccountsPaginator = inspector_client.get_paginator("list_delegated_admin_accounts")
-        for page in paginator.paginate():
+        for page in common.rate_limited_pages(paginator.paginate(), common.get_rate_limiter("inspector2", region=region)):
             for admin_account in page["delegatedAdminAccounts"]:
                 if admin_account["status"] == "ENABLED":
                     response = inspector_client.disable_delegated_admin_account(delegatedAdminAccountId=admin_account["accountId"])
                     api_call_details = {"API_Call": "inspector2:DisableDelegatedAdminAccount", "API_Response": response}
                     LOGGER.info(api_call_details)
                     LOGGER.info(f"Admin Account {admin_account['accountId']} Disabled in {region}")
-            sleep(INSPECTOR_THROTTLE_PERIOD)
 
 
 def disable_inspector_in_associated_member_accounts(
@@ -102,7 +103,7 @@ def disable_inspector_in_associated_member_accounts(
     LOGGER.info(f"creating session to disassociate members role name: {configuration_role_name} account id {delegated_admin_account_id}")
     org_response = ORG_CLIENT.list_accounts()
     for region in regions:
-        inspector2_delegated_admin_client: Inspector2Client = account_session.client("inspector2", region)
+        inspector2_delegated_admin_client: Inspector2Client = account_session.client("inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
         for acct in org_response["Accounts"]:
             if lookup_associated_accounts(inspector2_delegated_admin_client, acct["Id"]) is True:
                 LOGGER.info(acct["Id"] + ", " + acct["Name"] + ", MEMBER")
@@ -196,7 +197,7 @@ def set_inspector_delegated_admin_in_mgmt(admin_account_id: str, region: str) ->
     Raises:
         Exception: inspector2_client.exceptions.ConflictException or e Error
     """
-    inspector2_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client("inspector2", region)
+    inspector2_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client("inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
     if not is_admin_account_enabled(inspector2_client, admin_account_id):
         try:
             delegated_admin_response = inspector2_client.enable_delegated_admin_account(delegatedAdminAccountId=admin_account_id)
@@ -210,6 +211,65 @@ def set_inspector_delegated_admin_in_mgmt(admin_account_id: str, region: str) ->
             raise
 
 
+def wait_for_delegated_admin(admin_account_id: str, region: str) -> bool:
+    """Wait until the delegated admin account is enabled for inspector in the given region.
+
+    Args:
+        admin_account_id: Admin account ID
+        region: AWS Region
+
+    Returns:
+        True if the delegated admin account is enabled, False if it did not become enabled in time
+    """
+    inspector2_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client("inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
+    return common.wait_until(
+        lambda: is_admin_account_enabled(inspector2_client, admin_account_id), f"Inspector delegated admin in {region}", READINESS_TIMEOUT_SECONDS
+    )
+
+
+def account_statuses_settled(inspector2_client: Inspector2Client, account_ids: list) -> bool:
+    """Check that inspector and its scan components are not transitioning in any of the accounts.
+
+    Args:
+        inspector2_client: Inspector2 client
+        account_ids: list of account Ids
+
+    Returns:
+        True or False
+    """
+    for i in range(0, len(account_ids), ACCOUNT_STATUS_BATCH_SIZE):
+        inspector_status_response = inspector2_client.batch_get_account_status(accountIds=account_ids[i : i + ACCOUNT_STATUS_BATCH_SIZE])
+        for status in inspector_status_response["accounts"]:
+            statuses = [status["state"]["status"]] + [resource["status"] for resource in status["resourceState"].values()]  # type: ignore
+            if any(resource_status in TRANSITIONAL_STATUSES for resource_status in statuses):
+                LOGGER.info(f"Inspector status in {status['accountId']} is still transitioning ({statuses})")
+                return False
+    return True
+
+
+def wait_for_account_statuses(configuration_role_name: str, delegated_admin_account_id: str, account_ids: list, region: str) -> bool:
+    """Wait until inspector enablement has settled in all of the accounts in the given region.
+
+    Args:
+        configuration_role_name: configuration role name
+        delegated_admin_account_id: delegated admin account Id
+        account_ids: list of account Ids
+        region: AWS region
+
+    Returns:
+        True if all accounts settled, False if some were still transitioning when the wait ended
+    """
+    delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
+    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
+    return common.wait_until(
+        lambda: account_statuses_settled(inspector_delegated_admin_region_client, account_ids),
+        f"Inspector account status in {region}",
+        READINESS_TIMEOUT_SECONDS,
+    )
+
+
 def disable_inspector2(inspector2_client: Inspector2Client, account_id: str, scan_components: list) -> DisableResponseTypeDef:
     """Disable inspector for the given account.
 
@@ -273,7 +333,9 @@ def disable_auto_scanning_in_org(delegated_admin_account_id: str, configuration_
     delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
     LOGGER.info(f"open session {configuration_role_name} and account id {delegated_admin_account_id} to disable auto-enablement of inspector in org")
     for region in regions:
-        inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+        inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+            "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+        )
         if check_inspector_org_auto_enabled(inspector_delegated_admin_region_client) > 0:
             LOGGER.info(f"disabling inspector scanning auto-enable in region {region}")
             update_organization_configuration_response = inspector_delegated_admin_region_client.update_organization_configuration(
@@ -338,7 +400,9 @@ def check_scan_component_enablement_for_accounts(
     LOGGER.info(f"check_scan_component_enablement_for_accounts: disabled components - ({disabled_components})")
     delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
     LOGGER.info(f"creating delegated admin session with ({configuration_role_name}) and account ({delegated_admin_account_id}) to disable inspector")
-    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
 
     for account in all_accounts:
         check_for_updates_to_scan_components(inspector_delegated_admin_region_client, account, disabled_components)
@@ -390,11 +454,15 @@ def enable_inspector2_in_mgmt_and_delegated_admin(
     LOGGER.info(f"enable_inspector2_in_mgmt_and_delegated_admin: scan_components - ({scan_components})")
     delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
     LOGGER.info(f"creating delegated admin session with ({configuration_role_name}) and account ({delegated_admin_account_id}) to enable inspector")
-    inspector_management_region_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client("inspector2", region)
+    inspector_management_region_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
     LOGGER.info(f"client region: {inspector_management_region_client.meta.region_name}")
     LOGGER.info(f"enabling inspector in the management account ({mgmt_account_id}) in {region}...")
     enable_inspector2(inspector_management_region_client, mgmt_account_id, region, scan_components)
-    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
     LOGGER.info(f"enabling inspector in the delegated admin account ({delegated_admin_account_id}) in {region}...")
     enable_inspector2(inspector_delegated_admin_region_client, delegated_admin_account_id, region, scan_components)
 
@@ -414,7 +482,9 @@ def enable_inspector2_in_member_accounts(
     LOGGER.info(f"enable_inspector2_in_member_accounts: scan_components - ({scan_components})")
     delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
     LOGGER.info(f"creating delegated admin session with ({configuration_role_name}) and account ({delegated_admin_account_id}) to enable inspector")
-    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
     for account in accounts:
         LOGGER.info(f"enabling inspector in the member account ({account['AccountId']}) in {region}...")
         enable_inspector2(inspector_delegated_admin_region_client, account["AccountId"], region, scan_components)
@@ -438,7 +508,9 @@ def set_ecr_scan_duration(
     LOGGER.info(
         f"creating delegated admin session with ({configuration_role_name}) in account ({delegated_admin_account_id}) to set ecr scan duration"
     )
-    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
     LOGGER.info(f"Setting ECR scan duration in delegated admin account to {ecr_scan_duration} in {region}")
     LOGGER.info(f"delegated admin client region: {inspector_delegated_admin_region_client.meta.region_name}")
     LOGGER.info(f"Region: {delegated_admin_session.region_name}")
@@ -468,14 +540,18 @@ def disable_inspector2_in_mgmt_and_delegated_admin(
     delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
     LOGGER.info(f"creating delegated admin session with ({configuration_role_name}) and account ({delegated_admin_account_id}) to disable inspector")
     for region in regions:
-        inspector_management_region_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client("inspector2", region)
+        inspector_management_region_client: Inspector2Client = MANAGEMENT_ACCOUNT_SESSION.client(
+            "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+        )
         if get_inspector_status(inspector_management_region_client, mgmt_account_id, scan_components) != "disabled":
             LOGGER.info(f"disabling inspector in the management account in {region}...")
             disable_inspector2_response = disable_inspector2(inspector_management_region_client, mgmt_account_id, scan_components)
             LOGGER.info(disable_inspector2_response)
         else:
             LOGGER.info(f"inspector is already disabled in the management account in {region}")
-        inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+        inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+            "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+        )
         if get_inspector_status(inspector_delegated_admin_region_client, delegated_admin_account_id, scan_components) != "disabled":
             LOGGER.info(f"disabling inspector in the delegated admin account in {region}...")
             disable_inspector2_response = disable_inspector2(inspector_delegated_admin_region_client, delegated_admin_account_id, scan_components)
@@ -503,7 +579,9 @@ def set_auto_enable_inspector_in_org(
     LOGGER.info(f"set_auto_enable_inspector_in_org: scan_component_dict - ({scan_component_dict})")
     delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
     LOGGER.info(f"open session {configuration_role_name} and account id {delegated_admin_account_id} to set auto-enablement of inspector in org")
-    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
 
     if check_inspector_org_auto_enabled(inspector_delegated_admin_region_client) != enabled_component_count:
         LOGGER.info(f"configuring auto-enable inspector via update_organization_configuration in region {region}")
@@ -551,7 +629,9 @@ def associate_inspector_member_accounts(configuration_role_name: str, delegated_
     """
     delegated_admin_session = common.assume_role(configuration_role_name, "sra-enable-inspector", delegated_admin_account_id)
     LOGGER.info(f"open session {configuration_role_name} and account id {delegated_admin_account_id} to set auto-enablement of inspector in org")
-    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client("inspector2", region)
+    inspector_delegated_admin_region_client: Inspector2Client = delegated_admin_session.client(
+        "inspector2", region, config=common.RATE_LIMITED_BOTO3_CONFIG
+    )
 
     for account in accounts:
         if lookup_associated_accounts(inspector_delegated_admin_region_client, account["AccountId"]) is True:
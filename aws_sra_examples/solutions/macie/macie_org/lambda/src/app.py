@@ -209,6 +209,7 @@ def lambda_handler(event: Dict[str, Any], context: Context) -> None:
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
+        common.refresh_account_inventory(event)
         if "Records" not in event and "RequestType" not in event and ("source" not in event and event["source"] != "aws.controltower"):
             raise ValueError(
                 f"The event did not include Records, RequestType, or source. Review CloudWatch logs '{context.log_group_name}' for details."
@@ -217,6 +218,7 @@ def lambda_handler(event: Dict[str, Any], context: Context) -> None:
             process_sns_records(event["Records"])
         elif "RequestType" in event:
             helper(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs '{context.log_group_name}' for details.") from None
@@ -236,6 +238,7 @@ def terraform_handler(event: Dict[str, Any], context: Context) -> None:
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
+        common.refresh_account_inventory(event)
         if "Records" not in event and "RequestType" not in event and ("source" not in event and event["source"] != "aws.controltower"):
             raise ValueError(
                 f"The event did not include Records, RequestType, or source. Review CloudWatch logs '{context.log_group_name}' for details."
@@ -244,6 +247,7 @@ def terraform_handler(event: Dict[str, Any], context: Context) -> None:
             process_sns_records(event["Records"])
         elif "RequestType" in event:
             process_cloudformation_event(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs '{context.log_group_name}' for details.") from None
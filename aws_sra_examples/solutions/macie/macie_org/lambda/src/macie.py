@@ -11,8 +11,9 @@ from __future__ import annotations
 
 import json
 import logging
+from itertools import islice
 from time import sleep
-from typing import TYPE_CHECKING, Literal, Union
+from typing import TYPE_CHECKING, Iterator, Literal, Union
 
 import boto3
 import common
@@ -32,6 +33,7 @@ LOGGER = logging.getLogger("sra")
 SERVICE_NAME = "macie.amazonaws.com"
 SLEEP_SECONDS = 30
 UNEXPECTED = "Unexpected!"
+LIST_MEMBERS_PAGE_SIZE = 25  # Max results per list_members call
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 
 try:
@@ -225,16 +227,7 @@ def disable_macie(macie2_client: Macie2Client, account_id: str, region: str, is_
         is_delegated_admin: Is Delegated Admin Account
     """
     if is_delegated_admin:
-        account_ids = get_associated_members(macie2_client)
-        LOGGER.info(f"Account IDs: {account_ids}")
-
-        if account_ids:
-            for account_id in account_ids:
-                macie2_client.disassociate_member(id=account_id)
-                LOGGER.info(f"Macie disassociated in {account_id} and {region}")
-
-                macie2_client.delete_member(id=account_id)
-                LOGGER.info(f"Macie members deleted in {account_id} and {region}")
+        delete_members(macie2_client, region)
 
     try:
         LOGGER.info(f"Disabling Macie in {account_id} {region}")
@@ -264,27 +257,54 @@ def disable_member_account(account_id: str, disable_macie_role_name: str, region
     return {"AccountId": account_id}
 
 
-def get_associated_members(macie2_client: Macie2Client) -> list:
-    """Get associated Macie members.
+def delete_members(macie2_client: Macie2Client, region: str) -> None:
+    """Disassociate and delete the Macie members.
+
+    Members are read from the first list_members page, and the listing starts again from the first page after they are
+    deleted, since deleting members shifts the pages. Only one page is held at a time, and members that join while the
+    others are deleted are picked up by the next listing.
 
     Args:
         macie2_client: Macie2Client
+        region: AWS Region
 
-    Returns:
-        account_ids
+    Raises:
+        ValueError: The same Macie members are listed again after they were deleted
+    """
+    previous_account_ids: list = []
+    while True:
+        account_ids = list(islice(get_associated_members(macie2_client), LIST_MEMBERS_PAGE_SIZE))
+        if not account_ids:
+            return
+        if account_ids == previous_account_ids:
+            raise ValueError(f"{len(account_ids)} Macie member(s) remain in {region} after they were deleted: {account_ids}")
+        for account_id in account_ids:
+            macie2_client.disassociate_member(id=account_id)
+            LOGGER.info(f"Macie disassociated in {account_id} and {region}")
+
+            macie2_client.delete_member(id=account_id)
+            LOGGER.info(f"Macie members deleted in {account_id} and {region}")
+        previous_account_ids = account_ids
+
+
+def get_associated_members(macie2_client: Macie2Client) -> Iterator[str]:
+    """Get associated Macie members, yielding each account ID as the pages are listed.
+
+    Args:
+        macie2_client: Macie2Client
+
+    Yields:
+        Account ID
     """
-    account_ids = []
     try:
         paginator = macie2_client.get_paginator("list_members")
 
-        for page in paginator.paginate(onlyAssociated="false"):
+        for page in paginator.paginate(onlyAssociated="false", PaginationConfig={"PageSize": LIST_MEMBERS_PAGE_SIZE}):
             for member in page["members"]:
-                account_ids.append(member["accountId"])
+                yield member["accountId"]
     except macie2_client.exceptions.AccessDeniedException:
         LOGGER.debug("Macie is not enabled.")
 
-    return account_ids
-
 
 def deregister_delegated_administrator(delegated_admin_account_id: str, service_principal: str = SERVICE_NAME) -> None:
     """Deregister the delegated administrator account for the provided service principal within AWS Organizations.
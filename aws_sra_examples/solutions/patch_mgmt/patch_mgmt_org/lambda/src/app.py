@@ -937,6 +937,7 @@ def lambda_handler(event: Dict[str, Any], context: Context) -> None:
     LOGGER.info(event_info)
     try:
         orchestrator(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs ({context.log_group_name}) for details.") from None
@@ -12,7 +12,9 @@ from __future__ import annotations
 import json
 import logging
 import os
+import random
 import re
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import TYPE_CHECKING, Any, List, Optional, Union
 
@@ -39,16 +41,22 @@ LOGGER.setLevel(log_level)
 # Global Variables
 UNEXPECTED = "Unexpected!"
 ORGANIZATIONS_PAGE_SIZE = 20
-ORGANIZATIONS_THROTTLE_PERIOD = 0.2
 SNS_PUBLISH_BATCH_MAX = 10
+SNS_PUBLISH_MAX_WORKERS = int(os.environ.get("SNS_PUBLISH_MAX_WORKERS", "5"))
+SNS_PUBLISH_MAX_RETRY = 5
+SNS_PUBLISH_MAX_DELAY_SECONDS = 20
+SNS_MESSAGE_SHARD_GRANULARITY = os.environ.get("SNS_MESSAGE_SHARD_GRANULARITY", "account")
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
+# Clients paced by botocore's adaptive retry mode. Its client-side token bucket slows the client down when the service
+# throttles and speeds it back up on success, in place of a fixed sleep between calls.
+ADAPTIVE_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
 
 # Initialize the helper. `sleep_on_delete` allows time for the CloudWatch Logs to get captured.
 helper = CfnResource(json_logging=True, log_level=log_level, boto_level="CRITICAL", sleep_on_delete=120)
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
-    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=BOTO3_CONFIG)
+    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=ADAPTIVE_BOTO3_CONFIG)
     SNS_CLIENT: SNSClient = MANAGEMENT_ACCOUNT_SESSION.client("sns", config=BOTO3_CONFIG)
 except Exception as error:
     LOGGER.error({"Unexpected_Error": error})
@@ -98,7 +106,6 @@ def get_active_organization_accounts() -> list[AccountTypeDef]:
         for account in page["Accounts"]:
             if account["Status"] == "ACTIVE":
                 accounts.append(account)
-            sleep(ORGANIZATIONS_THROTTLE_PERIOD)
     return accounts
 
 
@@ -130,7 +137,6 @@ def get_organization_resource_tags(resource_id: str) -> List[TagTypeDef]:
     tags = []
     for page in paginator.paginate(ResourceId=resource_id):
         tags += page["Tags"]
-        sleep(ORGANIZATIONS_THROTTLE_PERIOD)
     return tags
 
 
@@ -225,32 +231,71 @@ def publish_sns_message(message: dict, subject: str, sns_topic_arn: str) -> None
 
 
 def publish_sns_message_batch(message_batch: list, sns_topic_arn: str) -> None:
-    """Publish SNS Message Batches.
+    """Publish SNS Message Batches, retrying only the entries that failed.
 
     Args:
         message_batch: Batch of SNS messages
         sns_topic_arn: SNS Topic ARN
+
+    Raises:
+        ValueError: SNS messages could not be published
     """
-    LOGGER.info("Publishing SNS Message Batch")
-    LOGGER.info({"SNSMessageBatch": message_batch})
-    response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=message_batch)
-    api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
-    LOGGER.info(api_call_details)
+    entries = message_batch
+    for attempt in range(1, SNS_PUBLISH_MAX_RETRY + 1):
+        LOGGER.info("Publishing SNS Message Batch")
+        LOGGER.info({"SNSMessageBatch": entries})
+        response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=entries)
+        api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
+        LOGGER.info(api_call_details)
+
+        failed_entries = response.get("Failed", [])
+        sender_faults = [failed for failed in failed_entries if failed.get("SenderFault")]
+        if sender_faults:
+            raise ValueError(f"SNS rejected {len(sender_faults)} message(s): {sender_faults}")
+        failed_ids = {failed["Id"] for failed in failed_entries}
+        entries = [entry for entry in entries if entry["Id"] in failed_ids]
+        if not entries:
+            return
+        delay = random.uniform(0, min(SNS_PUBLISH_MAX_DELAY_SECONDS, 2**attempt))  # noqa: S311
+        LOGGER.info(f"Retrying {len(entries)} failed SNS message(s) in {delay:.1f} seconds")
+        sleep(delay)
+    unpublished_ids = [entry["Id"] for entry in entries]
+    raise ValueError(f"Failed to publish {len(unpublished_ids)} SNS message(s) after {SNS_PUBLISH_MAX_RETRY} attempts: {unpublished_ids}")
 
 
 def process_sns_message_batches(sns_messages: list, sns_topic_arn: str) -> None:
-    """Process SNS Message Batches for Publishing.
+    """Process SNS Message Batches for Publishing, publishing the batches concurrently.
 
     Args:
         sns_messages: SNS messages to be batched.
         sns_topic_arn: SNS Topic ARN
     """
-    message_batches = []
-    for i in range(SNS_PUBLISH_BATCH_MAX, len(sns_messages) + SNS_PUBLISH_BATCH_MAX, SNS_PUBLISH_BATCH_MAX):
-        message_batches.append(sns_messages[i - SNS_PUBLISH_BATCH_MAX : i])
+    message_batches = [sns_messages[i : i + SNS_PUBLISH_BATCH_MAX] for i in range(0, len(sns_messages), SNS_PUBLISH_BATCH_MAX)]
+    if not message_batches:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(SNS_PUBLISH_MAX_WORKERS, len(message_batches))) as executor:
+        list(executor.map(lambda batch: publish_sns_message_batch(batch, sns_topic_arn), message_batches))
 
-    for batch in message_batches:
-        publish_sns_message_batch(batch, sns_topic_arn)
+
+def get_account_shards(account_ids: list, shard_granularity: str = SNS_MESSAGE_SHARD_GRANULARITY) -> list:
+    """Split the accounts into the shard covered by each SNS message.
+
+    Args:
+        account_ids: AWS Account IDs
+        shard_granularity: 'account' for one account per message, or the number of accounts per message.
+            Defaults to SNS_MESSAGE_SHARD_GRANULARITY.
+
+    Returns:
+        Account IDs for each message
+
+    Raises:
+        ValueError: Unsupported shard granularity
+    """
+    if shard_granularity != "account" and not shard_granularity.isdigit():
+        raise ValueError(f"Unsupported SNS_MESSAGE_SHARD_GRANULARITY '{shard_granularity}', expected 'account' or a number of accounts")
+    accounts_per_message = max(1, int(shard_granularity)) if shard_granularity.isdigit() else 1
+    return [account_ids[i : i + accounts_per_message] for i in range(0, len(account_ids), accounts_per_message)]
 
 
 def is_account_with_exclude_tags(aws_account: AccountTypeDef, params: dict) -> bool:
@@ -291,7 +336,7 @@ def process_accounts(event: Union[CloudFormationCustomResourceEvent, dict], para
         event: event data
         params: solution parameters
     """
-    sns_messages = []
+    account_ids = []
     accounts = get_active_organization_accounts()
     for account in accounts:
 
@@ -301,8 +346,14 @@ def process_accounts(event: Union[CloudFormationCustomResourceEvent, dict], para
         if event.get("local_testing") == "true" or event.get("ResourceProperties", {}).get("local_testing") == "true":  # type: ignore
             local_testing(account, params)
         else:
-            sns_message = {"Action": params["action"], "AccountId": account["Id"]}
-            sns_messages.append({"Id": account["Id"], "Message": json.dumps(sns_message), "Subject": "S3 Block Account Public Access"})
+            account_ids.append(account["Id"])
+
+    sns_messages = []
+    for index, shard_account_ids in enumerate(get_account_shards(account_ids)):
+        sns_message = {"Action": params["action"], "AccountIds": shard_account_ids}
+        sns_messages.append(
+            {"Id": f"{shard_account_ids[0]}-{index}", "Message": json.dumps(sns_message), "Subject": "S3 Block Account Public Access"}
+        )
 
     process_sns_message_batches(sns_messages, params["SNS_TOPIC_ARN"])
 
@@ -354,10 +405,11 @@ def process_event_sns(event: dict) -> None:
         message = record["Sns"]["Message"]
         params["action"] = message["Action"]
 
-        aws_account = get_account_info(account_id=message["AccountId"])
-        account_session = assume_role(params["CONFIGURATION_ROLE_NAME"], params["ROLE_SESSION_NAME"], aws_account["Id"])
-        s3_client: S3ControlClient = account_session.client("s3control", config=BOTO3_CONFIG)
-        process_put_account_public_access_block(s3_client, aws_account, params)
+        for account_id in message.get("AccountIds", [message.get("AccountId")]):
+            aws_account = get_account_info(account_id=account_id)
+            account_session = assume_role(params["CONFIGURATION_ROLE_NAME"], params["ROLE_SESSION_NAME"], aws_account["Id"])
+            s3_client: S3ControlClient = account_session.client("s3control", config=BOTO3_CONFIG)
+            process_put_account_public_access_block(s3_client, aws_account, params)
 
 
 def process_event_organizations(event: dict) -> None:
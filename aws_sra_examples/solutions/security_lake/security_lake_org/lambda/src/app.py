@@ -43,6 +43,8 @@ HOME_REGION = ssm.get_home_region()
 AUDIT_ACCT_ID = ssm.get_security_acct()
 AWS_LOG_SOURCES = ["ROUTE53", "VPC_FLOW", "SH_FINDINGS", "CLOUD_TRAIL_MGMT", "LAMBDA_EXECUTION", "S3_DATA", "EKS_AUDIT", "WAF"]
 CLOUDFORMATION_PAGE_SIZE = 20
+ENABLE_SECURITY_LAKE_REGION_STEPS = ["set_lake_formation_permissions", "encrypt_sqs_queues"]
+LOG_SOURCE_ACCOUNT_BATCH_SIZE = int(os.environ.get("LOG_SOURCE_ACCOUNT_BATCH_SIZE", "200"))
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
@@ -53,13 +55,14 @@ except Exception:
     raise ValueError("Unexpected error executing Lambda function. Review CloudWatch logs for details.") from None
 
 
-def process_add_event(params: dict, regions: list, accounts: dict) -> None:
+def process_add_event(params: dict, regions: list, accounts: dict, work_items: list = None) -> None:
     """Process Add or Update Events.
 
     Args:
         params: Configuration Parameters
         regions: AWS regions
         accounts: AWS accounts
+        work_items: Remaining work items when resuming a previous invocation. Defaults to None.
 
     Returns:
         Status
@@ -67,7 +70,9 @@ def process_add_event(params: dict, regions: list, accounts: dict) -> None:
     LOGGER.info("...process_add_event")
 
     if params["action"] in ["Add"]:
-        enable_and_configure_security_lake(params, regions, accounts)
+        if not enable_and_configure_security_lake(params, regions, accounts, work_items):
+            LOGGER.info("...ADD_CONTINUING")
+            return
         for region in regions:
             delegated_admin_session = common.assume_role(
                 params["CONFIGURATION_ROLE_NAME"], "sra-process-audit-acct-subscriber", params["DELEGATED_ADMIN_ACCOUNT_ID"]
@@ -147,6 +152,7 @@ def process_event(event: dict) -> None:
     """
     event_info = {"Event": event}
     LOGGER.info(event_info)
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({"RequestType": "Update"})
     accounts = common.get_active_organization_accounts()
     regions = common.get_enabled_regions(params["ENABLED_REGIONS"], params["CONTROL_TOWER_REGIONS_ONLY"] == "true")
@@ -271,43 +277,91 @@ def get_validated_parameters(event: dict[str, Any]) -> dict:
     return params
 
 
-def enable_and_configure_security_lake(params: dict, regions: list, accounts: dict) -> None:
+def enable_and_configure_security_lake(params: dict, regions: list, accounts: dict, work_items: list = None) -> bool:
     """Enable the security lake service and configure its global settings.
 
+    Security Lake is provisioned one region per work item and the log sources are added with one CreateAwsLogSource call per
+    region and batch of LOG_SOURCE_ACCOUNT_BATCH_SIZE accounts, so if the Lambda deadline approaches, the remaining work items
+    are continued in a new invocation.
+
     Args:
         params: Configuration Parameters
         regions: AWS regions
         accounts: AWS accounts
+        work_items: Remaining work items when resuming a previous invocation. Defaults to None.
+
+    Returns:
+        True if every work item ran, False if the remaining items are continuing in a new invocation
     """
-    security_lake.register_delegated_admin(params["DELEGATED_ADMIN_ACCOUNT_ID"], HOME_REGION, SERVICE_NAME)
-    provision_security_lake(params, regions)
-    add_log_sources(params, regions, accounts)
-    for region in regions:
-        key_id = f'alias/{params["KEY_ALIAS"]}-{region}'
-        security_lake.encrypt_sqs_queues(params["CONFIGURATION_ROLE_NAME"], params["DELEGATED_ADMIN_ACCOUNT_ID"], region, key_id)
+    org_accounts_ids = [account["AccountId"] for account in accounts]
+    if work_items is None:
+        delegated_admin_account_id = params["DELEGATED_ADMIN_ACCOUNT_ID"]
+        work_items = common.build_work_items([delegated_admin_account_id], [HOME_REGION], ["register_delegated_admin"])
+        work_items.extend(common.build_work_items([delegated_admin_account_id], regions, ["provision_security_lake"]))
+        work_items.extend(common.build_work_items([delegated_admin_account_id], [HOME_REGION], ["configure_org_configuration"]))
+        work_items.extend(get_log_source_work_items(get_log_source_accounts(params, org_accounts_ids), regions))
+        work_items.extend(common.build_work_items([delegated_admin_account_id], regions, ENABLE_SECURITY_LAKE_REGION_STEPS))
+
+    def run_work_item(work_item: dict) -> None:
+        if work_item["Step"] == "register_delegated_admin":
+            security_lake.register_delegated_admin(params["DELEGATED_ADMIN_ACCOUNT_ID"], HOME_REGION, SERVICE_NAME)
+        elif work_item["Step"] == "provision_security_lake":
+            provision_security_lake(params, work_item["Region"])
+        elif work_item["Step"] == "configure_org_configuration":
+            configure_org_configuration(params, regions)
+        elif work_item["Step"] == "add_log_sources":
+            add_log_sources(params, work_item["Region"], work_item["AccountIds"], org_accounts_ids)
+        elif work_item["Step"] == "set_lake_formation_permissions":
+            set_lake_formation_permissions(params, work_item["Region"])
+        else:
+            key_id = f'alias/{params["KEY_ALIAS"]}-{work_item["Region"]}'
+            security_lake.encrypt_sqs_queues(params["CONFIGURATION_ROLE_NAME"], params["DELEGATED_ADMIN_ACCOUNT_ID"], work_item["Region"], key_id)
+
+    return common.run_work_items(
+        work_items,
+        run_work_item,
+        lambda remaining_items: common.continue_with_lambda({"Action": "Add", "Params": params, "Regions": regions}, remaining_items),
+    )
 
 
-def provision_security_lake(params: dict, regions: list) -> None:
-    """Enable Security Lake and configure Organization Configurations.
+def provision_security_lake(params: dict, region: str) -> None:
+    """Enable Security Lake in the region.
 
     Args:
         params: parameters
-        regions: AWS regions
+        region: AWS region
     """
-    all_data = [{"region": region, "key_arn": f'alias/{params["KEY_ALIAS"]}-{region}'} for region in regions]
-    sl_configurations = [{"encryptionConfiguration": {"kmsKeyId": data["key_arn"]}, "region": data["region"]} for data in all_data]
     delegated_admin_session = common.assume_role(
         params["CONFIGURATION_ROLE_NAME"],
         "sra-create-data-lake",
         params["DELEGATED_ADMIN_ACCOUNT_ID"],
     )
-    sl_client = delegated_admin_session.client("securitylake", HOME_REGION)
-    LOGGER.info(f"Creating Security Lake in {(', '.join(regions))}")
+    sl_client = delegated_admin_session.client("securitylake", region)
+    if security_lake.check_data_lake_exists(sl_client, region):
+        LOGGER.info(f"Security Lake already enabled in {region} region.")
+        return
+    LOGGER.info(f"Creating Security Lake in {region}")
+    sl_configurations = [{"encryptionConfiguration": {"kmsKeyId": f'alias/{params["KEY_ALIAS"]}-{region}'}, "region": region}]
     role_arn = f"arn:{PARTITION}:iam::{params['DELEGATED_ADMIN_ACCOUNT_ID']}:role/service-role/{params['META_STORE_MANAGER_ROLE_NAME']}"
     security_lake.create_security_lake(sl_client, sl_configurations, role_arn)
-    status = security_lake.check_data_lake_create_status(sl_client, regions)
+    status = security_lake.check_data_lake_create_status(sl_client, [region])
     if status:
-        LOGGER.info("CreateDataLake status 'COMPLETED'")
+        LOGGER.info(f"CreateDataLake status 'COMPLETED' ({region})")
+
+
+def configure_org_configuration(params: dict, regions: list) -> None:
+    """Configure the Security Lake organization configuration once Security Lake is provisioned in every region.
+
+    Args:
+        params: parameters
+        regions: AWS regions
+    """
+    delegated_admin_session = common.assume_role(
+        params["CONFIGURATION_ROLE_NAME"],
+        "sra-create-data-lake",
+        params["DELEGATED_ADMIN_ACCOUNT_ID"],
+    )
+    sl_client = delegated_admin_session.client("securitylake", HOME_REGION)
     process_org_configuration(sl_client, params["SET_ORG_CONFIGURATION"], params["ORG_CONFIGURATION_SOURCES"], regions, params["SOURCE_VERSION"])
 
 
@@ -371,33 +425,82 @@ def process_org_configuration(
             LOGGER.info("Deleted Organization Configuration")
 
 
-def add_log_sources(params: dict, regions: list, org_accounts: dict) -> None:
-    """Configure aws log sources.
+def get_log_source_accounts(params: dict, org_accounts_ids: list) -> list:
+    """Get every account that at least one AWS log source is configured for.
 
     Args:
         params: Configuration parameters
-        regions: A list of AWS regions.
-        org_accounts: A list of AWS accounts.
+        org_accounts_ids: AWS account IDs in the organization
+
+    Returns:
+        AWS account IDs, in the order they are first configured
+    """
+    log_source_accounts: list = []
+    for log_source in AWS_LOG_SOURCES:
+        if params[log_source] != "":
+            accounts = params[log_source].split(",") if params[log_source] != "ALL" else org_accounts_ids
+            for account in accounts:
+                if account not in log_source_accounts:
+                    log_source_accounts.append(account)
+    return log_source_accounts
+
+
+def get_log_source_work_items(log_source_accounts: list, regions: list) -> list:
+    """Build the add_log_sources work items, one per region and batch of LOG_SOURCE_ACCOUNT_BATCH_SIZE accounts.
+
+    Args:
+        log_source_accounts: AWS account IDs that at least one AWS log source is configured for
+        regions: AWS regions
+
+    Returns:
+        Work items
+    """
+    return [
+        {"AccountIds": log_source_accounts[i : i + LOG_SOURCE_ACCOUNT_BATCH_SIZE], "Region": region, "Step": "add_log_sources"}
+        for region in regions
+        for i in range(0, len(log_source_accounts), LOG_SOURCE_ACCOUNT_BATCH_SIZE)
+    ]
+
+
+def add_log_sources(params: dict, region: str, account_ids: list, org_accounts_ids: list) -> None:
+    """Configure aws log sources for the accounts in the region with a single CreateAwsLogSource call.
+
+    Args:
+        params: Configuration parameters
+        region: AWS region
+        account_ids: AWS account IDs
+        org_accounts_ids: AWS account IDs in the organization
     """
     aws_log_sources = []
-    org_accounts_ids = [account["AccountId"] for account in org_accounts]
     delegated_admin_session = common.assume_role(params["CONFIGURATION_ROLE_NAME"], "sra-add-log-sources", params["DELEGATED_ADMIN_ACCOUNT_ID"])
     sl_client = delegated_admin_session.client("securitylake", HOME_REGION)
     for log_source in AWS_LOG_SOURCES:
         if params[log_source] != "":
             accounts = params[log_source].split(",") if params[log_source] != "ALL" else org_accounts_ids
-            configurations = {"accounts": accounts, "regions": regions, "sourceName": log_source, "sourceVersion": params["SOURCE_VERSION"]}
-            aws_log_sources.append(configurations)
+            source_accounts = [account_id for account_id in account_ids if account_id in accounts]
+            if source_accounts:
+                aws_log_sources.append(
+                    {"accounts": source_accounts, "regions": [region], "sourceName": log_source, "sourceVersion": params["SOURCE_VERSION"]}
+                )
     if aws_log_sources:
         security_lake.add_aws_log_source(sl_client, aws_log_sources)
-    for region in regions:
-        formatted_region = region.replace("-", "_")
-        lf_client = delegated_admin_session.client("lakeformation", region)
-        principal_identifier = (
-            f"arn:{PARTITION}:iam::{params['DELEGATED_ADMIN_ACCOUNT_ID']}:role/aws-service-role/{RESOURCE_MGMT_SERVICE_NAME}/{SLR_NAME}"
-        )
-        db_name = f"amazon_security_lake_glue_db_{formatted_region}"
-        security_lake.set_lake_formation_permissions_for_slr(lf_client, params["DELEGATED_ADMIN_ACCOUNT_ID"], principal_identifier, db_name)
+
+
+def set_lake_formation_permissions(params: dict, region: str) -> None:
+    """Grant the Security Lake resource management service-linked role Lake Formation permissions on the region's Glue database.
+
+    Args:
+        params: Configuration parameters
+        region: AWS region
+    """
+    delegated_admin_session = common.assume_role(params["CONFIGURATION_ROLE_NAME"], "sra-add-log-sources", params["DELEGATED_ADMIN_ACCOUNT_ID"])
+    formatted_region = region.replace("-", "_")
+    lf_client = delegated_admin_session.client("lakeformation", region)
+    principal_identifier = (
+        f"arn:{PARTITION}:iam::{params['DELEGATED_ADMIN_ACCOUNT_ID']}:role/aws-service-role/{RESOURCE_MGMT_SERVICE_NAME}/{SLR_NAME}"
+    )
+    db_name = f"amazon_security_lake_glue_db_{formatted_region}"
+    security_lake.set_lake_formation_permissions_for_slr(lf_client, params["DELEGATED_ADMIN_ACCOUNT_ID"], principal_identifier, db_name)
 
 
 def update_log_sources(params: dict, regions: list, org_accounts: dict) -> None:
@@ -642,6 +745,11 @@ def orchestrator(event: dict[str, Any], context: Any) -> None:
     if event.get("RequestType"):
         LOGGER.info("...calling helper...")
         helper(event, context)
+    elif event.get(common.WORK_CURSOR_KEY):
+        LOGGER.info("...resuming from work cursor...")
+        cursor = common.load_work_cursor(event[common.WORK_CURSOR_KEY])
+        process_add_event(cursor["Params"], cursor["Regions"], common.get_active_organization_accounts(), cursor["WorkItems"])
+        common.delete_work_cursor(event[common.WORK_CURSOR_KEY])
     else:
         LOGGER.info("...else...just calling process_event...")
         process_event(event)
@@ -658,10 +766,12 @@ def lambda_handler(event: dict[str, Any], context: Any) -> None:
         ValueError: Unexpected error executing Lambda function
     """
     LOGGER.info("....Lambda Handler Started....")
+    common.set_lambda_context(context)
     boto3_version = boto3.__version__
     LOGGER.info(f"boto3 version: {boto3_version}")
     try:
         orchestrator(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs ({context.log_group_name}) for details.") from None
@@ -8,13 +8,19 @@ SPDX-License-Identifier: MIT-0
 """
 from __future__ import annotations
 
+import json
 import logging
 import os
-from time import sleep
-from typing import TYPE_CHECKING
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, Callable
 
 import boto3
+from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError, EndpointConnectionError
+from botocore.session import get_session
 
 if TYPE_CHECKING:
     from mypy_boto3_organizations import OrganizationsClient
@@ -28,17 +34,124 @@ LOGGER.setLevel(log_level)
 
 # Global variables
 ORGANIZATIONS_PAGE_SIZE = 20
-ORGANIZATIONS_THROTTLE_PERIOD = 0.2
+
+# Region probe settings. Probe results are memoized per region for the life of a warm container.
+REGION_PROBE_MAX_WORKERS = int(os.environ.get("REGION_PROBE_MAX_WORKERS", "10"))
+REGION_PROBE_TIMEOUT_SECONDS = int(os.environ.get("REGION_PROBE_TIMEOUT_SECONDS", "5"))
+REGION_PROBE_CACHE_TTL_SECONDS = int(os.environ.get("REGION_PROBE_CACHE_TTL_SECONDS", "3600"))
+REGION_PROBE_CONFIG = Config(
+    connect_timeout=REGION_PROBE_TIMEOUT_SECONDS, read_timeout=REGION_PROBE_TIMEOUT_SECONDS, retries={"max_attempts": 2, "mode": "standard"}
+)
+REGION_PROBE_CACHE: dict = {}
+REGION_PROBE_CACHED_STATUSES = ["enabled", "disabled"]
+
+# Assumed role session cache. Sessions are keyed by (account, role, partition, role session name) and their credentials are
+# refreshed automatically by botocore before they expire.
+CALLER_ARN_CACHE: dict = {}
+ROLE_SESSION_CACHE: dict = {}
+ROLE_SESSION_CACHE_STATS = {"Hits": 0, "Misses": 0}
+ROLE_SESSION_LOCKS: dict = {}
+ROLE_SESSION_LOCK = threading.Lock()
+
+# Lambda deadline settings. Work is handed to a new invocation before the remaining execution time runs out.
+WAITER_DEADLINE_MARGIN_SECONDS = int(os.environ.get("WAITER_DEADLINE_MARGIN_SECONDS", "30"))
+LAMBDA_CONTEXT: dict = {"Context": None}
+
+# Work cursor settings. Long fan-outs hand their remaining work items to a new invocation before the Lambda deadline.
+CHECKPOINT_MARGIN_SECONDS = int(os.environ.get("CHECKPOINT_MARGIN_SECONDS", "60"))
+WORK_CURSOR_KEY = "SraWorkCursor"
+WORK_CURSOR_S3_BUCKET = os.environ.get("WORK_CURSOR_S3_BUCKET", "")
+WORK_CURSOR_S3_PREFIX = os.environ.get("WORK_CURSOR_S3_PREFIX", "sra/work_cursors/")
+
+# Organization account inventory cache. The snapshot is kept in memory for the life of a warm container and
+# optionally persisted to a local file and/or S3 object so concurrent workers can share it.
+ACCOUNT_CACHE_TTL_SECONDS = int(os.environ.get("ACCOUNT_CACHE_TTL_SECONDS", "900"))
+ACCOUNT_CACHE_FILE = os.environ.get("ACCOUNT_CACHE_FILE", "")
+ACCOUNT_CACHE_S3_BUCKET = os.environ.get("ACCOUNT_CACHE_S3_BUCKET", "")
+ACCOUNT_CACHE_S3_KEY = os.environ.get("ACCOUNT_CACHE_S3_KEY", "sra/organization-accounts.json")
+ACCOUNT_INVENTORY_FIELDS = ["Id", "Arn", "Email", "Name", "Status", "JoinedMethod"]
+ACCOUNT_INVENTORY: dict = {"Timestamp": 0.0, "Accounts": []}
+
+# Clients paced by botocore's adaptive retry mode. Its client-side token bucket slows the client down when the service
+# throttles and speeds it back up on success, in place of a fixed sleep between calls.
+ADAPTIVE_BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
 
 try:
     MANAGEMENT_ACCOUNT_SESSION = boto3.Session()
-    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations")
+    ORG_CLIENT: OrganizationsClient = MANAGEMENT_ACCOUNT_SESSION.client("organizations", config=ADAPTIVE_BOTO3_CONFIG)
     SSM_CLIENT: SSMClient = MANAGEMENT_ACCOUNT_SESSION.client("ssm")
 except Exception as error:
     LOGGER.error({"Unexpected_Error": error})
     raise ValueError("Unexpected error executing Lambda function. Review CloudWatch logs for details.") from None
 
 
+def get_caller_arn(session: boto3.Session, sts_client: STSClient) -> str:
+    """Get the caller identity ARN for the session, calling STS only once per set of credentials.
+
+    Args:
+        session: Boto3 session
+        sts_client: STS client created from the session
+
+    Returns:
+        Caller identity ARN
+    """
+    access_key = session.get_credentials().access_key
+    if access_key not in CALLER_ARN_CACHE:
+        CALLER_ARN_CACHE[access_key] = sts_client.get_caller_identity()["Arn"]
+        LOGGER.info(f"USER: {CALLER_ARN_CACHE[access_key]}")
+    return CALLER_ARN_CACHE[access_key]
+
+
+def get_role_session(sts_client: STSClient, role_arn: str, role_session_name: str, cache_key: tuple) -> boto3.Session:
+    """Get a cached session for the role, assuming it only when no session exists for the cache key.
+
+    Args:
+        sts_client: STS client used to assume the role and refresh the credentials
+        role_arn: Role ARN to assume
+        role_session_name: Identifier for the assumed role session
+        cache_key: (account, role, partition, role session name)
+
+    Returns:
+        Session object with auto-refreshing credentials for the role
+    """
+    with ROLE_SESSION_LOCK:
+        key_lock = ROLE_SESSION_LOCKS.setdefault(cache_key, threading.Lock())
+
+    with key_lock:
+        if cache_key in ROLE_SESSION_CACHE:
+            ROLE_SESSION_CACHE_STATS["Hits"] += 1
+            return ROLE_SESSION_CACHE[cache_key]
+        ROLE_SESSION_CACHE_STATS["Misses"] += 1
+
+        def refresh_credentials() -> dict:
+            response = sts_client.assume_role(RoleArn=role_arn, RoleSessionName=role_session_name)
+            LOGGER.info(f"ASSUMED ROLE: {response['AssumedRoleUser']['Arn']}")
+            return {
+                "access_key": response["Credentials"]["AccessKeyId"],
+                "secret_key": response["Credentials"]["SecretAccessKey"],
+                "token": response["Credentials"]["SessionToken"],
+                "expiry_time": response["Credentials"]["Expiration"].isoformat(),
+            }
+
+        credentials = RefreshableCredentials.create_from_metadata(
+            metadata=refresh_credentials(), refresh_using=refresh_credentials, method="sts-assume-role"
+        )
+        botocore_session = get_session()
+        # botocore has no public setter for refreshable credentials; set_credentials only accepts static keys.
+        botocore_session._credentials = credentials
+        ROLE_SESSION_CACHE[cache_key] = boto3.Session(botocore_session=botocore_session)
+        return ROLE_SESSION_CACHE[cache_key]
+
+
+def get_role_session_cache_stats() -> dict:
+    """Get the assumed role session cache statistics.
+
+    Returns:
+        Cache hits, misses and number of cached sessions
+    """
+    return {**ROLE_SESSION_CACHE_STATS, "Sessions": len(ROLE_SESSION_CACHE)}
+
+
 def assume_role(
     role: str,
     role_session_name: str,
@@ -59,20 +172,250 @@ def assume_role(
     if not session:
         session = boto3.Session()
     sts_client: STSClient = session.client("sts")
-    sts_arn = sts_client.get_caller_identity()["Arn"]
-    LOGGER.info(f"USER: {sts_arn}")
+    sts_arn = get_caller_arn(session, sts_client)
     if not account:
         account = sts_arn.split(":")[4]
     partition = sts_arn.split(":")[1]
     role_arn = f"arn:{partition}:iam::{account}:role/{role}"
 
-    response = sts_client.assume_role(RoleArn=role_arn, RoleSessionName=role_session_name)
-    LOGGER.info(f"ASSUMED ROLE: {response['AssumedRoleUser']['Arn']}")
-    return boto3.Session(
-        aws_access_key_id=response["Credentials"]["AccessKeyId"],
-        aws_secret_access_key=response["Credentials"]["SecretAccessKey"],
-        aws_session_token=response["Credentials"]["SessionToken"],
+    return get_role_session(sts_client, role_arn, role_session_name, (account, role, partition, role_session_name))
+
+
+def set_lambda_context(context: Any) -> None:
+    """Remember the Lambda context so long fan-outs can hand off their remaining work before the deadline.
+
+    Args:
+        context: Lambda runtime information
+    """
+    LAMBDA_CONTEXT["Context"] = context
+
+
+def get_remaining_seconds() -> float:
+    """Get the seconds left before the Lambda deadline, less WAITER_DEADLINE_MARGIN_SECONDS.
+
+    Returns:
+        Remaining seconds, or infinity when no Lambda context is set
+    """
+    context = LAMBDA_CONTEXT["Context"]
+    if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+        return float("inf")
+    return context.get_remaining_time_in_millis() / 1000 - WAITER_DEADLINE_MARGIN_SECONDS
+
+
+def build_work_items(accounts: list, regions: list, steps: list) -> list:
+    """Build the ordered (account, region, step) work items for a fan-out.
+
+    Every step is completed for all accounts and regions before the next step starts.
+
+    Args:
+        accounts: AWS account IDs
+        regions: AWS regions
+        steps: Step names, in the order they run
+
+    Returns:
+        Work items
+    """
+    return [{"AccountId": account, "Region": region, "Step": step} for step in steps for account in accounts for region in regions]
+
+
+def run_work_items(
+    work_items: list, run_item: Callable[[dict], None], continuation: Callable[[list], None] = None, max_workers: int = 1
+) -> bool:
+    """Run work items in order, handing the remaining items to the continuation before the Lambda deadline.
+
+    Consecutive items of the same step run concurrently in waves of up to max_workers items. The time left must cover
+    CHECKPOINT_MARGIN_SECONDS plus the slowest wave seen so far before the next wave starts.
+
+    Args:
+        work_items: Work items from build_work_items or a resumed work cursor
+        run_item: Function that runs a single work item
+        continuation: Function that resumes the remaining work items in a new invocation. Defaults to None (never checkpoint).
+        max_workers: Maximum work items of the same step to run at once. Defaults to 1.
+
+    Returns:
+        True if every item ran, False if the remaining items were handed to the continuation
+    """
+    slowest_wave_seconds = 0.0
+    index = 0
+    while index < len(work_items):
+        if continuation is not None and get_remaining_seconds() < CHECKPOINT_MARGIN_SECONDS + slowest_wave_seconds:
+            LOGGER.info(f"Checkpoint at {work_items[index]}: continuing {len(work_items) - index} remaining work item(s) in a new invocation")
+            continuation(work_items[index:])
+            return False
+        wave = [work_items[index]]
+        while len(wave) < max_workers and index + len(wave) < len(work_items) and work_items[index + len(wave)]["Step"] == wave[0]["Step"]:
+            wave.append(work_items[index + len(wave)])
+        started = monotonic()
+        if len(wave) == 1:
+            run_item(wave[0])
+        else:
+            with ThreadPoolExecutor(max_workers=len(wave)) as executor:
+                list(executor.map(run_item, wave))
+        slowest_wave_seconds = max(slowest_wave_seconds, monotonic() - started)
+        index += len(wave)
+    return True
+
+
+def save_work_cursor(cursor: dict) -> dict:
+    """Save the work cursor to the work cursor S3 bucket.
+
+    The cursor is keyed by the request ID of the invocation that saved it, so a retried invocation overwrites its own cursor.
+
+    Args:
+        cursor: Event to resume with and its remaining work items
+
+    Raises:
+        ValueError: WORK_CURSOR_S3_BUCKET is not set
+
+    Returns:
+        Work cursor reference. {'Bucket': '', 'Key': ''}
+    """
+    if not WORK_CURSOR_S3_BUCKET:
+        raise ValueError("WORK_CURSOR_S3_BUCKET must be set to continue the remaining work items in a new invocation")
+    reference = {"Bucket": WORK_CURSOR_S3_BUCKET, "Key": f"{WORK_CURSOR_S3_PREFIX}{LAMBDA_CONTEXT['Context'].aws_request_id}.json"}
+    MANAGEMENT_ACCOUNT_SESSION.client("s3").put_object(**reference, Body=json.dumps(cursor).encode())
+    LOGGER.info(f"Saved work cursor with {len(cursor['WorkItems'])} work item(s) to s3://{reference['Bucket']}/{reference['Key']}")
+    return reference
+
+
+def load_work_cursor(reference: dict) -> dict:
+    """Load a work cursor saved by save_work_cursor.
+
+    Args:
+        reference: Work cursor reference. {'Bucket': '', 'Key': ''}
+
+    Returns:
+        Event to resume with and its remaining work items
+    """
+    response = MANAGEMENT_ACCOUNT_SESSION.client("s3").get_object(Bucket=reference["Bucket"], Key=reference["Key"])
+    return json.loads(response["Body"].read())
+
+
+def delete_work_cursor(reference: dict) -> None:
+    """Delete a work cursor once its work items have been run or handed to the next invocation.
+
+    Args:
+        reference: Work cursor reference. {'Bucket': '', 'Key': ''}
+    """
+    MANAGEMENT_ACCOUNT_SESSION.client("s3").delete_object(Bucket=reference["Bucket"], Key=reference["Key"])
+
+
+def continue_with_lambda(event: dict, work_items: list) -> None:
+    """Invoke the running Lambda function asynchronously to resume the remaining work items.
+
+    The work items are saved to S3 and the invocation only carries a reference to them, so the payload stays within the
+    asynchronous invocation size limit however many work items remain.
+
+    Args:
+        event: Event to resume with
+        work_items: Remaining work items
+    """
+    lambda_client = MANAGEMENT_ACCOUNT_SESSION.client("lambda")
+    cursor = {key: value for key, value in event.items() if key not in ["RequestType", "ResponseURL"]}
+    cursor["WorkItems"] = work_items
+    payload = {WORK_CURSOR_KEY: save_work_cursor(cursor)}
+    response = lambda_client.invoke(
+        FunctionName=LAMBDA_CONTEXT["Context"].invoked_function_arn, InvocationType="Event", Payload=json.dumps(payload)
     )
+    LOGGER.info({"API_Call": "lambda:Invoke", "API_Response": {"StatusCode": response["StatusCode"]}})
+
+
+def list_organization_accounts() -> list:
+    """List every account in the AWS Organization.
+
+    Returns:
+        List of account records. {'Id': '', 'Arn': '', 'Email': '', 'Name': '', 'Status': '', 'JoinedMethod': ''}
+    """
+    accounts: list[dict] = []
+    paginator = ORG_CLIENT.get_paginator("list_accounts")
+
+    for page in paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}):
+        for account in page["Accounts"]:
+            accounts.append({field: account[field] for field in ACCOUNT_INVENTORY_FIELDS if field in account})
+
+    return accounts
+
+
+def load_account_inventory() -> dict:
+    """Load the persisted account inventory snapshot from the local cache file, then the S3 cache object.
+
+    Returns:
+        Account inventory snapshot. {'Timestamp': 0.0, 'Accounts': []}, empty when nothing fresh is persisted
+    """
+    if ACCOUNT_CACHE_FILE and os.path.isfile(ACCOUNT_CACHE_FILE):
+        try:
+            with open(ACCOUNT_CACHE_FILE, "r") as cache_file:
+                snapshot = json.load(cache_file)
+            if time() - snapshot.get("Timestamp", 0.0) < ACCOUNT_CACHE_TTL_SECONDS:
+                return snapshot
+        except (OSError, ValueError) as error:
+            LOGGER.info(f"Unable to load account inventory from {ACCOUNT_CACHE_FILE}: {error}")
+
+    if ACCOUNT_CACHE_S3_BUCKET:
+        try:
+            response = MANAGEMENT_ACCOUNT_SESSION.client("s3").get_object(Bucket=ACCOUNT_CACHE_S3_BUCKET, Key=ACCOUNT_CACHE_S3_KEY)
+            snapshot = json.loads(response["Body"].read())
+            if time() - snapshot.get("Timestamp", 0.0) < ACCOUNT_CACHE_TTL_SECONDS:
+                return snapshot
+        except (ClientError, ValueError) as error:
+            LOGGER.info(f"Unable to load account inventory from s3://{ACCOUNT_CACHE_S3_BUCKET}/{ACCOUNT_CACHE_S3_KEY}: {error}")
+    return {}
+
+
+def save_account_inventory(snapshot: dict) -> None:
+    """Persist the account inventory snapshot to the configured local cache file and S3 cache object.
+
+    Args:
+        snapshot: Account inventory snapshot. {'Timestamp': 0.0, 'Accounts': []}
+    """
+    body = json.dumps(snapshot, default=str)
+    if ACCOUNT_CACHE_FILE:
+        try:
+            with open(ACCOUNT_CACHE_FILE, "w") as cache_file:
+                cache_file.write(body)
+        except OSError as error:
+            LOGGER.info(f"Unable to save account inventory to {ACCOUNT_CACHE_FILE}: {error}")
+    if ACCOUNT_CACHE_S3_BUCKET:
+        try:
+            MANAGEMENT_ACCOUNT_SESSION.client("s3").put_object(Bucket=ACCOUNT_CACHE_S3_BUCKET, Key=ACCOUNT_CACHE_S3_KEY, Body=body.encode())
+        except ClientError as error:
+            LOGGER.info(f"Unable to save account inventory to s3://{ACCOUNT_CACHE_S3_BUCKET}/{ACCOUNT_CACHE_S3_KEY}: {error}")
+
+
+def get_account_inventory(force_refresh: bool = False) -> list:
+    """Get the AWS Organization account inventory, listing the accounts only when the cached snapshot is stale.
+
+    Args:
+        force_refresh: Ignore the cached snapshot and list the accounts again. Defaults to False.
+
+    Returns:
+        List of account records. {'Id': '', 'Arn': '', 'Email': '', 'Name': '', 'Status': '', 'JoinedMethod': ''}
+    """
+    if not force_refresh:
+        if time() - ACCOUNT_INVENTORY["Timestamp"] < ACCOUNT_CACHE_TTL_SECONDS:
+            return ACCOUNT_INVENTORY["Accounts"]
+        snapshot = load_account_inventory()
+        if snapshot:
+            LOGGER.info("Using persisted account inventory snapshot")
+            ACCOUNT_INVENTORY.update(snapshot)
+            return ACCOUNT_INVENTORY["Accounts"]
+
+    snapshot = {"Timestamp": time(), "Accounts": list_organization_accounts()}
+    LOGGER.info(f"Refreshed account inventory with {len(snapshot['Accounts'])} accounts")
+    ACCOUNT_INVENTORY.update(snapshot)
+    save_account_inventory(snapshot)
+    return ACCOUNT_INVENTORY["Accounts"]
+
+
+def refresh_account_inventory(event: dict) -> None:
+    """Refresh the account inventory when an AWS Organizations or Control Tower account lifecycle event is received.
+
+    Args:
+        event: event data
+    """
+    if event.get("source") in ["aws.organizations", "aws.controltower"]:
+        LOGGER.info(f"Account lifecycle event received from {event['source']}, refreshing account inventory")
+        get_account_inventory(force_refresh=True)
 
 
 def get_active_organization_accounts(exclude_accounts: list = None) -> list:
@@ -87,13 +430,10 @@ def get_active_organization_accounts(exclude_accounts: list = None) -> list:
     if exclude_accounts is None:
         exclude_accounts = ["00000000000"]
     accounts: list[dict] = []
-    paginator = ORG_CLIENT.get_paginator("list_accounts")
 
-    for page in paginator.paginate(PaginationConfig={"PageSize": ORGANIZATIONS_PAGE_SIZE}):
-        for account in page["Accounts"]:
-            if account["Status"] == "ACTIVE" and account["Id"] not in exclude_accounts:
-                accounts.append({"AccountId": account["Id"], "Email": account["Email"]})
-        sleep(ORGANIZATIONS_THROTTLE_PERIOD)
+    for account in get_account_inventory():
+        if account["Status"] == "ACTIVE" and account["Id"] not in exclude_accounts:
+            accounts.append({"AccountId": account["Id"], "Email": account["Email"]})
 
     return accounts
 
@@ -110,6 +450,67 @@ def get_control_tower_regions() -> list:  # noqa: CCR001
     return list(customer_regions)
 
 
+def probe_region(sts_client: STSClient, region: str) -> str:
+    """Call STS in the region to classify it as enabled, disabled or invalid.
+
+    Args:
+        sts_client: Regional STS client
+        region: AWS region
+
+    Returns:
+        Region status. 'enabled', 'disabled', 'invalid' or 'error'
+    """
+    try:
+        sts_client.get_caller_identity()
+        return "enabled"
+    except EndpointConnectionError:
+        LOGGER.error(f"Region: ({region}) is not valid or could not be reached")
+        return "invalid"
+    except ClientError as error:
+        LOGGER.error(f"Error {error.response['Error']} occurred testing region {region}")
+        if error.response["Error"]["Code"] == "InvalidClientTokenId":
+            return "disabled"
+    except Exception:
+        LOGGER.exception("Unexpected!")
+    return "error"
+
+
+def get_region_statuses(region_list: list) -> dict:
+    """Probe the regions concurrently, reusing memoized results that are still within REGION_PROBE_CACHE_TTL_SECONDS.
+
+    Only definitive results are memoized. Connection failures can be transient, so 'invalid' and 'error' regions are probed again on the next call.
+
+    Args:
+        region_list: AWS regions
+
+    Returns:
+        Region status by region name
+    """
+    region_statuses = {}
+    regions_to_probe = []
+    for region in region_list:
+        cached = REGION_PROBE_CACHE.get(region)
+        if cached and time() - cached["Timestamp"] < REGION_PROBE_CACHE_TTL_SECONDS:
+            region_statuses[region] = cached["Status"]
+        elif region not in regions_to_probe:
+            regions_to_probe.append(region)
+
+    if regions_to_probe:
+        region_session = boto3.Session()
+        # Clients are created up front since boto3 sessions are not thread safe, but the clients are.
+        sts_clients = [
+            region_session.client("sts", endpoint_url=f"https://sts.{region}.amazonaws.com", region_name=region, config=REGION_PROBE_CONFIG)
+            for region in regions_to_probe
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(REGION_PROBE_MAX_WORKERS, len(regions_to_probe)))) as executor:
+            for region, status in zip(regions_to_probe, executor.map(probe_region, sts_clients, regions_to_probe)):
+                region_statuses[region] = status
+                if status in REGION_PROBE_CACHED_STATUSES:
+                    REGION_PROBE_CACHE[region] = {"Status": status, "Timestamp": time()}
+
+    return region_statuses
+
+
 def get_enabled_regions(customer_regions: str, control_tower_regions_only: bool = False) -> list:  # noqa: CCR001, C901
     """Query STS to identify enabled regions.
 
@@ -136,28 +537,10 @@ def get_enabled_regions(customer_regions: str, control_tower_regions_only: bool
         LOGGER.info({"Default_Available_Regions": default_available_regions})
         region_list = default_available_regions
 
-    region_session = boto3.Session()
-    enabled_regions = []
-    disabled_regions = []
-    invalid_regions = []
-    for region in region_list:
-        try:
-            sts_client = region_session.client(
-                "sts",
-                endpoint_url=f"https://sts.{region}.amazonaws.com",
-                region_name=region,
-            )
-            sts_client.get_caller_identity()
-            enabled_regions.append(region)
-        except EndpointConnectionError:
-            invalid_regions.append(region)
-            LOGGER.error(f"Region: ({region}) is not valid")
-        except ClientError as error:
-            if error.response["Error"]["Code"] == "InvalidClientTokenId":
-                disabled_regions.append(region)
-            LOGGER.error(f"Error {error.response['Error']} occurred testing region {region}")
-        except Exception:
-            LOGGER.exception("Unexpected!")
+    region_statuses = get_region_statuses(region_list)
+    enabled_regions = [region for region in region_list if region_statuses.get(region) == "enabled"]
+    disabled_regions = [region for region in region_list if region_statuses.get(region) == "disabled"]
+    invalid_regions = [region for region in region_list if region_statuses.get(region) == "invalid"]
 
     LOGGER.info(
         {
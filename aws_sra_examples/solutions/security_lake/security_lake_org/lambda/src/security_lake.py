@@ -46,7 +46,6 @@ LOGGER.setLevel(log_level)
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 UNEXPECTED = "Unexpected!"
 EMPTY_STRING = ""
-SECURITY_LAKE_THROTTLE_PERIOD = 0.2
 ENABLE_RETRY_ATTEMPTS = 10
 ENABLE_RETRY_SLEEP_INTERVAL = 10
 MAX_RETRY = 5
@@ -12,7 +12,9 @@ from __future__ import annotations
 import json
 import logging
 import os
+import random
 import re
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
@@ -38,8 +40,11 @@ LOGGER.setLevel(log_level)
 UNEXPECTED = "Unexpected!"
 SERVICE_NAME = "securityhub.amazonaws.com"
 SLEEP_SECONDS = 60
-PRE_DISABLE_SLEEP_SECONDS = 30
 SNS_PUBLISH_BATCH_MAX = 10
+SNS_PUBLISH_MAX_WORKERS = int(os.environ.get("SNS_PUBLISH_MAX_WORKERS", "5"))
+SNS_PUBLISH_MAX_RETRY = 5
+SNS_PUBLISH_MAX_DELAY_SECONDS = 20
+SNS_MESSAGE_SHARD_GRANULARITY = os.environ.get("SNS_MESSAGE_SHARD_GRANULARITY", "account")
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 
 # Initialize the helper. `sleep_on_delete` allows time for the CloudWatch Logs to get captured.
@@ -77,7 +82,34 @@ def get_standards_dictionary(params: dict) -> dict:
     }
 
 
-def create_sns_messages(accounts: list, regions: list, sns_topic_arn: str, action: str) -> None:
+def get_message_shards(account_ids: list, regions: list, shard_granularity: str = SNS_MESSAGE_SHARD_GRANULARITY) -> list:
+    """Split the accounts and regions into the shard covered by each SNS message.
+
+    Args:
+        account_ids: AWS Account IDs
+        regions: AWS Region List
+        shard_granularity: 'account' for one account with all regions per message, 'account_region' for one account and one
+            region per message, or the number of accounts per message. Defaults to SNS_MESSAGE_SHARD_GRANULARITY.
+
+    Returns:
+        (account IDs, regions) for each message
+
+    Raises:
+        ValueError: Unsupported shard granularity
+    """
+    if shard_granularity not in ["account", "account_region"] and not shard_granularity.isdigit():
+        raise ValueError(
+            f"Unsupported SNS_MESSAGE_SHARD_GRANULARITY '{shard_granularity}', expected 'account', 'account_region' or a number of accounts"
+        )
+    if shard_granularity == "account_region":
+        return [([account_id], [region]) for account_id in account_ids for region in regions]
+    accounts_per_message = max(1, int(shard_granularity)) if shard_granularity.isdigit() else 1
+    return [(account_ids[i : i + accounts_per_message], regions) for i in range(0, len(account_ids), accounts_per_message)]
+
+
+def create_sns_messages(
+    accounts: list, regions: list, sns_topic_arn: str, action: str, shard_granularity: str = SNS_MESSAGE_SHARD_GRANULARITY
+) -> None:
     """Create SNS Message.
 
     Args:
@@ -85,42 +117,63 @@ def create_sns_messages(accounts: list, regions: list, sns_topic_arn: str, actio
         regions: AWS Region List
         sns_topic_arn: SNS Topic ARN
         action: Action
+        shard_granularity: Accounts and regions covered by each message, see get_message_shards
     """
     sns_messages = []
-    for account in accounts:
-        sns_message = {"AccountId": account["AccountId"], "Regions": regions, "Action": action}
-        sns_messages.append({"Id": account["AccountId"], "Message": json.dumps(sns_message), "Subject": "Security Hub Configuration"})
+    account_ids = [account["AccountId"] for account in accounts]
+    for index, (shard_account_ids, shard_regions) in enumerate(get_message_shards(account_ids, regions, shard_granularity)):
+        sns_message = {"AccountIds": shard_account_ids, "Regions": shard_regions, "Action": action}
+        sns_messages.append({"Id": f"{shard_account_ids[0]}-{index}", "Message": json.dumps(sns_message), "Subject": "Security Hub Configuration"})
 
     process_sns_message_batches(sns_messages, sns_topic_arn)
 
 
 def publish_sns_message_batch(message_batch: list, sns_topic_arn: str) -> None:
-    """Publish SNS Message Batches.
+    """Publish SNS Message Batches, retrying only the entries that failed.
 
     Args:
         message_batch: Batch of SNS messages
         sns_topic_arn: SNS Topic ARN
+
+    Raises:
+        ValueError: SNS messages could not be published
     """
-    LOGGER.info("Publishing SNS Message Batch")
-    LOGGER.info({"SNSMessageBatch": message_batch})
-    response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=message_batch)
-    api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
-    LOGGER.info(api_call_details)
+    entries = message_batch
+    for attempt in range(1, SNS_PUBLISH_MAX_RETRY + 1):
+        LOGGER.info("Publishing SNS Message Batch")
+        LOGGER.info({"SNSMessageBatch": entries})
+        response: PublishBatchResponseTypeDef = SNS_CLIENT.publish_batch(TopicArn=sns_topic_arn, PublishBatchRequestEntries=entries)
+        api_call_details = {"API_Call": "sns:PublishBatch", "API_Response": response}
+        LOGGER.info(api_call_details)
+
+        failed_entries = response.get("Failed", [])
+        sender_faults = [failed for failed in failed_entries if failed.get("SenderFault")]
+        if sender_faults:
+            raise ValueError(f"SNS rejected {len(sender_faults)} message(s): {sender_faults}")
+        failed_ids = {failed["Id"] for failed in failed_entries}
+        entries = [entry for entry in entries if entry["Id"] in failed_ids]
+        if not entries:
+            return
+        delay = random.uniform(0, min(SNS_PUBLISH_MAX_DELAY_SECONDS, 2**attempt))  # noqa: S311
+        LOGGER.info(f"Retrying {len(entries)} failed SNS message(s) in {delay:.1f} seconds")
+        sleep(delay)
+    unpublished_ids = [entry["Id"] for entry in entries]
+    raise ValueError(f"Failed to publish {len(unpublished_ids)} SNS message(s) after {SNS_PUBLISH_MAX_RETRY} attempts: {unpublished_ids}")
 
 
 def process_sns_message_batches(sns_messages: list, sns_topic_arn: str) -> None:
-    """Process SNS Message Batches for Publishing.
+    """Process SNS Message Batches for Publishing, publishing the batches concurrently.
 
     Args:
         sns_messages: SNS messages to be batched.
         sns_topic_arn: SNS Topic ARN
     """
-    message_batches = []
-    for i in range(SNS_PUBLISH_BATCH_MAX, len(sns_messages) + SNS_PUBLISH_BATCH_MAX, SNS_PUBLISH_BATCH_MAX):
-        message_batches.append(sns_messages[i - SNS_PUBLISH_BATCH_MAX : i])
+    message_batches = [sns_messages[i : i + SNS_PUBLISH_BATCH_MAX] for i in range(0, len(sns_messages), SNS_PUBLISH_BATCH_MAX)]
+    if not message_batches:
+        return
 
-    for batch in message_batches:
-        publish_sns_message_batch(batch, sns_topic_arn)
+    with ThreadPoolExecutor(max_workers=min(SNS_PUBLISH_MAX_WORKERS, len(message_batches))) as executor:
+        list(executor.map(lambda batch: publish_sns_message_batch(batch, sns_topic_arn), message_batches))
 
 
 def process_event_sns(event: dict) -> None:
@@ -137,12 +190,18 @@ def process_event_sns(event: dict) -> None:
         message = record["Sns"]["Message"]
 
         if message["Action"] == "configure":
-            securityhub.enable_account_securityhub(
-                message["AccountId"], message["Regions"], params["CONFIGURATION_ROLE_NAME"], params["AWS_PARTITION"], get_standards_dictionary(params)
-            )
+            for account_id in message.get("AccountIds", [message.get("AccountId")]):
+                securityhub.enable_account_securityhub(
+                    account_id, message["Regions"], params["CONFIGURATION_ROLE_NAME"], params["AWS_PARTITION"], get_standards_dictionary(params)
+                )
         elif message["Action"] == "disable":
             LOGGER.info("Disabling SecurityHub")
-            securityhub.disable_securityhub(message["AccountId"], params["CONFIGURATION_ROLE_NAME"], message["Regions"])
+            for account_id in message.get("AccountIds", [message.get("AccountId")]):
+                securityhub.disable_securityhub(account_id, params["CONFIGURATION_ROLE_NAME"], message["Regions"])
+        elif message["Action"] == "resume":
+            LOGGER.info("Resuming SecurityHub delegated admin configuration")
+            accounts = common.get_active_organization_accounts(message["Params"]["DELEGATED_ADMIN_ACCOUNT_ID"])
+            configure_delegated_admin_and_members(message["Params"], accounts, message["Regions"], message[common.WORK_CURSOR_KEY])
 
 
 def process_event_lifecycle(event: Dict[str, Any]) -> str:
@@ -157,6 +216,7 @@ def process_event_lifecycle(event: Dict[str, Any]) -> str:
     Returns:
         string with account ID
     """
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({})
     LOGGER.info({"Parameters": params})
 
@@ -194,8 +254,8 @@ def process_add_update_event(params: dict) -> str:
         securityhub.disable_organization_admin_account(regions)
         securityhub.disable_securityhub(params["DELEGATED_ADMIN_ACCOUNT_ID"], params["CONFIGURATION_ROLE_NAME"], regions)
 
-        LOGGER.info(f"Waiting {PRE_DISABLE_SLEEP_SECONDS} seconds before disabling member accounts.")
-        sleep(PRE_DISABLE_SLEEP_SECONDS)
+        if not securityhub.wait_for_admin_account_removed(regions):
+            LOGGER.info("Delegated admin is still being removed in some regions; continuing with disabling member accounts.")
         create_sns_messages(accounts, regions, params["SNS_TOPIC_ARN"], "disable")
         return "DISABLE_COMPLETE"
 
@@ -205,11 +265,30 @@ def process_add_update_event(params: dict) -> str:
     securityhub.enable_account_securityhub(
         params["MANAGEMENT_ACCOUNT_ID"], regions, params["CONFIGURATION_ROLE_NAME"], params["AWS_PARTITION"], get_standards_dictionary(params)
     )
-    LOGGER.info("Waiting 20 seconds before configuring the delegated admin account.")
-    sleep(20)
+    if not securityhub.wait_for_account_securityhub(params["MANAGEMENT_ACCOUNT_ID"], regions, params["CONFIGURATION_ROLE_NAME"]):
+        LOGGER.info("SecurityHub is not yet ready in the management account in some regions; continuing with the delegated admin account.")
 
     # Configure Security Hub Delegated Admin and Organizations
-    securityhub.configure_delegated_admin_securityhub(
+    if not configure_delegated_admin_and_members(params, accounts, regions):
+        return "ADD_UPDATE_CONTINUING"
+    return "ADD_UPDATE_COMPLETE"
+
+
+def configure_delegated_admin_and_members(params: dict, accounts: list, regions: list, work_items: list = None) -> bool:
+    """Configure the delegated admin account, then publish the member account configuration messages.
+
+    If the Lambda deadline approaches, the remaining work is continued through the SNS topic.
+
+    Args:
+        params: Configuration Parameters
+        accounts: AWS accounts
+        regions: AWS regions
+        work_items: Remaining work items when resuming a previous invocation. Defaults to None.
+
+    Returns:
+        True if the configuration completed, False if it is continuing in a new invocation
+    """
+    completed = securityhub.configure_delegated_admin_securityhub(
         accounts,
         regions,
         params["DELEGATED_ADMIN_ACCOUNT_ID"],
@@ -218,7 +297,15 @@ def process_add_update_event(params: dict) -> str:
         params["HOME_REGION"],
         params["AWS_PARTITION"],
         get_standards_dictionary(params),
+        work_items,
+        lambda remaining_items: common.continue_with_sns(
+            params["SNS_TOPIC_ARN"], {"Action": "resume", "Params": params, "Regions": regions}, remaining_items
+        ),
     )
+    if not completed:
+        LOGGER.info("Security Hub delegated admin configuration continuing in a new invocation")
+        return False
+
     # Configure Security Hub in the Delegated Admin Account
     securityhub.enable_account_securityhub(
         params["DELEGATED_ADMIN_ACCOUNT_ID"],
@@ -232,7 +319,7 @@ def process_add_update_event(params: dict) -> str:
         LOGGER.info(f"Waiting {SLEEP_SECONDS} seconds before configuring member accounts.")
         sleep(SLEEP_SECONDS)
     create_sns_messages(accounts, regions, params["SNS_TOPIC_ARN"], "configure")
-    return "ADD_UPDATE_COMPLETE"
+    return True
 
 
 def process_event(event: dict) -> None:
@@ -348,6 +435,7 @@ def process_event_organizations(event: dict) -> None:
     """
     event_info = {"Event": event}
     LOGGER.info(event_info)
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({})
     regions = common.get_enabled_regions(params["ENABLED_REGIONS"], params["CONTROL_TOWER_REGIONS_ONLY"] == "true")
 
@@ -429,10 +517,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> None:
         ValueError: Unexpected error executing Lambda function
     """
     LOGGER.info("....Lambda Handler Started....")
+    common.set_lambda_context(context)
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
         orchestrator(event, context)
+        LOGGER.info({"Rate_Limiter_Stats": common.get_rate_limiter_stats()})
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs '{context.log_group_name}' for details.") from None
@@ -449,6 +540,7 @@ def terraform_handler(event: Dict[str, Any], context: Context) -> None:
         ValueError: Unexpected error executing Lambda function
     """
     LOGGER.info("....Lambda Handler Started....")
+    common.set_lambda_context(context)
     event_info = {"Event": event}
     LOGGER.info(event_info)
     try:
@@ -464,6 +556,7 @@ def terraform_handler(event: Dict[str, Any], context: Context) -> None:
             process_event_sns(event)
         else:
             process_event(event)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception:
         LOGGER.exception(UNEXPECTED)
         raise ValueError(f"Unexpected error executing Lambda function. Review CloudWatch logs '{context.log_group_name}' for details.") from None
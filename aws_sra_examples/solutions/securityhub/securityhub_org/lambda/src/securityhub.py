@@ -11,8 +11,10 @@ from __future__ import annotations
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from time import sleep
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Union
 
 import boto3
 import common
@@ -33,7 +35,12 @@ LOGGER.setLevel(log_level)
 # Global variables
 UNEXPECTED = "Unexpected!"
 MAX_RETRY = 5
-SECURITY_HUB_THROTTLE_PERIOD = 0.2
+STANDARDS_READY_TIMEOUT_SECONDS = int(os.environ.get("STANDARDS_READY_TIMEOUT_SECONDS", "200"))
+READINESS_TIMEOUT_SECONDS = int(os.environ.get("READINESS_TIMEOUT_SECONDS", "300"))
+LIST_MEMBERS_PAGE_SIZE = 50  # Max results per list_members call
+MEMBER_BATCH_SIZE = 50  # Accounts per disassociate_members and delete_members call
+CONFIGURE_REGIONS_MAX_WORKERS = int(os.environ.get("CONFIGURE_REGIONS_MAX_WORKERS", "8"))
+STANDARDS_CATALOG_CACHE: dict = {}
 BOTO3_CONFIG = Config(retries={"max_attempts": 10, "mode": "standard"})
 AWS_DEFAULT_SBP_VERSION = "1.0.0"
 AWS_DEFAULT_CIS_VERSION = "1.2.0"
@@ -56,11 +63,11 @@ def is_admin_account_enabled(securityhub_client: SecurityHubClient, admin_accoun
         True or False
     """
     paginator: ListOrganizationAdminAccountsPaginator = securityhub_client.get_paginator("list_organization_admin_accounts")
-    for page in paginator.paginate():
+    limiter = common.get_rate_limiter("securityhub", region=securityhub_client.meta.region_name)
+    for page in common.rate_limited_pages(paginator.paginate(), limiter):
         for admin_account in page["AdminAccounts"]:
             if admin_account["AccountId"] == admin_account_id and admin_account["Status"] == "ENABLED":
                 return True
-        sleep(SECURITY_HUB_THROTTLE_PERIOD)
     return False
 
 
@@ -75,7 +82,7 @@ def process_organization_admin_account(admin_account_id: str, regions: list) ->
         ClientError: boto3 ClientError
     """
     for region in regions:
-        securityhub_client: SecurityHubClient = MANAGEMENT_ACCOUNT_SESSION.client("securityhub", region, config=BOTO3_CONFIG)
+        securityhub_client: SecurityHubClient = MANAGEMENT_ACCOUNT_SESSION.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
 
         if not is_admin_account_enabled(securityhub_client, admin_account_id):
             for _ in range(10):
@@ -101,16 +108,50 @@ def disable_organization_admin_account(regions: list) -> None:
         regions: AWS Region List
     """
     for region in regions:
-        securityhub_client: SecurityHubClient = MANAGEMENT_ACCOUNT_SESSION.client("securityhub", region, config=BOTO3_CONFIG)
+        securityhub_client: SecurityHubClient = MANAGEMENT_ACCOUNT_SESSION.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
         paginator: ListOrganizationAdminAccountsPaginator = securityhub_client.get_paginator("list_organization_admin_accounts")
-        for page in paginator.paginate():
+        for page in common.rate_limited_pages(paginator.paginate(), common.get_rate_limiter("securityhub", region=region)):
             for admin_account in page["AdminAccounts"]:
                 if admin_account["Status"] == "ENABLED":
                     response = securityhub_client.disable_organization_admin_account(AdminAccountId=admin_account["AccountId"])
                     api_call_details = {"API_Call": "securityhub:DisableOrganizationAdminAccount", "API_Response": response}
                     LOGGER.info(api_call_details)
                     LOGGER.info(f"Admin Account {admin_account['AccountId']} Disabled in {region}")
-            sleep(SECURITY_HUB_THROTTLE_PERIOD)
+
+
+def is_admin_account_removed(securityhub_client: SecurityHubClient) -> bool:
+    """Check that no organization admin account is enabled or still being disabled.
+
+    Args:
+        securityhub_client: SecurityHubClient
+
+    Returns:
+        True or False
+    """
+    paginator: ListOrganizationAdminAccountsPaginator = securityhub_client.get_paginator("list_organization_admin_accounts")
+    limiter = common.get_rate_limiter("securityhub", region=securityhub_client.meta.region_name)
+    for page in common.rate_limited_pages(paginator.paginate(), limiter):
+        if page["AdminAccounts"]:
+            return False
+    return True
+
+
+def wait_for_admin_account_removed(regions: list) -> bool:
+    """Wait until the organization admin account has been removed in all regions.
+
+    Args:
+        regions: AWS Region List
+
+    Returns:
+        True if the admin account was removed in every region, False if some regions were still disabling it when the wait ended
+    """
+    securityhub_clients = {
+        region: MANAGEMENT_ACCOUNT_SESSION.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG) for region in regions
+    }
+    region_results = common.wait_until_in_regions(
+        lambda region: is_admin_account_removed(securityhub_clients[region]), regions, "Security Hub admin account removal", READINESS_TIMEOUT_SECONDS
+    )
+    return all(region_results.values())
 
 
 def disable_securityhub(account_id: str, configuration_role_name: str, regions: list) -> None:  # noqa: CCR001
@@ -124,19 +165,8 @@ def disable_securityhub(account_id: str, configuration_role_name: str, regions:
     account_session = common.assume_role(configuration_role_name, "sra-disable-security-hub", account_id)
 
     for region in regions:
-        securityhub_client: SecurityHubClient = account_session.client("securityhub", region, config=BOTO3_CONFIG)
-        member_account_ids: list = get_associated_members(securityhub_client)
-
-        if member_account_ids:
-            disassociate_members_response = securityhub_client.disassociate_members(AccountIds=member_account_ids)
-            api_call_details = {"API_Call": "securityhub:DisassociateMembers", "API_Response": disassociate_members_response}
-            LOGGER.info(api_call_details)
-            LOGGER.info(f"Member accounts disassociated in {region}")
-
-            delete_members_response: DeleteMembersResponseTypeDef = securityhub_client.delete_members(AccountIds=member_account_ids)
-            api_call_details = {"API_Call": "securityhub:DeleteMembers", "API_Response": delete_members_response}
-            LOGGER.info(api_call_details)
-            LOGGER.info(f"Member accounts deleted in {region}")
+        securityhub_client: SecurityHubClient = account_session.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
+        delete_members(securityhub_client, region)
 
         try:
             disable_security_hub_response = securityhub_client.disable_security_hub()
@@ -147,26 +177,59 @@ def disable_securityhub(account_id: str, configuration_role_name: str, regions:
             LOGGER.info(f"SecurityHub is not enabled in {region}")
 
 
-def get_associated_members(securityhub_client: SecurityHubClient) -> list:
-    """Get SecurityHub members.
+def delete_members(securityhub_client: SecurityHubClient, region: str) -> None:
+    """Disassociate and delete the Security Hub members in batches.
+
+    Each batch is read from the first list_members page, and the listing starts again from the first page after the batch is
+    deleted, since deleting members shifts the pages. Only one page is held at a time, and members that join while the
+    batches are deleted are picked up by the next listing.
 
     Args:
         securityhub_client: SecurityHub Client
+        region: AWS Region
 
-    Returns:
-        account_ids
+    Raises:
+        ValueError: The same Security Hub members are listed again after their batch was deleted
+    """
+    previous_account_ids: list = []
+    while True:
+        member_account_ids = list(islice(get_associated_members(securityhub_client), MEMBER_BATCH_SIZE))
+        if not member_account_ids:
+            return
+        if member_account_ids == previous_account_ids:
+            raise ValueError(f"{len(member_account_ids)} Security Hub member(s) remain in {region} after they were deleted: {member_account_ids}")
+        disassociate_members_response = securityhub_client.disassociate_members(AccountIds=member_account_ids)
+        api_call_details = {"API_Call": "securityhub:DisassociateMembers", "API_Response": disassociate_members_response}
+        LOGGER.info(api_call_details)
+        LOGGER.info(f"Member accounts disassociated in {region}")
+
+        delete_members_response: DeleteMembersResponseTypeDef = securityhub_client.delete_members(AccountIds=member_account_ids)
+        api_call_details = {"API_Call": "securityhub:DeleteMembers", "API_Response": delete_members_response}
+        LOGGER.info(api_call_details)
+        LOGGER.info(f"Member accounts deleted in {region}")
+        previous_account_ids = member_account_ids
+
+
+def get_associated_members(securityhub_client: SecurityHubClient) -> Iterator[str]:
+    """Get SecurityHub members, yielding each account ID as the pages are listed.
+
+    Args:
+        securityhub_client: SecurityHub Client
+
+    Yields:
+        Account ID
 
     Raises:
         ClientError: botocore Client Error
     """
-    account_ids = []
     paginator: ListMembersPaginator = securityhub_client.get_paginator("list_members")
+    limiter = common.get_rate_limiter("securityhub", region=securityhub_client.meta.region_name)
 
     try:
-        for page in paginator.paginate(OnlyAssociated=False):
+        pages = paginator.paginate(OnlyAssociated=False, PaginationConfig={"PageSize": LIST_MEMBERS_PAGE_SIZE})
+        for page in common.rate_limited_pages(pages, limiter):
             for member in page["Members"]:
-                account_ids.append(member["AccountId"])
-        sleep(SECURITY_HUB_THROTTLE_PERIOD)
+                yield member["AccountId"]
     except securityhub_client.exceptions.InternalException:
         LOGGER.info("No associated members")
     except ClientError as error:
@@ -175,8 +238,6 @@ def get_associated_members(securityhub_client: SecurityHubClient) -> list:
         else:
             LOGGER.info("SecurityHub is not enabled")
 
-    return account_ids
-
 
 def get_unprocessed_account_details(create_members_response: CreateMembersResponseTypeDef, accounts: list) -> list:
     """Get unprocessed account list.
@@ -233,6 +294,34 @@ def create_members(security_hub_client: SecurityHubClient, accounts: list) -> No
     LOGGER.info(f"Member accounts created: {len(accounts)}")
 
 
+def run_in_regions(configure_region: Callable[[str], None], regions: list, description: str) -> None:
+    """Run a per-region function in every region concurrently, reporting the regions that failed.
+
+    Args:
+        configure_region: Function taking a region
+        regions: AWS Region List
+        description: Description of the work, used for logging
+
+    Raises:
+        ValueError: The function failed in one or more regions
+    """
+
+    def run_in_region(region: str) -> str:
+        try:
+            configure_region(region)
+        except Exception as error:
+            LOGGER.exception(f"{description} failed in {region}")
+            return str(error)
+        return ""
+
+    if not regions:
+        return
+    with ThreadPoolExecutor(max_workers=min(CONFIGURE_REGIONS_MAX_WORKERS, len(regions))) as executor:
+        failed_regions = {region: error for region, error in zip(regions, executor.map(run_in_region, regions)) if error}
+    if failed_regions:
+        raise ValueError(f"{description} failed in {len(failed_regions)} region(s): {failed_regions}")
+
+
 def enable_account_securityhub(account_id: str, regions: list, configuration_role_name: str, aws_partition: str, standards_user_input: dict) -> None:
     """Enable account SecurityHub.
 
@@ -252,9 +341,12 @@ def enable_account_securityhub(account_id: str, regions: list, configuration_rol
         iam_client,
     )
 
-    for region in regions:
-        standard_dict: dict = get_standard_dictionary(
-            account_id,
+    # Clients are created up front because boto3 sessions are not thread safe
+    securityhub_clients = {region: account_session.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG) for region in regions}
+    config_clients = {region: account_session.client("config", region, config=BOTO3_CONFIG) for region in regions}
+
+    def enable_in_region(region: str) -> None:
+        standards_catalog = get_standards_catalog(
             region,
             aws_partition,
             standards_user_input["SecurityBestPracticesVersion"],
@@ -262,7 +354,7 @@ def enable_account_securityhub(account_id: str, regions: list, configuration_rol
             standards_user_input["PCIVersion"],
             standards_user_input["NISTVersion"],
         )
-        securityhub_client: SecurityHubClient = account_session.client("securityhub", region, config=BOTO3_CONFIG)
+        securityhub_client: SecurityHubClient = securityhub_clients[region]
 
         try:
             enable_security_hub_response: Any = securityhub_client.enable_security_hub(EnableDefaultStandards=False)
@@ -272,12 +364,107 @@ def enable_account_securityhub(account_id: str, regions: list, configuration_rol
         except securityhub_client.exceptions.ResourceConflictException:
             LOGGER.info(f"SecurityHub already enabled in {account_id} {region}")
 
-        config_client: ConfigServiceClient = account_session.client("config", region, config=BOTO3_CONFIG)
-        if is_config_enabled(config_client):
-            process_standards(securityhub_client, standard_dict, standards_user_input["StandardsToEnable"])
+        if is_config_enabled(config_clients[region]):
+            process_standards(securityhub_client, standards_catalog, standards_user_input["StandardsToEnable"])
+
+    run_in_regions(enable_in_region, regions, f"Enabling SecurityHub in {account_id}")
+
+
+def is_securityhub_ready(securityhub_client: SecurityHubClient) -> bool:
+    """Check that Security Hub is enabled and none of its standards subscriptions are still pending.
+
+    Args:
+        securityhub_client: SecurityHubClient
+
+    Returns:
+        True or False
+    """
+    try:
+        securityhub_client.describe_hub()
+    except (securityhub_client.exceptions.InvalidAccessException, securityhub_client.exceptions.ResourceNotFoundException):
+        return False
+    return all(subscription["StandardsStatus"] != "PENDING" for subscription in get_enabled_standards(securityhub_client))
+
 
+def wait_for_account_securityhub(account_id: str, regions: list, configuration_role_name: str) -> bool:
+    """Wait until Security Hub is ready in the account in all regions.
 
-def configure_delegated_admin_securityhub(
+    Args:
+        account_id: Account ID
+        regions: AWS Region List
+        configuration_role_name: Configuration Role Name
+
+    Returns:
+        True if Security Hub is ready in every region, False if some regions were not ready when the wait ended
+    """
+    account_session: boto3.Session = common.assume_role(configuration_role_name, "sra-configure-security-hub", account_id)
+    # Clients are created up front because boto3 sessions are not thread safe
+    securityhub_clients = {region: account_session.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG) for region in regions}
+    region_results = common.wait_until_in_regions(
+        lambda region: is_securityhub_ready(securityhub_clients[region]), regions, f"Security Hub in {account_id}", READINESS_TIMEOUT_SECONDS
+    )
+    return all(region_results.values())
+
+
+def configure_delegated_admin_securityhub_in_region(
+    securityhub_delegated_admin_region_client: SecurityHubClient,
+    accounts: list,
+    delegated_admin_account_id: str,
+    aws_partition: str,
+    standards_user_input: dict,
+) -> None:
+    """Configure delegated admin security hub in a region.
+
+    Args:
+        securityhub_delegated_admin_region_client: SecurityHubClient for the delegated admin account in the region
+        accounts: list of account details [{"AccountId": "", "Email": ""}]
+        delegated_admin_account_id: Delegated Admin Account ID
+        aws_partition: AWS Partition
+        standards_user_input: Dictionary of standards
+    """
+    region = securityhub_delegated_admin_region_client.meta.region_name
+    standard_dict = get_standard_dictionary(
+        delegated_admin_account_id,
+        region,
+        aws_partition,
+        AWS_DEFAULT_SBP_VERSION,
+        AWS_DEFAULT_CIS_VERSION,
+        standards_user_input["PCIVersion"],
+        standards_user_input["NISTVersion"],
+    )
+
+    common.wait_until(
+        lambda: default_standards_ready(securityhub_delegated_admin_region_client),
+        f"Delegated admin default standards in {region}",
+        STANDARDS_READY_TIMEOUT_SECONDS,
+    )
+
+    # Manually disable Security Hub default standards in Admin Account
+    batch_disable_standards_response = securityhub_delegated_admin_region_client.batch_disable_standards(
+        StandardsSubscriptionArns=[standard_dict["sbp"]["subscription_arn"], standard_dict["cis"]["subscription_arn"]]
+    )
+    api_call_details = {"API_Call": "securityhub:BatchDisableStandards", "API_Response": batch_disable_standards_response}
+    LOGGER.info(api_call_details)
+    LOGGER.info(f"SecurityHub default standards disabled in {region}")
+
+    update_organization_configuration_response = securityhub_delegated_admin_region_client.update_organization_configuration(
+        AutoEnable=True, AutoEnableStandards="NONE"
+    )
+    api_call_details = {"API_Call": "securityhub:UpdateOrganizationConfiguration", "API_Response": update_organization_configuration_response}
+    LOGGER.info(api_call_details)
+    LOGGER.info(f"SecurityHub organization configuration updated in {region}")
+
+    update_security_hub_configuration_response = securityhub_delegated_admin_region_client.update_security_hub_configuration(
+        AutoEnableControls=True
+    )
+    api_call_details = {"API_Call": "securityhub:UpdateSecurityHubConfiguration", "API_Response": update_security_hub_configuration_response}
+    LOGGER.info(api_call_details)
+    LOGGER.info(f"SecurityHub configuration updated in {region}")
+
+    create_members(securityhub_delegated_admin_region_client, accounts)
+
+
+def configure_delegated_admin_securityhub(  # noqa: CFQ002
     accounts: list,
     regions: list,
     delegated_admin_account_id: str,
@@ -286,9 +473,14 @@ def configure_delegated_admin_securityhub(
     home_region: str,
     aws_partition: str,
     standards_user_input: dict,
-) -> None:
+    work_items: list = None,
+    continuation: Callable[[list], None] = None,
+) -> bool:
     """Configure delegated admin security hub.
 
+    Every region is configured before the finding aggregator is created. When a continuation is provided, the remaining
+    (account, region, step) work items are handed to it before the Lambda deadline.
+
     Args:
         accounts: list of account details [{"AccountId": "", "Email": ""}]
         regions: AWS Region List
@@ -298,59 +490,33 @@ def configure_delegated_admin_securityhub(
         home_region: Home Region
         aws_partition: AWS Partition
         standards_user_input: Dictionary of standards
+        work_items: Remaining work items when resuming a previous invocation. Defaults to None.
+        continuation: Function that resumes the remaining work items in a new invocation. Defaults to None.
+
+    Returns:
+        True if every work item ran, False if the remaining items were handed to the continuation
     """
-    process_organization_admin_account(delegated_admin_account_id, regions)
+    if work_items is None:
+        process_organization_admin_account(delegated_admin_account_id, regions)
+        work_items = common.build_work_items([delegated_admin_account_id], regions, ["configure"])
+        work_items.append({"AccountId": delegated_admin_account_id, "Region": home_region, "Step": "finding_aggregator"})
     delegated_admin_session: boto3.Session = common.assume_role(configuration_role_name, "sra-enable-security-hub", delegated_admin_account_id)
+    # Clients are created up front because boto3 sessions are not thread safe
+    regional_clients = {
+        region: delegated_admin_session.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG)
+        for region in {work_item["Region"] for work_item in work_items if work_item["Step"] == "configure"}
+    }
+    securityhub_delegated_admin_client: SecurityHubClient = delegated_admin_session.client("securityhub", config=common.RATE_LIMITED_BOTO3_CONFIG)
 
-    for region in regions:
-        securityhub_delegated_admin_region_client: SecurityHubClient = delegated_admin_session.client("securityhub", region, config=BOTO3_CONFIG)
-
-        standard_dict = get_standard_dictionary(
-            delegated_admin_account_id,
-            region,
-            aws_partition,
-            AWS_DEFAULT_SBP_VERSION,
-            AWS_DEFAULT_CIS_VERSION,
-            standards_user_input["PCIVersion"],
-            standards_user_input["NISTVersion"],
-        )
-
-        for i in range(10):
-            standards_subscriptions = get_enabled_standards(securityhub_delegated_admin_region_client)
-            if (
-                all_standards_in_status(standards_subscriptions, "READY", securityhub_delegated_admin_region_client)
-                and len(standards_subscriptions) != 0
-            ):
-                break
-            LOGGER.info(f"Waiting 20 seconds before checking if delegated admin default standards are in READY status. {i} of 10")
-            sleep(20)
-
-        # Manually disable Security Hub default standards in Admin Account
-        batch_disable_standards_response = securityhub_delegated_admin_region_client.batch_disable_standards(
-            StandardsSubscriptionArns=[standard_dict["sbp"]["subscription_arn"], standard_dict["cis"]["subscription_arn"]]
-        )
-        api_call_details = {"API_Call": "securityhub:BatchDisableStandards", "API_Response": batch_disable_standards_response}
-        LOGGER.info(api_call_details)
-        LOGGER.info(f"SecurityHub default standards disabled in {region}")
-
-        update_organization_configuration_response = securityhub_delegated_admin_region_client.update_organization_configuration(
-            AutoEnable=True, AutoEnableStandards="NONE"
-        )
-        api_call_details = {"API_Call": "securityhub:UpdateOrganizationConfiguration", "API_Response": update_organization_configuration_response}
-        LOGGER.info(api_call_details)
-        LOGGER.info(f"SecurityHub organization configuration updated in {region}")
-
-        update_security_hub_configuration_response = securityhub_delegated_admin_region_client.update_security_hub_configuration(
-            AutoEnableControls=True
-        )
-        api_call_details = {"API_Call": "securityhub:UpdateSecurityHubConfiguration", "API_Response": update_security_hub_configuration_response}
-        LOGGER.info(api_call_details)
-        LOGGER.info(f"SecurityHub configuration updated in {region}")
-
-        create_members(securityhub_delegated_admin_region_client, accounts)
+    def run_work_item(work_item: dict) -> None:
+        if work_item["Step"] == "configure":
+            configure_delegated_admin_securityhub_in_region(
+                regional_clients[work_item["Region"]], accounts, delegated_admin_account_id, aws_partition, standards_user_input
+            )
+        else:
+            create_finding_aggregator(securityhub_delegated_admin_client, region_linking_mode, regions, home_region)
 
-    securityhub_delegated_admin_client: SecurityHubClient = delegated_admin_session.client("securityhub", config=BOTO3_CONFIG)
-    create_finding_aggregator(securityhub_delegated_admin_client, region_linking_mode, regions, home_region)
+    return common.run_work_items(work_items, run_work_item, continuation, CONFIGURE_REGIONS_MAX_WORKERS)
 
 
 def configure_member_account(account_id: str, configuration_role_name: str, regions: list, standards_user_input: dict, aws_partition: str) -> None:
@@ -367,10 +533,12 @@ def configure_member_account(account_id: str, configuration_role_name: str, regi
 
     account_session = common.assume_role(configuration_role_name, "sra-configure-security-hub", account_id)
 
-    for region in regions:
-        securityhub_client: SecurityHubClient = account_session.client("securityhub", region, config=BOTO3_CONFIG)
-        standard_dict: dict = get_standard_dictionary(
-            account_id,
+    # Clients are created up front because boto3 sessions are not thread safe
+    securityhub_clients = {region: account_session.client("securityhub", region, config=common.RATE_LIMITED_BOTO3_CONFIG) for region in regions}
+    config_clients = {region: account_session.client("config", region, config=BOTO3_CONFIG) for region in regions}
+
+    def configure_in_region(region: str) -> None:
+        standards_catalog = get_standards_catalog(
             region,
             aws_partition,
             standards_user_input["SecurityBestPracticesVersion"],
@@ -378,9 +546,57 @@ def configure_member_account(account_id: str, configuration_role_name: str, regi
             standards_user_input["PCIVersion"],
             standards_user_input["NISTVersion"],
         )
-        config_client: ConfigServiceClient = account_session.client("config", region, config=BOTO3_CONFIG)
-        if is_config_enabled(config_client):
-            process_standards(securityhub_client, standard_dict, standards_user_input["StandardsToEnable"])
+        if is_config_enabled(config_clients[region]):
+            process_standards(securityhub_clients[region], standards_catalog, standards_user_input["StandardsToEnable"])
+
+    run_in_regions(configure_in_region, regions, f"Configuring SecurityHub standards in {account_id}")
+
+
+def get_standards_catalog(region: str, aws_partition: str, sbp_version: str, cis_version: str, pci_version: str, nist_version: str) -> dict:
+    """Get the standard names and ARNs for a region, cached for the rest of the run.
+
+    The returned dictionary is shared between callers and must not be modified.
+
+    Args:
+        region: AWS Region
+        aws_partition: AWS Partition
+        sbp_version: AWS Security Best Practices Standard Version
+        cis_version: CIS Standard Version
+        pci_version: PCI Standard Version
+        nist_version: NIST version
+
+    Returns:
+        Standards catalog by standard short name
+    """
+    cache_key = (region, aws_partition, sbp_version, cis_version, pci_version, nist_version)
+    if cache_key not in STANDARDS_CATALOG_CACHE:
+        cis_standard_arn: str = f"arn:{aws_partition}:securityhub:::ruleset/cis-aws-foundations-benchmark/v/{cis_version}"
+        if cis_version != "1.2.0":
+            cis_standard_arn = f"arn:{aws_partition}:securityhub:{region}::standards/cis-aws-foundations-benchmark/v/{cis_version}"
+
+        STANDARDS_CATALOG_CACHE[cache_key] = {
+            "cis": {
+                "name": "CIS AWS Foundations Benchmark Security Standard",
+                "standard_arn": cis_standard_arn,
+                "subscription_path": f"subscription/cis-aws-foundations-benchmark/v/{cis_version}",
+            },
+            "pci": {
+                "name": "Payment Card Industry Data Security Standard (PCI DSS)",
+                "standard_arn": f"arn:{aws_partition}:securityhub:{region}::standards/pci-dss/v/{pci_version}",
+                "subscription_path": f"subscription/pci-dss/v/{pci_version}",
+            },
+            "nist": {
+                "name": "National Institute of Standards and Technology (NIST) SP 800-53 Rev. 5",
+                "standard_arn": f"arn:{aws_partition}:securityhub:{region}::standards/nist-800-53/v/{nist_version}",
+                "subscription_path": f"subscription/nist-800-53/v/{nist_version}",
+            },
+            "sbp": {
+                "name": "AWS Foundational Security Best Practices Standard",
+                "standard_arn": f"arn:{aws_partition}:securityhub:{region}::standards/aws-foundational-security-best-practices/v/{sbp_version}",
+                "subscription_path": f"subscription/aws-foundational-security-best-practices/v/{sbp_version}",
+            },
+        }
+    return STANDARDS_CATALOG_CACHE[cache_key]
 
 
 def get_standard_dictionary(
@@ -400,37 +616,15 @@ def get_standard_dictionary(
     Returns:
         Standard ARN Dictionary
     """
-    cis_standard_arn: str = f"arn:{aws_partition}:securityhub:::ruleset/cis-aws-foundations-benchmark/v/{cis_version}"
-    if cis_version != "1.2.0":
-        cis_standard_arn = f"arn:{aws_partition}:securityhub:{region}::standards/cis-aws-foundations-benchmark/v/{cis_version}"
-
+    standards_catalog = get_standards_catalog(region, aws_partition, sbp_version, cis_version, pci_version, nist_version)
     return {
-        "cis": {
-            "name": "CIS AWS Foundations Benchmark Security Standard",
-            "enabled": False,
-            "standard_arn": cis_standard_arn,
-            "subscription_arn": f"arn:{aws_partition}:securityhub:{region}:{account_id}:subscription/cis-aws-foundations-benchmark/v/{cis_version}",
-        },
-        "pci": {
-            "name": "Payment Card Industry Data Security Standard (PCI DSS)",
-            "enabled": False,
-            "standard_arn": f"arn:{aws_partition}:securityhub:{region}::standards/pci-dss/v/{pci_version}",
-            "subscription_arn": f"arn:{aws_partition}:securityhub:{region}:{account_id}:subscription/pci-dss/v/{pci_version}",
-        },
-        "nist": {
-            "name": "National Institute of Standards and Technology (NIST) SP 800-53 Rev. 5",
-            "enabled": False,
-            "standard_arn": f"arn:{aws_partition}:securityhub:{region}::standards/nist-800-53/v/{nist_version}",
-            "subscription_arn": f"arn:{aws_partition}:securityhub:{region}:{account_id}:subscription/nist-800-53/v/{nist_version}",
-        },
-        "sbp": {
-            "name": "AWS Foundational Security Best Practices Standard",
+        short_name: {
+            "name": standard["name"],
             "enabled": False,
-            "standard_arn": f"arn:{aws_partition}:securityhub:{region}::standards/aws-foundational-security-best-practices/v/{sbp_version}",
-            "subscription_arn": (
-                f"arn:{aws_partition}:securityhub:{region}:{account_id}:subscription/aws-foundational-security-best-practices/v/{sbp_version}"
-            ),
-        },
+            "standard_arn": standard["standard_arn"],
+            "subscription_arn": f"arn:{aws_partition}:securityhub:{region}:{account_id}:{standard['subscription_path']}",
+        }
+        for short_name, standard in standards_catalog.items()
     }
 
 
@@ -473,10 +667,14 @@ def disable_then_enable_standard(securityhub_client: SecurityHubClient, standard
             standards_subscription_arn,
         ]
     )
-    sleep(5)
-    standard_enable_retry_sleep = 5
-    standard_enable_retry = 0
-    while standard_enable_retry < 10:
+
+    def standard_disabled() -> bool:
+        subscription_arns = {subscription["StandardsSubscriptionArn"] for subscription in get_enabled_standards(securityhub_client)}
+        return standards_subscription_arn not in subscription_arns
+
+    common.wait_until(standard_disabled, f"Disabling {standards_subscription_arn} standard", STANDARDS_READY_TIMEOUT_SECONDS)
+
+    def enable_standard() -> bool:
         try:
             LOGGER.info(f"...enabling {standards_subscription_arn} standard")
             securityhub_client.batch_enable_standards(
@@ -488,13 +686,13 @@ def disable_then_enable_standard(securityhub_client: SecurityHubClient, standard
             )
             return True
         except securityhub_client.exceptions.InvalidInputException as error:
-            standard_enable_retry = standard_enable_retry + 1
             LOGGER.error(
-                f"Retry {standard_enable_retry} due to InvalidInputException "
-                + f"while enabling standard: {error.response['Error']['Code']} - {error.response['Error']['Message']}"
+                "InvalidInputException while enabling standard, retrying: "
+                + f"{error.response['Error']['Code']} - {error.response['Error']['Message']}"
             )
-            sleep(standard_enable_retry_sleep)
-    return False
+            return False
+
+    return common.wait_until(enable_standard, f"Enabling {standards_arn} standard", STANDARDS_READY_TIMEOUT_SECONDS)
 
 
 def all_standards_in_status(standards_subscriptions: list, standards_status: str, securityhub_client: SecurityHubClient) -> bool:
@@ -523,28 +721,41 @@ def all_standards_in_status(standards_subscriptions: list, standards_status: str
     return True
 
 
-def get_current_enabled_standards(securityhub_client: SecurityHubClient, standard_dict: dict) -> dict:  # noqa: CCR001 (cognitive complexity)
-    """Get current enabled standards.
+def get_standards_changes(standards_catalog: dict, standards_subscriptions: list, standards_to_enable: dict) -> tuple:
+    """Get the exact standards to enable and the subscriptions to disable.
+
+    Args:
+        standards_catalog: Standards catalog or Standard Dictionary
+        standards_subscriptions: Current standards subscriptions
+        standards_to_enable: Dictionary of standards to enable
+
+    Returns:
+        Standard ARNs to enable and standards subscription ARNs to disable
+    """
+    subscribed = {subscription["StandardsArn"]: subscription["StandardsSubscriptionArn"] for subscription in standards_subscriptions}
+    managed = {standard["standard_arn"] for standard in standards_catalog.values()}
+    wanted = {standard["standard_arn"] for short_name, standard in standards_catalog.items() if standards_to_enable[short_name]}
+    return wanted - subscribed.keys(), {subscribed[standard_arn] for standard_arn in (managed - wanted) & subscribed.keys()}
+
+
+def wait_for_standards_ready(securityhub_client: SecurityHubClient) -> Union[list, None]:
+    """Wait for all standards subscriptions to be in READY status.
 
     Args:
         securityhub_client: SecurityHubClient
-        standard_dict: Standard Dictionary
 
     Returns:
-        Standard Dictionary
+        Standards subscriptions from the last check, or None if they did not become ready in time
     """
-    standards_subscriptions = get_enabled_standards(securityhub_client)
-    if all_standards_in_status(standards_subscriptions, "READY", securityhub_client):
-        for item in standards_subscriptions:
-            if standard_dict["sbp"]["standard_arn"] == item["StandardsArn"]:
-                standard_dict["sbp"]["enabled"] = True
-            if standard_dict["cis"]["standard_arn"] == item["StandardsArn"]:
-                standard_dict["cis"]["enabled"] = True
-            if standard_dict["pci"]["standard_arn"] == item["StandardsArn"]:
-                standard_dict["pci"]["enabled"] = True
-            if standard_dict["nist"]["standard_arn"] == item["StandardsArn"]:
-                standard_dict["nist"]["enabled"] = True
-    return standard_dict
+    latest: dict = {}
+
+    def standards_ready() -> bool:
+        latest["StandardsSubscriptions"] = get_enabled_standards(securityhub_client)
+        return all_standards_in_status(latest["StandardsSubscriptions"], "READY", securityhub_client)
+
+    if common.wait_until(standards_ready, f"Security Hub standards in {securityhub_client.meta.region_name}", STANDARDS_READY_TIMEOUT_SECONDS):
+        return latest["StandardsSubscriptions"]
+    return None
 
 
 def all_standards_ready(securityhub_client: SecurityHubClient) -> bool:
@@ -556,68 +767,86 @@ def all_standards_ready(securityhub_client: SecurityHubClient) -> bool:
     Returns:
         True or False
     """
-    for i in range(10):
-        standards_subscriptions = get_enabled_standards(securityhub_client)
-        if all_standards_in_status(standards_subscriptions, "READY", securityhub_client):
-            return True
-        LOGGER.info(f"Waiting 20 seconds before checking if standards are in READY status. {i} of 10")
-        sleep(20)
-    return False
+    return wait_for_standards_ready(securityhub_client) is not None
 
 
-def process_standards(
-    securityhub_client: SecurityHubClient,
-    standard_dict: dict,
-    standards_to_enable: dict,
-) -> None:
-    """Process Standards.
+def default_standards_ready(securityhub_client: SecurityHubClient) -> bool:
+    """Check that the default standards have been subscribed and are all in READY status.
 
     Args:
         securityhub_client: SecurityHubClient
-        standard_dict: Standard Dictionary
-        standards_to_enable: Dictionary of standards to enable
+
+    Returns:
+        True or False
     """
-    standard_dict = get_current_enabled_standards(securityhub_client, standard_dict)
-    for standard, status in standard_dict.items():
-        process_standard(securityhub_client, standards_to_enable, status, standard)
+    standards_subscriptions = get_enabled_standards(securityhub_client)
+    return len(standards_subscriptions) != 0 and all_standards_in_status(standards_subscriptions, "READY", securityhub_client)
+
 
+def enable_standards(securityhub_client: SecurityHubClient, standard_arns: set) -> None:
+    """Enable standards with a single batch call, falling back to one call per standard on invalid input.
 
-def process_standard(securityhub_client: SecurityHubClient, standards_to_enable: dict, standard_definition: dict, standard_short_name: str) -> bool:
-    """Process standard.
+    A standard that is not supported in the region makes the whole batch fail, so the fallback lets the
+    supported standards still be enabled.
 
     Args:
         securityhub_client: SecurityHubClient
-        standards_to_enable: Dictionary of standards to enable
-        standard_definition: Specific Standard Information like subscription and standard ARNs
-        standard_short_name: Standard short name
+        standard_arns: Standard ARNs to enable
+    """
+    try:
+        response: Any = securityhub_client.batch_enable_standards(
+            StandardsSubscriptionRequests=[{"StandardsArn": standard_arn} for standard_arn in sorted(standard_arns)]
+        )
+        api_call_details = {"API_Call": "securityhub:BatchEnableStandards", "API_Response": response}
+        LOGGER.info(api_call_details)
+        return
+    except securityhub_client.exceptions.InvalidInputException:
+        LOGGER.info("InvalidInputException while enabling the standards in one batch, enabling them one at a time")
 
-    Returns:
-        True or False
+    for standard_arn in sorted(standard_arns):
+        try:
+            response = securityhub_client.batch_enable_standards(StandardsSubscriptionRequests=[{"StandardsArn": standard_arn}])
+            api_call_details = {"API_Call": "securityhub:BatchEnableStandards", "API_Response": response}
+            LOGGER.info(api_call_details)
+        except securityhub_client.exceptions.InvalidInputException:
+            LOGGER.error(f"InvalidInputException while enabling standard {standard_arn} in {securityhub_client.meta.region_name}")
+
+
+def process_standards(
+    securityhub_client: SecurityHubClient,
+    standards_catalog: dict,
+    standards_to_enable: dict,
+) -> None:
+    """Process Standards.
+
+    Waits for the current subscriptions to be READY, then enables the missing standards and disables the
+    unwanted ones with a single batch_disable_standards call, and waits for the changed subscriptions to settle.
+
+    Args:
+        securityhub_client: SecurityHubClient
+        standards_catalog: Standards catalog
+        standards_to_enable: Dictionary of standards to enable
     """
-    if all_standards_ready(securityhub_client):
+    region = securityhub_client.meta.region_name
+    standards_subscriptions = wait_for_standards_ready(securityhub_client)
+    if standards_subscriptions is None:
+        LOGGER.info(f"Standards in {region} did not reach READY status, skipping the standards changes")
+        return
+    enable_standard_arns, disable_subscription_arns = get_standards_changes(standards_catalog, standards_subscriptions, standards_to_enable)
+    LOGGER.info(f"Standards in {region}: enabling {sorted(enable_standard_arns)}, disabling {sorted(disable_subscription_arns)}")
+    if not enable_standard_arns and not disable_subscription_arns:
+        return
+
+    if enable_standard_arns:
+        enable_standards(securityhub_client, enable_standard_arns)
+    if disable_subscription_arns:
         try:
-            if standards_to_enable[standard_short_name]:
-                if not standard_definition["enabled"]:
-                    response = securityhub_client.batch_enable_standards(
-                        StandardsSubscriptionRequests=[{"StandardsArn": standard_definition["standard_arn"]}]
-                    )
-                    api_call_details = {"API_Call": "securityhub:BatchEnableStandards", "API_Response": response}
-                    LOGGER.info(api_call_details)
-                    LOGGER.info(f"Enabled {standard_definition['name']}")
-                else:
-                    LOGGER.info(f"{standard_definition['name']} is already enabled")
-            else:  # Disable Standard
-                if standard_definition["enabled"]:
-                    LOGGER.info(f"Disabling {standard_definition['name']} in Account")
-                    response = securityhub_client.batch_disable_standards(StandardsSubscriptionArns=[standard_definition["subscription_arn"]])
-                    api_call_details = {"API_Call": "securityhub:BatchDisableStandards", "API_Response": response}
-                    LOGGER.info(api_call_details)
-                    LOGGER.info(f"Disabled {standard_definition['name']} in Account")
-                else:
-                    LOGGER.info(f"{standard_definition['name']} is already disabled")
+            response = securityhub_client.batch_disable_standards(StandardsSubscriptionArns=sorted(disable_subscription_arns))
+            api_call_details = {"API_Call": "securityhub:BatchDisableStandards", "API_Response": response}
+            LOGGER.info(api_call_details)
         except securityhub_client.exceptions.InvalidInputException:
-            LOGGER.error("InvalidInputException while enabling or disabling standard")
-    return True
+            LOGGER.error(f"InvalidInputException while disabling standards {sorted(disable_subscription_arns)} in {region}")
+    all_standards_ready(securityhub_client)
 
 
 def create_finding_aggregator(securityhub_client: SecurityHubClient, region_linking_mode: str, regions: list, home_region: str) -> str:
@@ -697,13 +926,7 @@ def compare_lists(list1: list, list2: list) -> bool:
     Returns:
         True or False
     """
-    if len(list1) != len(list2):
-        return False
-
-    if set(list1) == set(list2):
-        return True
-
-    return False
+    return len(list1) == len(list2) and set(list1) == set(list2)
 
 
 def is_config_enabled(config_client: ConfigServiceClient) -> bool:
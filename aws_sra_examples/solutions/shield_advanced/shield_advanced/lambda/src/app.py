@@ -77,6 +77,7 @@ def process_event(event: dict) -> None:
     """
     event_info = {"Event": event}
     LOGGER.info(event_info)
+    common.refresh_account_inventory(event)
     params = get_validated_parameters({"RequestType": event["RequestType"]})
 
     excluded_accounts: list = []
@@ -654,6 +655,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> None:
     LOGGER.info(event_info)
     try:
         orchestrator(event, context)
+        LOGGER.info({"Role_Session_Cache_Stats": common.get_role_session_cache_stats()})
     except Exception as ex:
         LOGGER.exception(ex)
         LOGGER.exception(UNEXPECTED)